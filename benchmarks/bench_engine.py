@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Threads vs Event Loop
+Author: Sanchez (Sports Science Dept.)
+Purpose: req/s of Engine.run (ThreadPoolExecutor + tls_client) against
+         Engine.run_async (one event loop + httpx) on a local target.
+
+Run with: python benchmarks/bench_engine.py -n 5000 -t 10 50 -c 200 1000
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from core import engine, config, logger, Requester
+from core.requester import AsyncRequester
+from benchmarks.target import LocalTarget
+from templates import fuzzer
+
+
+def bench_threads(url: str, payloads: list, threads: int) -> dict:
+    config.THREADS = threads
+    session = Requester()
+    start = time.perf_counter()
+    hits = engine.run(fuzzer.check, payloads, desc="threads", base_url=url, session=session)
+    elapsed = time.perf_counter() - start
+    return {"mode": "threads", "workers": threads, "requests": len(payloads),
+            "hits": len(hits), "seconds": elapsed, "rps": len(payloads) / elapsed}
+
+
+def bench_async(url: str, payloads: list, concurrency: int) -> dict:
+    async def _run():
+        async with AsyncRequester(max_connections=concurrency) as session:
+            return await engine.run_async(fuzzer.check_async, payloads, desc="async",
+                                          concurrency=concurrency, base_url=url, session=session)
+
+    start = time.perf_counter()
+    hits = asyncio.run(_run())
+    elapsed = time.perf_counter() - start
+    return {"mode": "async", "workers": concurrency, "requests": len(payloads),
+            "hits": len(hits), "seconds": elapsed, "rps": len(payloads) / elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Engine throughput: threads vs async")
+    parser.add_argument("-n", "--requests", type=int, default=2000, help="Requests per run")
+    parser.add_argument("-t", "--threads", type=int, nargs="+", default=[10, 50], help="Thread counts")
+    parser.add_argument("-c", "--concurrency", type=int, nargs="+", default=[200, 1000],
+                        help="Async in-flight limits")
+    args = parser.parse_args()
+
+    # Benchmarks measure the engine, not the terminal
+    config.DELAY = 0
+    config.RETRIES = 0
+    logger.setLevel(logging.WARNING)
+
+    # 1 in 100 payloads is a 'hit', so result collection is exercised too
+    payloads = [f"etc/passwd?{i}" if i % 100 == 0 else f"missing/{i}" for i in range(args.requests)]
+
+    rows = []
+    with LocalTarget() as url:
+        for t in args.threads:
+            rows.append(bench_threads(url, payloads, t))
+        for c in args.concurrency:
+            rows.append(bench_async(url, payloads, c))
+
+    print(f"\n{'MODE':<8} {'WORKERS':>8} {'REQS':>7} {'HITS':>5} {'SECS':>8} {'REQ/S':>9}")
+    for r in rows:
+        print(f"{r['mode']:<8} {r['workers']:>8} {r['requests']:>7} {r['hits']:>5} "
+              f"{r['seconds']:>8.2f} {r['rps']:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
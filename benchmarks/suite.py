@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite (The Fitness Test)
+Author: Sanchez (Sports Science Dept.)
+Purpose: Every workload that matters, against the local target, into one JSON
+         file — then `compare` two of those files and flag what got slower.
+
+Each case runs in a fresh process, so peak RSS belongs to that case alone and
+no warm cache leaks from one case into the next.
+
+Run with:
+    python benchmarks/suite.py run -o before.json            # full suite
+    python benchmarks/suite.py run --quick -o after.json     # smaller sizes, same shape
+    python benchmarks/suite.py compare before.json after.json --threshold 10
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Callable, Dict, List, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from benchmarks.target import LocalTarget
+
+# Metric name → True if bigger is better
+DIRECTIONS = {
+    "rps": True,
+    "pages_per_s": True,
+    "calls_per_s": True,
+    "payloads_per_s": True,
+    "mb_per_s": True,
+    "p50_ms": False,
+    "p99_ms": False,
+    "peak_rss_mb": False,
+    "seconds": False,
+}
+
+
+# ———— Inside the case process ————
+def _quiet():
+    """Benchmarks measure the engine, not the terminal (or the retry timer)."""
+    from core import config, logger
+    config.DELAY = 0
+    config.RETRIES = 0
+    config.METRICS = False
+    config.LOG_SUMMARY_INTERVAL = 0
+    logger.setLevel(logging.WARNING)
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _payloads(size: int) -> List[str]:
+    # 1 in 100 is a hit, so result collection is part of the cost
+    return [f"etc/passwd?{i}" if i % 100 == 0 else f"missing/{i}" for i in range(size)]
+
+
+def _timed_run(check: Callable, targets: List[str], threads: int, **kwargs) -> Dict[str, float]:
+    from core import config, engine
+    from core.metrics import metrics
+
+    config.THREADS = threads
+    metrics.reset()
+    started = time.perf_counter()
+    hits = engine.run(check, targets, desc="bench", progress=False, **kwargs)
+    elapsed = time.perf_counter() - started
+    latency = metrics.latency["total"]
+    return {
+        "seconds": elapsed,
+        "requests": metrics.requests,
+        "hits": len(hits),
+        "rps": metrics.requests / elapsed if elapsed else 0.0,
+        "p50_ms": latency.percentile(50) * 1000,
+        "p99_ms": latency.percentile(99) * 1000,
+    }
+
+
+def case_engine(url: str, threads: int, size: int) -> Dict[str, float]:
+    """Engine.run with the thinnest possible check: one GET, status → hit."""
+    _quiet()
+    from core import Requester
+    session = Requester()
+
+    def check(payload, base_url, session):
+        res = session.get(f"{base_url}/{payload}", allow_redirects=False)
+        return payload if res is not None and res.status_code == 200 else None
+
+    return _timed_run(check, _payloads(size), threads, base_url=url, session=session)
+
+
+def case_fuzzer(url: str, threads: int, size: int) -> Dict[str, float]:
+    _quiet()
+    from core import Requester
+    from templates import fuzzer
+    return _timed_run(fuzzer.check, _payloads(size), threads, base_url=f"{url}/{{PAYLOAD}}", session=Requester())
+
+
+def case_api_scanner(url: str, threads: int, size: int) -> Dict[str, float]:
+    """/api/* answers everything — the soft-404 calibration is part of what's measured."""
+    _quiet()
+    from core import Requester
+    from templates import api_scanner
+    paths = [f"v1/resource{i}" if i % 2 else f"missing{i}" for i in range(size)]
+    return _timed_run(api_scanner.check, paths, threads, base_url=f"{url}/api", session=Requester())
+
+
+def case_traversal(url: str, threads: int, size: int) -> Dict[str, float]:
+    _quiet()
+    from modules.traversal import check_traversal
+    payloads = [f"../../etc/passwd?{i}" if i % 100 == 0 else f"../../missing/{i}" for i in range(size)]
+    return _timed_run(check_traversal, payloads, threads, base_url=f"{url}/view?file={{PAYLOAD}}")
+
+
+def case_crawl(url: str, pages: int) -> Dict[str, float]:
+    """detect_id_parameters over the target's /shop graph (never runs dry)."""
+    _quiet()
+    from core import Requester
+    from core.metrics import metrics
+    from modules.access_control.detector import detect_id_parameters
+
+    metrics.reset()
+    started = time.perf_counter()
+    candidates = detect_id_parameters(f"{url}/shop/", Requester(), max_depth=50, max_pages=pages)
+    elapsed = time.perf_counter() - started
+    return {"seconds": elapsed, "pages": metrics.requests, "candidates": len(candidates),
+            "pages_per_s": metrics.requests / elapsed if elapsed else 0.0}
+
+
+def _big_page(size_mb: int) -> str:
+    """A multi-MB SPA: a repeated nav bar, item lists, an inline JSON state blob and a JS bundle."""
+    nav = "".join(f'<a href="/section/{i}">S{i}</a>' for i in range(40))
+    blocks, i = [], 0
+    while sum(map(len, blocks)) < size_mb * 1024 * 1024:
+        blocks.append(
+            f'<div class="card">{nav}<a href="/items/{i}?ref=home">Item {i}</a><img src="/img/{i}.png">'
+            f'<p>{"lorem ipsum dolor sit amet " * 20}</p></div>'
+            f'<script>window.__STATE__={{"id":{i},"self":"\\/api\\/items\\/{i}","owner":"/api/users/{i % 500}"}};'
+            f'fetch("/api/items/{i}/comments");axios.get(`/api/items/${{id}}/likes`);'
+            f'const routes=[{{path:"/orders/:orderId"}},{{path:"/users/{i % 50}/settings"}}];</script>'
+        )
+        i += 1
+    return "<html><body>" + "".join(blocks) + "</body></html>"
+
+
+def case_extract(size_mb: int) -> Dict[str, float]:
+    """Link + endpoint extraction over one multi-MB page (pure CPU, no network)."""
+    _quiet()
+    from core.links import extract_links        # Not via the detector: that pulls in the HTTP stack
+    page = _big_page(size_mb)
+    started = time.perf_counter()
+    links = extract_links(page, "https://shop.example/index.html")
+    elapsed = time.perf_counter() - started
+    mb = len(page) / (1024 * 1024)
+    return {"seconds": elapsed, "mb": mb, "links": len(links), "mb_per_s": mb / elapsed if elapsed else 0.0}
+
+
+def case_generate(rounds: int) -> Dict[str, float]:
+    """generate_id_payloads over every ID family it knows."""
+    _quiet()
+    from modules.access_control.guesser import generate_id_payloads
+    values = ["100", "507f1f77bcf86cd799439011", "3f2504e0-4f89-11d3-9a0c-0305e82c3301", "alice", None]
+
+    produced = 0
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for value in values:
+            produced += len(generate_id_payloads(value))
+    elapsed = time.perf_counter() - started
+    calls = rounds * len(values)
+    return {"seconds": elapsed, "calls": calls, "payloads": produced,
+            "calls_per_s": calls / elapsed if elapsed else 0.0,
+            "payloads_per_s": produced / elapsed if elapsed else 0.0}
+
+
+CASES = {
+    "engine": case_engine,
+    "fuzzer": case_fuzzer,
+    "api_scanner": case_api_scanner,
+    "traversal": case_traversal,
+    "crawl": case_crawl,
+    "extract": case_extract,
+    "generate": case_generate,
+}
+
+
+def _run_case(name: str, params: dict) -> Dict[str, float]:
+    result = CASES[name](**params)
+    result["peak_rss_mb"] = _peak_rss_mb()
+    return result
+
+
+# ———— The runner ————
+def plan(threads: List[int], sizes: List[int], pages: int, rounds: int, size_mb: int = 8) -> List[Tuple[str, dict]]:
+    cases: List[Tuple[str, dict]] = []
+    for name in ("engine", "fuzzer", "api_scanner", "traversal"):
+        for t in threads:
+            for size in sizes:
+                cases.append((name, {"threads": t, "size": size}))
+    cases.append(("crawl", {"pages": pages}))
+    cases.append(("extract", {"size_mb": size_mb}))
+    cases.append(("generate", {"rounds": rounds}))
+    return cases
+
+
+def _commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+def run_suite(cases: List[Tuple[str, dict]]) -> dict:
+    results = []
+    ctx = get_context("spawn")
+    with LocalTarget() as url:
+        for name, params in cases:
+            call = dict(params, url=url) if name not in ("generate", "extract") else dict(params)
+            # Fresh interpreter per case: honest peak RSS, no warm pools or caches
+            with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+                metrics = pool.submit(_run_case, name, call).result()
+            results.append({"name": name, "params": params, "metrics": metrics})
+            shown = " ".join(f"{k}={v:,.1f}" for k, v in metrics.items() if k in DIRECTIONS)
+            print(f"  {name:<12} {json.dumps(params):<32} {shown}", flush=True)
+
+    return {
+        "meta": {
+            "commit": _commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+
+# ———— Comparison ————
+def _key(entry: dict) -> str:
+    return f"{entry['name']} {json.dumps(entry['params'], sort_keys=True)}"
+
+
+def compare(before: dict, after: dict, threshold: float = 10.0) -> List[dict]:
+    """
+    Every shared (case, params, metric) with its % change. A change counts as a
+    regression when it moves the wrong way by more than threshold percent.
+    """
+    old = {_key(e): e["metrics"] for e in before["results"]}
+    rows = []
+    for entry in after["results"]:
+        base = old.get(_key(entry))
+        if base is None:
+            continue
+        for metric, higher_is_better in DIRECTIONS.items():
+            if metric not in base or metric not in entry["metrics"] or not base[metric]:
+                continue
+            change = (entry["metrics"][metric] - base[metric]) / base[metric] * 100
+            worse = -change if higher_is_better else change
+            rows.append({"case": _key(entry), "metric": metric, "before": base[metric],
+                         "after": entry["metrics"][metric], "change_pct": change,
+                         "regression": worse > threshold})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Arsenal benchmark suite")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run", help="Run the suite against the local target")
+    p_run.add_argument("-o", "--output", default="benchmark.json", help="Where the JSON results go")
+    p_run.add_argument("-t", "--threads", type=int, nargs="+", default=[10, 50], help="Thread counts")
+    p_run.add_argument("-s", "--sizes", type=int, nargs="+", default=[1000, 5000], help="Wordlist sizes")
+    p_run.add_argument("--pages", type=int, default=300, help="Pages for the crawl case")
+    p_run.add_argument("--rounds", type=int, default=200, help="Rounds for the generator case")
+    p_run.add_argument("--size-mb", type=int, default=8, help="Page size for the link extraction case")
+    p_run.add_argument("--only", nargs="+", choices=sorted(CASES), help="Run just these cases")
+    p_run.add_argument("--quick", action="store_true", help="Small sizes (CI smoke run)")
+
+    p_cmp = sub.add_parser("compare", help="Flag regressions between two result files")
+    p_cmp.add_argument("before")
+    p_cmp.add_argument("after")
+    p_cmp.add_argument("--threshold", type=float, default=10.0, help="Allowed slowdown in percent")
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        if args.quick:
+            args.threads, args.sizes, args.pages, args.rounds, args.size_mb = [10], [300], 60, 20, 2
+        cases = [c for c in plan(args.threads, args.sizes, args.pages, args.rounds, args.size_mb)
+                 if not args.only or c[0] in args.only]
+        print(f"🏋️ Running {len(cases)} cases...")
+        report = run_suite(cases)
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"💾 {len(report['results'])} results → {args.output}")
+        return
+
+    with open(args.before, encoding="utf-8") as fh:
+        before = json.load(fh)
+    with open(args.after, encoding="utf-8") as fh:
+        after = json.load(fh)
+    rows = compare(before, after, args.threshold)
+
+    print(f"{before['meta'].get('commit') or '?'} → {after['meta'].get('commit') or '?'} "
+          f"(regression = worse by more than {args.threshold:g}%)")
+    for r in rows:
+        flag = "❌" if r["regression"] else "  "
+        print(f"{flag} {r['case']:<52} {r['metric']:<15} {r['before']:>12,.2f} → {r['after']:>12,.2f} "
+              f"({r['change_pct']:+.1f}%)")
+    regressions = sum(r["regression"] for r in rows)
+    print(f"\n{regressions} regression(s) across {len(rows)} comparisons")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
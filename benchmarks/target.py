@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Module: Benchmark Target (The Training Pitch)
+Author: Sanchez
+Purpose: A tiny keep-alive HTTP/1.1 server on asyncio streams. Much faster than
+         the Flask lab, so benchmarks measure OUR engine and not Werkzeug.
+         Routes: */passwd* (a hit), /api/* (JSON catch-all), /shop/* (crawlable),
+         /wallet/* (a race-condition bank, after real-wallet-lab), 404.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+from typing import Optional
+
+PASSWD = b"root:x:0:0:root:/root:/bin/bash\ndaemon:x:1:1::/usr/sbin:/usr/sbin/nologin\n"
+NOT_FOUND = b"<html><body><h1>404 Not Found</h1></body></html>"
+
+# ———— The Bank (real-wallet-lab without Node + Postgres) ————
+# Same bug as src/services/wallet.service.ts: read the balance, wait, then write.
+# Transfers landing inside WALLET_GAP of each other all pass the funds check.
+WALLET_GAP = 0.05
+WALLET_START = {"101": 100.0, "102": 0.0}
+_wallets = dict(WALLET_START)
+
+
+async def _wallet(method: str, path: str, body: bytes) -> tuple[int, bytes]:
+    """GET /wallet/<id>, POST /wallet/transfer {fromId, toId, amount}, POST /wallet/reset."""
+    if method == "POST" and path == "/wallet/reset":
+        _wallets.clear()
+        _wallets.update(WALLET_START)
+        return 200, b'{"reset": true}'
+    if method == "POST" and path == "/wallet/transfer":
+        try:
+            order = json.loads(body)
+            source, target, amount = str(order["fromId"]), str(order["toId"]), float(order["amount"])
+        except (ValueError, KeyError, TypeError):
+            return 400, b'{"error": "bad transfer"}'
+        balance = _wallets.get(source, 0.0)                 # 1. READ
+        if balance < amount:
+            return 400, b'{"error": "Insufficient funds"}'
+        await asyncio.sleep(WALLET_GAP)                     # 2. THE GAP
+        _wallets[source] = _wallets.get(source, 0.0) - amount  # 3. WRITE
+        _wallets[target] = _wallets.get(target, 0.0) + amount
+        return 200, json.dumps({"success": True, "newBalance": balance - amount}).encode()
+    wallet = path.rsplit("/", 1)[1]
+    if wallet in _wallets:
+        return 200, json.dumps({"id": wallet, "balance": _wallets[wallet]}).encode()
+    return 404, b'{"error": "Not found"}'
+
+
+def _shop(path: str) -> bytes:
+    """
+    An endless little shop for the crawler benchmarks: categories link to items,
+    items link onwards (next item, its owner in the API, an order by query ID).
+    Deterministic, so two runs crawl exactly the same pages.
+    """
+    parts = [p for p in path.split("?", 1)[0].split("/") if p]
+    if len(parts) >= 3 and parts[1] == "c" and parts[2].isdigit():
+        n = int(parts[2])
+        links = [f"/shop/items/{n * 100 + k}" for k in range(20)]
+        links += [f"/shop/c/{n + 1}", f"/shop/orders?order_id={n}&page=1"]
+    elif len(parts) >= 3 and parts[1] == "items" and parts[2].isdigit():
+        n = int(parts[2])
+        links = [f"/shop/items/{n + 1}", f"/api/users/{n % 50}", f"/shop/c/{n % 20}#reviews"]
+    else:
+        links = [f"/shop/c/{n}" for n in range(20)]
+    anchors = "".join(f'<li><a href="{link}">{link}</a></li>' for link in links)
+    return f"<html><body><h1>Shop</h1><ul>{anchors}</ul></body></html>".encode()
+
+
+def _route(path: str) -> tuple[int, bytes, str]:
+    """Canned answers: a 'vulnerable' passwd, a JSON API, a crawlable shop, and a 404 for the rest."""
+    if "passwd" in path:
+        return 200, PASSWD, "text/plain"
+    if path.startswith("/api/"):
+        return 200, b'{"id": 1, "name": "saka"}', "application/json"
+    if path.startswith("/shop"):
+        return 200, _shop(path), "text/html"
+    return 404, NOT_FOUND, "text/html"
+
+
+async def _handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    try:
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            request_line, _, rest = head.partition(b"\r\n")
+            parts = request_line.split(b" ")
+            path = parts[1].decode("latin-1") if len(parts) > 1 else "/"
+
+            # Drain any body so keep-alive stays in sync
+            payload = b""
+            for line in rest.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    payload = await reader.readexactly(int(line.split(b":", 1)[1]))
+
+            if path.startswith("/wallet/"):
+                status, body = await _wallet(parts[0].decode("latin-1"), path, payload)
+                ctype = "application/json"
+            else:
+                status, body, ctype = _route(path)
+            reason = {200: b"OK", 400: b"Bad Request"}.get(status, b"Not Found")
+            writer.write(
+                b"HTTP/1.1 %d %s\r\nContent-Type: %s\r\nContent-Length: %d\r\n\r\n"
+                % (status, reason, ctype.encode(), len(body)) + body
+            )
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError, asyncio.LimitOverrunError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host: str, port: int, ready=None):
+    server = await asyncio.start_server(_handle, host, port, backlog=4096)
+    if ready:
+        ready(server.sockets[0].getsockname()[1])
+    async with server:
+        await server.serve_forever()
+
+
+class LocalTarget:
+    """
+    Runs the target in its OWN process, so the server never fights the
+    engine for the GIL and the numbers stay honest:
+        with LocalTarget() as url:
+            engine.run(check, payloads, base_url=url + "/{PAYLOAD}")
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.host = host
+        self.port = port
+        self._proc: Optional[subprocess.Popen] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> str:
+        self._proc = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "--host", self.host, "--port", str(self.port)],
+            stdout=subprocess.PIPE, text=True,
+        )
+        # First line of stdout is the bound port (port=0 -> the OS picks a free one)
+        self.port = int(self._proc.stdout.readline().strip())
+        return self.url
+
+    def stop(self):
+        if self._proc:
+            self._proc.terminate()
+            self._proc.wait(timeout=5)
+            self._proc = None
+
+    def __enter__(self) -> str:
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local benchmark target")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port, ready=lambda port: print(port, flush=True)))
+    except KeyboardInterrupt:
+        pass
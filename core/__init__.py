@@ -1,23 +1,68 @@
 # core/__init__.py
+#
+# Importing core is cheap on purpose: config loads now, everything else
+# (Requester, engine, the shared session) on first touch. PEP 562 does the rest.
 
-# Expose the Class, so tools can instantiate their own engines
-from .requester import Requester
+import sys
+import threading
+from importlib import import_module
+from types import ModuleType
+from typing import Any
 
 # Expose the Config dictionary
-from .config import CONFIG,BANNER,get_banner
+from . import config as _settings
+from .config import CONFIG, BANNER, get_banner
 
-# Expose the Logger (We need to build this next to make this import work!)
+# Expose the Logger (light: the writer thread, no client libraries)
 from .logger import logger
 
-# Expose the Engine runner
-from .engine import engine
+# name → submodule that defines it, imported when first asked for
+_LAZY = {
+    "Requester": "requester",   # Expose the Class, so tools can instantiate their own engines
+    "engine": "engine",         # Expose the Engine runner
+    "logger": "logger",
+}
 
 # ———— Default shared requester (lazy tools keep working) ————
-_default_requester = Requester()
-session = _default_requester.session   # ← restores "from core import session"
+_default_requester = None
+_default_lock = threading.Lock()
+
+
+def default_requester() -> Any:
+    """The process-wide Requester behind "from core import session", built on first use."""
+    global _default_requester
+    if _default_requester is None:
+        with _default_lock:
+            if _default_requester is None:
+                _default_requester = __getattr__("Requester")()
+    return _default_requester
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY:
+        value = getattr(import_module(f".{_LAZY[name]}", __name__), name)
+        globals()[name] = value
+        return value
+    if name == "session":
+        return default_requester().session   # ← restores "from core import session"
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class _Core(ModuleType):
+    """Importing core.engine (or core.logger) binds the submodule here; keep the object it exports instead."""
+
+    def __setattr__(self, name: str, value: Any):
+        if name in _LAZY and isinstance(value, ModuleType) and value.__name__ == f"{self.__name__}.{_LAZY[name]}":
+            value = getattr(value, name)
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _Core
+
+# ← makes config.TIMEOUT work when doing "from core import config" (config = the instance)
+globals().update({k: v for k, v in vars(_settings).items() if not k.startswith("_")})
 
 # Explicit exports – this is how pros do it
-globals().update(config.__dict__)
 __all__ = [
     "Requester",
     "logger",
@@ -26,9 +71,6 @@ __all__ = [
     "session",
     "engine",
     "BANNER",
-    "get_banner"
+    "get_banner",
+    "default_requester",
 ]
-
-# ← ADD THIS MAGIC LINE
-   # ← makes config.TIMEOUT work when doing "from core import config"
-
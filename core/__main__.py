@@ -0,0 +1,6 @@
+# python -m core <tool> [args...]  ≡  ./arsenal <tool> [args...]
+import sys
+
+from core.cli import main
+
+sys.exit(main())
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# Module: Response Cache
+# Author: Sanchez (The Kit Man)
+# Purpose: Never fetch the same page twice in one run. LRU + TTL + byte budget,
+#          and identical requests already in the air share ONE call (singleflight).
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from core.config import config
+from core.logger import logger
+
+# Only safe methods are cached — a repeated POST is a new shot, not a replay
+CACHEABLE_METHODS = {"GET", "HEAD"}
+
+# Per-request headers that change what the server answers (identity + negotiation)
+KEY_HEADERS = ("authorization", "cookie", "accept", "content-type", "range", "host", "x-forwarded-for")
+
+
+class _Flight:
+    """One request in the air; latecomers wait on it instead of firing their own."""
+    __slots__ = ("event", "result")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU response cache.
+    - max_entries / max_bytes: size eviction (least recently used goes first)
+    - ttl: seconds an entry stays fresh
+    Counters: hits, misses, coalesced (waited on an identical in-flight call), evictions.
+    """
+
+    def __init__(self, max_entries: int = 10_000, max_bytes: int = 64 * 1024 * 1024,
+                 ttl: float = 300.0, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[Tuple, Tuple[float, int, Any]]" = OrderedDict()
+        self._inflight: Dict[Tuple, _Flight] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_config(cls) -> "ResponseCache":
+        return cls(config.CACHE_MAX_ENTRIES, config.CACHE_MAX_MB * 1024 * 1024, config.CACHE_TTL)
+
+    @staticmethod
+    def make_key(method: str, url: str, headers: Optional[Dict[str, str]], kwargs: Dict[str, Any]) -> Tuple:
+        """method + URL + the headers that matter + a hash of everything else that shapes the request."""
+        relevant = ()
+        if headers:
+            relevant = tuple(sorted(
+                (k.lower(), str(v)) for k, v in headers.items() if k.lower() in KEY_HEADERS
+            ))
+
+        body = hashlib.sha1()
+        for name in ("params", "cookies", "data", "json", "allow_redirects"):
+            value = kwargs.get(name)
+            if value is not None:
+                body.update(name.encode())
+                body.update(value if isinstance(value, bytes)
+                            else json.dumps(value, sort_keys=True, default=str).encode())
+        return (method.upper(), url, relevant, body.hexdigest())
+
+    @staticmethod
+    def _size(response: Any) -> int:
+        content = getattr(response, "content", None)
+        return len(content) if isinstance(content, (bytes, bytearray)) else 0
+
+    @staticmethod
+    def _cacheable(response: Any) -> bool:
+        # Failures and throttling are moments in time, not facts about the page
+        status = getattr(response, "status_code", None)
+        return response is not None and status is not None and status != 429 and status < 500
+
+    def get(self, key: Tuple) -> Any:
+        with self._lock:
+            return self._get_locked(key)
+
+    def _get_locked(self, key: Tuple) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, size, response = entry
+        if expires < self._clock():
+            del self._entries[key]
+            self._bytes -= size
+            return None
+        self._entries.move_to_end(key)
+        return response
+
+    def put(self, key: Tuple, response: Any):
+        size = self._size(response)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old:
+                self._bytes -= old[1]
+            self._entries[key] = (self._clock() + self.ttl, size, response)
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def fetch(self, key: Tuple, loader: Callable[[], Any]) -> Any:
+        """Cached response, or the result of an identical in-flight call, or loader()."""
+        with self._lock:
+            cached = self._get_locked(key)
+            if cached is not None:
+                self.hits += 1
+                return cached
+
+            flight = self._inflight.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                flight = self._inflight[key] = _Flight()
+                self.misses += 1
+                leader = True
+
+        if not leader:
+            flight.event.wait()
+            return flight.result
+
+        try:
+            flight.result = loader()
+            if self._cacheable(flight.result):
+                self.put(key, flight.result)
+            return flight.result
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.event.set()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+            }
+
+    def log_stats(self):
+        st = self.stats()
+        logger.info(
+            f"🧊 Response cache: {st['hits']:,} hits, {st['misses']:,} misses, {st['coalesced']:,} coalesced "
+            f"({st['hit_rate']:.0%} saved), {st['entries']:,} entries / {st['bytes'] / 1_048_576:.1f} MB, "
+            f"{st['evictions']:,} evictions"
+        )
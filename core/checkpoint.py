@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+# Module: Checkpoints
+# Author: Sanchez (The Video Analyst)
+# Purpose: Resumable scans. Ctrl-C, a VPN drop or the OOM killer no longer
+#          sends us back to payload one.
+
+import asyncio
+import functools
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+from core.config import config
+from core.logger import logger
+from core.resilience import shed_count
+
+
+def wordlist_fingerprint(path: Path) -> str:
+    """
+    Cheap identity for a (possibly multi-GB) wordlist: size + first and last MB.
+    Reading the whole file just to name it would cost more than the scan it saves.
+    """
+    digest = hashlib.sha1()
+    size = path.stat().st_size
+    digest.update(str(size).encode())
+    with path.open("rb") as f:
+        digest.update(f.read(1 << 20))
+        if size > 1 << 20:
+            f.seek(max(size - (1 << 20), 0))
+            digest.update(f.read(1 << 20))
+    return digest.hexdigest()
+
+
+class CheckpointStore:
+    """
+    Progress for one (tool, target URL, wordlist) match, in SQLite.
+    Completion is tracked as a low watermark (every index below it is done)
+    plus the few indexes above it that finished out of order — so the state
+    stays tiny no matter how many millions of targets went through.
+    Targets shed by an open circuit are kept in their own set: they don't pin
+    the watermark, and --resume replays exactly them.
+    Writes are batched and incremental: one commit per `batch` completions or
+    `interval` seconds, writing only what changed since the last one.
+    """
+
+    def __init__(self, tool: str, target_url: str, wordlist_id: str = "",
+                 directory: Optional[Path] = None, batch: int = 1000, interval: float = 2.0):
+        self.key = hashlib.sha1(f"{tool}|{target_url}|{wordlist_id}".encode()).hexdigest()[:16]
+        self.directory = Path(directory or config.CHECKPOINT_DIR).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.path = self.directory / f"{self.key}.db"
+        self.batch = batch
+        self.interval = interval
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (k TEXT PRIMARY KEY, v TEXT)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS done (idx INTEGER PRIMARY KEY)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS shed (idx INTEGER PRIMARY KEY)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS hits (idx INTEGER, data TEXT)")
+        self._db.execute("INSERT OR REPLACE INTO meta VALUES ('label', ?)", (f"{tool} → {target_url}",))
+        self._db.commit()
+
+        row = self._db.execute("SELECT v FROM meta WHERE k = 'watermark'").fetchone()
+        self.watermark = int(row[0]) if row else 0
+        self._above: Set[int] = {r[0] for r in self._db.execute("SELECT idx FROM done")}
+        self._new_above: List[int] = []             # Finished out of order since the last flush
+        self._saved_watermark = self.watermark
+        self._shed: Set[int] = {r[0] for r in self._db.execute("SELECT idx FROM shed")}
+        self._new_shed: List[int] = []
+        self._unshed: List[int] = []                # Shed earlier, done now
+        self._pending_hits: List[Tuple[int, str]] = []
+        self._unsaved = 0
+        self._last_flush = time.monotonic()
+        self._seen = 0
+        self._exhausted = False
+
+    @classmethod
+    def for_wordlist(cls, tool: str, target_url: str, wordlists: Union[str, Sequence[str], None],
+                     dedupe: bool = False, shard: Optional[Tuple[int, int]] = None,
+                     directory: Optional[Path] = None) -> "CheckpointStore":
+        """
+        Keyed on the files AND on how they're read: --dedupe and --shard K/N change
+        which word sits at index i, so a watermark from another setting means nothing here.
+        """
+        if isinstance(wordlists, str):
+            wordlists = [wordlists]
+        wordlist_id = "+".join(wordlist_fingerprint(Path(w).expanduser().resolve()) for w in wordlists or ())
+        if dedupe:
+            wordlist_id += "|dedupe"
+        if shard is not None:
+            wordlist_id += f"|shard={shard[0]}/{shard[1]}"
+        return cls(tool, target_url, wordlist_id, directory=directory)
+
+    # ———— Progress ————
+    @property
+    def completed(self) -> int:
+        return self.watermark + len(self._above) - len(self._shed)
+
+    @property
+    def shed(self) -> int:
+        """Targets left pending because their host was benched."""
+        return len(self._shed)
+
+    @property
+    def finished(self) -> bool:
+        """Every target the list held has been pulled AND completed (no Ctrl-C, no Golden Goal)."""
+        return self._exhausted and self.watermark >= self._seen and not self._above and not self._shed
+
+    def is_done(self, idx: int) -> bool:
+        return idx not in self._shed and (idx < self.watermark or idx in self._above)
+
+    def reset(self):
+        """Fresh start (no --resume): forget everything recorded for this match."""
+        with self._lock:
+            self._db.execute("DELETE FROM done")
+            self._db.execute("DELETE FROM hits")
+            self._db.execute("DELETE FROM shed")
+            self._db.execute("DELETE FROM meta WHERE k = 'watermark'")
+            self._db.commit()
+            self.watermark = self._saved_watermark = 0
+            self._above.clear()
+            self._new_above.clear()
+            self._shed.clear()
+            self._new_shed.clear()
+            self._unshed.clear()
+            self._pending_hits.clear()
+
+    def previous_hits(self) -> List[Any]:
+        """Hits found by earlier (interrupted) runs of this match."""
+        return [json.loads(r[0]) for r in self._db.execute("SELECT data FROM hits ORDER BY idx")]
+
+    def mark_done(self, idx: int, hit: Any = None):
+        with self._lock:
+            if idx in self._shed:                   # A replayed shed target finally went through
+                self._shed.discard(idx)
+                self._unshed.append(idx)
+            self._settle_locked(idx)
+            if hit:
+                self._pending_hits.append((idx, json.dumps(hit, default=str)))
+            self._count_locked()
+
+    def mark_shed(self, idx: int):
+        """Never tried (its host's circuit was open): settled for the watermark, pending for --resume."""
+        with self._lock:
+            if idx not in self._shed:
+                self._shed.add(idx)
+                self._new_shed.append(idx)
+            self._settle_locked(idx)
+            self._count_locked()
+
+    def _settle_locked(self, idx: int):
+        if idx == self.watermark:
+            self.watermark += 1
+            # Slide the watermark over anything that finished early
+            while self.watermark in self._above:
+                self._above.discard(self.watermark)
+                self.watermark += 1
+        elif idx > self.watermark and idx not in self._above:
+            self._above.add(idx)
+            self._new_above.append(idx)
+
+    def _count_locked(self):
+        self._unsaved += 1
+        if self._unsaved >= self.batch or time.monotonic() - self._last_flush >= self.interval:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        # Only the delta: rewriting all of `done` each time goes quadratic once a
+        # stuck low index leaves everything after it out of order
+        with self._db:
+            self._db.executemany("INSERT OR IGNORE INTO done VALUES (?)",
+                                 ((i,) for i in self._new_above if i >= self.watermark))
+            if self.watermark != self._saved_watermark:
+                self._db.execute("INSERT OR REPLACE INTO meta VALUES ('watermark', ?)", (str(self.watermark),))
+                self._db.execute("DELETE FROM done WHERE idx < ?", (self.watermark,))
+            self._db.executemany("INSERT OR IGNORE INTO shed VALUES (?)", ((i,) for i in self._new_shed))
+            self._db.executemany("DELETE FROM shed WHERE idx = ?", ((i,) for i in self._unshed))
+            self._db.executemany("INSERT INTO hits VALUES (?, ?)", self._pending_hits)
+        self._saved_watermark = self.watermark
+        self._new_above.clear()
+        self._new_shed.clear()
+        self._unshed.clear()
+        self._pending_hits.clear()
+        self._unsaved = 0
+        self._last_flush = time.monotonic()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        """Flush and close. A finished match has nothing to resume → its file is removed."""
+        with self._lock:
+            self._flush_locked()
+            self._db.close()
+        if self.shed:
+            logger.warning(f"🟥 {self.shed:,} targets were shed by an open circuit and stay pending for --resume")
+        if self.finished:
+            for suffix in ("", "-wal", "-shm"):
+                Path(f"{self.path}{suffix}").unlink(missing_ok=True)
+
+    # ———— Engine glue ————
+    def pending(self, targets: Iterable[Any]) -> Iterator[Tuple[int, Any]]:
+        """(index, target) for everything not done yet."""
+        idx = -1
+        for idx, target in enumerate(targets):
+            if not self.is_done(idx):
+                yield idx, target
+        self._seen = idx + 1
+        self._exhausted = True
+
+    def track(self, task_function: Callable) -> Callable:
+        """
+        Wrap a task so it takes (index, target) and records completion.
+        A task that raises still counts as done — the Requester already spent its
+        retries on it, and a stuck index would pin the watermark forever.
+        Cancellation (Ctrl-C) does not: those targets run again on --resume.
+        Neither does a target that found nothing because a request was shed by an
+        open circuit breaker (core.resilience): it was never tried, so it goes to
+        the shed set rather than pinning the watermark.
+        """
+        if asyncio.iscoroutinefunction(task_function):
+            @functools.wraps(task_function)
+            async def tracked_async(item, **kwargs):
+                idx, target = item
+                before = shed_count()
+                try:
+                    result = await task_function(target, **kwargs)
+                except Exception:
+                    self._settle(idx, None, shed_count() != before)
+                    raise
+                self._settle(idx, result, shed_count() != before)
+                return result
+            return tracked_async
+
+        @functools.wraps(task_function)
+        def tracked(item, **kwargs):
+            idx, target = item
+            before = shed_count()
+            try:
+                result = task_function(target, **kwargs)
+            except Exception:
+                self._settle(idx, None, shed_count() != before)
+                raise
+            self._settle(idx, result, shed_count() != before)
+            return result
+        return tracked
+
+    def _settle(self, idx: int, result: Any, shed: bool):
+        if shed and not result:
+            self.mark_shed(idx)
+        else:
+            self.mark_done(idx, result)
+
+    def log_resume(self):
+        if self.completed:
+            logger.info(f"⏯️ Resuming: {self.completed:,} targets already done, "
+                        f"{len(self.previous_hits())} earlier hits restored.")
+        if self._shed:
+            logger.info(f"⏯️ Replaying {len(self._shed):,} targets shed by an open circuit last time.")
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# Module: CLI
+# Author: Sanchez (The Team Sheet)
+# Purpose: One door for every tool: `arsenal <tool> [args]`. Tools are found by
+#          reading their source (never importing it), so listing the squad costs
+#          a directory walk and the chosen tool is the only one that loads.
+
+import re
+import runpy
+import sys
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+TOOL_DIRS = ("templates", "modules")
+
+_MAIN_GUARD = re.compile(r"""^if __name__ == ['"]__main__['"]\s*:""", re.MULTILINE)
+# A Purpose can wrap: continuation lines are indented under it (`#` + 2 spaces or more)
+_PURPOSE = re.compile(r"^\W*Purpose:\s*(.+(?:\n#?[ \t]{2,}\S.*)*)", re.MULTILINE)
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+_DOCSTRING = re.compile(r'\A\s*(?:#.*\n\s*)*[rR]?"""\s*(.+?)\s*$', re.MULTILINE)
+_MODULE = re.compile(r"^\W*Module:\s*(.+)$", re.MULTILINE)
+
+
+class Tool(NamedTuple):
+    name: str
+    path: Path
+    summary: str
+
+
+def _is_tool(source: str) -> bool:
+    """A tool runs as a script and takes arguments (libraries with a __main__ demo don't count)."""
+    return bool(_MAIN_GUARD.search(source)) and "parse_args(" in source
+
+
+def _summary(source: str) -> str:
+    """The tool's one-liner: the first sentence of its Purpose (wrapped lines joined), else the docstring/Module line."""
+    head = source[:2048]
+    match = _PURPOSE.search(head) or _DOCSTRING.search(head) or _MODULE.search(head)
+    if not match:
+        return ""
+    text = " ".join(line.lstrip("#").strip() for line in match.group(1).splitlines())
+    return _SENTENCE_END.split(text, 1)[0]
+
+
+def discover(root: Path = ROOT) -> Dict[str, Tool]:
+    """Tool name (file stem) → Tool, from templates/ and modules/**. Nothing is imported."""
+    tools: Dict[str, Tool] = {}
+    for directory in TOOL_DIRS:
+        for path in sorted((root / directory).rglob("*.py")):
+            if path.name.startswith("_"):
+                continue
+            try:
+                source = path.read_text(encoding="utf-8", errors="ignore")
+            except OSError:
+                continue
+            if _is_tool(source):
+                tools.setdefault(path.stem, Tool(path.stem, path, _summary(source)))
+    return tools
+
+
+def _usage(tools: Dict[str, Tool]) -> str:
+    width = max((len(n) for n in tools), default=4)
+    lines = ["usage: arsenal <tool> [args...]   (arsenal <tool> --help for its options)", "", "tools:"]
+    lines += [f"  {t.name:<{width}}  {t.summary}" for t in tools.values()]
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    tools = discover()
+
+    if not argv or argv[0] in ("-h", "--help", "list"):
+        print(_usage(tools))
+        return 0
+
+    name, rest = argv[0], argv[1:]
+    tool = tools.get(name)
+    if tool is None:
+        print(f"arsenal: unknown tool '{name}'\n\n{_usage(tools)}", file=sys.stderr)
+        return 2
+
+    # Run it exactly as `python <tool>.py args` would — argv, __main__ and all
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+    sys.argv = [str(tool.path), *rest]
+    runpy.run_path(str(tool.path), run_name="__main__")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
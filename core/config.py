@@ -13,7 +13,6 @@ from dataclasses import dataclass ,field
 from typing import Optional
 from typing import Dict, Any
 from pathlib import Path
-from colorama import Fore, Style, init
 import random
 # ———— BANNER (Do NOT touch. This is culture.) ————
 # ———— BANNER (The Titan) ————
@@ -42,6 +41,7 @@ QUOTES = [
 
 def get_banner(tool_name: str = "Red Team Arsenal") -> str:
     """Helper to generate a consistent, colored banner with a random quote."""
+    from colorama import Fore, Style   # only the banner needs paint
     
     # 1. The Logo (Red)
     logo = f"{Fore.RED}{BANNER}{Style.RESET_ALL}"
@@ -63,18 +63,72 @@ class ArsenalConfig:
     # ⏱️ Time Management
     TIMEOUT: int = 10
     RETRIES: int = 3
-    BACKOFF: float = 1.5
+    BACKOFF: float = 1.5          # Growth per retry: BACKOFF_BASE × BACKOFF^attempt, fully jittered
+    BACKOFF_BASE: float = 0.5     # Ceiling of the first retry's wait (seconds)
+    BACKOFF_MAX: float = 30.0     # ... and of any retry's
+
+    # 🩹 Retry budget + circuit breakers (core.resilience)
+    RETRY_BUDGET: float = 0.2     # Retries may add at most this fraction of the requests sent
+    RETRY_RESERVE: int = 10       # Retries allowed before the budget has earned anything
+    BREAKERS: bool = True         # Per-host circuit breakers: bench dead/blocking hosts, shed their work
+    BREAKER_FAILURES: int = 5     # Connection errors in a row that open a host's circuit
+    BREAKER_WINDOW: int = 20      # Answers looked at for sustained WAF blocks (403 block page / 429)
+    BREAKER_BLOCK_RATIO: float = 0.8   # Share of those that opens the circuit
+    BREAKER_COOLDOWN: float = 30.0     # Seconds open before one half-open probe (doubles per failed probe)
 
     # ⚡ Performance
     THREADS: int = 10
     DELAY: float = 0.1
+    ASYNC_CONCURRENCY: int = 200  # In-flight requests for Engine.run_async (one event loop)
+    PROCESSES: int = 1            # Worker processes for Engine.run_sharded (0 = all cores)
+    SESSION_POOL_SIZE: int = 0    # tls_client sessions per Requester (0 = one per thread)
+    ADAPTIVE: bool = False        # AIMD in-flight control in Engine.stream (THREADS = ceiling)
+    CALIBRATE: bool = False       # Find the throughput knee before settling (implies ADAPTIVE)
+
+    # 🧊 Response Cache (core.cache) — opt-in, per Requester
+    CACHE: bool = False
+    CACHE_MAX_ENTRIES: int = 10_000
+    CACHE_MAX_MB: int = 64
+    CACHE_TTL: float = 300.0      # seconds
+
+    # 🚦 Rate Limiting (core.ratelimit) — 0 = off. RPS unset → DELAY becomes THREADS/DELAY req/s
+    RPS: float = 0.0              # Global requests per second
+    BURST: int = 1                # Requests allowed back-to-back after an idle spell
+    HOST_RPS: float = 0.0         # Per-host requests per second
+    HOST_BURST: int = 1
+
+    # ⏯️ Checkpoints (core.checkpoint) — progress of every wordlist scan, for --resume
+    CHECKPOINT_DIR: str = ".arsenal/checkpoints"
+
+    # 🌊 Streamed bodies (Requester.stream) — read chunk by chunk, hang up on a hit or the cap
+    STREAM: bool = False
+    STREAM_MAX_BYTES: int = 1_048_576   # Stop reading after this much body
+    STREAM_PREFIX_BYTES: int = 65_536   # Body prefix kept on the response (the rest is only digested)
+
+    # 📏 Soft-404 calibration (core.soft404) — api_scanner + fuzzer directory mode
+    SOFT404: bool = True
+    SOFT404_SAMPLES: int = 3      # Random nonexistent paths fetched per directory/extension
+
+    # 🎯 Signatures (core.signatures) — extra JSON files/dirs on top of core/data/signatures
+    SIGNATURE_PATHS: str = ""     # os.pathsep-separated
 
     # 🕵️ Stealth & Identity
     RANDOM_USER_AGENT: bool = True
     VERIFY_SSL: bool = False  # WARNING: Only False in labs. Never in prod.
 
     # 📝 Logging
-    LOG_FILE: str = "arsenal.log"
+    LOG_FILE: str = "arsenal.log"           # Plain-text copy of every log line ("" = console only)
+    LOG_SUMMARY_INTERVAL: float = 5.0       # Per-request lines → one status-count summary per N s (0 = every line)
+
+    # 📈 Metrics (core.metrics) — latency/status/bytes table at the end of Engine.run
+    METRICS: bool = True
+    METRICS_FILE: str = ""        # Also export there: *.prom → Prometheus text, anything else → JSON
+
+    # 🧾 Results (core.results) — hits streamed to disk as they land
+    RESULTS_FILE: str = ""                  # Default hit file for every tool (*.jsonl → one JSON record per hit)
+    RESULTS_FLUSH_INTERVAL: float = 1.0     # A buffered hit reaches the disk within this many seconds
+    RESULTS_MAX_BYTES: int = 100 * 1024 * 1024   # Rotate to FILE.1, FILE.2 ... past this size (0 = never)
+    RESULTS_BACKUPS: int = 5
 
     # 🔌 Proxy
     USE_PROXY: bool = False
@@ -102,8 +156,36 @@ class ArsenalConfig:
             raise ValueError("RETRIES cannot be negative")
         if self.BACKOFF < 1.0:
             raise ValueError("BACKOFF < 1.0 means we're going backwards in time")
+        if self.BACKOFF_BASE < 0 or self.BACKOFF_MAX < self.BACKOFF_BASE:
+            raise ValueError("BACKOFF_BASE must be >= 0 and BACKOFF_MAX >= BACKOFF_BASE")
+        if self.RETRY_BUDGET < 0 or self.RETRY_RESERVE < 0:
+            raise ValueError("RETRY_BUDGET and RETRY_RESERVE cannot be negative")
+        if self.BREAKER_FAILURES < 1 or self.BREAKER_WINDOW < 1 or self.BREAKER_COOLDOWN <= 0:
+            raise ValueError("BREAKER_FAILURES/BREAKER_WINDOW must be >= 1 and BREAKER_COOLDOWN positive")
+        if not 0 < self.BREAKER_BLOCK_RATIO <= 1:
+            raise ValueError("BREAKER_BLOCK_RATIO is a share: 0 < ratio <= 1")
         if self.THREADS < 1:
             raise ValueError("Can't run zero threads. Even Holding needs a job.")
+        if self.ASYNC_CONCURRENCY < 1:
+            raise ValueError("ASYNC_CONCURRENCY must be at least 1 – someone has to take the kick")
+        if self.PROCESSES < 0:
+            raise ValueError("PROCESSES cannot be negative (0 = every core on the bench)")
+        if self.SESSION_POOL_SIZE < 0:
+            raise ValueError("SESSION_POOL_SIZE cannot be negative (0 = match THREADS)")
+        if self.RPS < 0 or self.HOST_RPS < 0:
+            raise ValueError("Negative RPS? We're not un-sending requests")
+        if self.BURST < 1 or self.HOST_BURST < 1:
+            raise ValueError("BURST must be at least 1")
+        if self.CACHE_MAX_ENTRIES < 1 or self.CACHE_MAX_MB < 1 or self.CACHE_TTL <= 0:
+            raise ValueError("Cache limits must be positive – an empty kit bag holds nothing")
+        if self.STREAM_MAX_BYTES < 1 or self.STREAM_PREFIX_BYTES < 0:
+            raise ValueError("STREAM_MAX_BYTES must be positive and STREAM_PREFIX_BYTES non-negative")
+        if self.SOFT404_SAMPLES < 1:
+            raise ValueError("SOFT404_SAMPLES must be at least 1 – can't calibrate on nothing")
+        if self.RESULTS_FLUSH_INTERVAL <= 0 or self.RESULTS_MAX_BYTES < 0 or self.RESULTS_BACKUPS < 0:
+            raise ValueError("RESULTS_FLUSH_INTERVAL must be positive, RESULTS_MAX_BYTES/BACKUPS non-negative")
+        if self.LOG_SUMMARY_INTERVAL < 0:
+            raise ValueError("LOG_SUMMARY_INTERVAL cannot be negative (0 = log every response)")
         if self.DELAY < 0:
             raise ValueError("Negative delay? Are we bending space-time now?")
         if self.USE_PROXY and not self.PROXY_URL:
@@ -136,11 +218,47 @@ def _load_config() -> ArsenalConfig:
         TIMEOUT=int(os.getenv("ARSENAL_TIMEOUT", "10")),#time taken for the server to respond,,thats 10sec for now
         RETRIES=int(os.getenv("ARSENAL_RETRIES", "3")),#number of times to retry the connection if it fails
         BACKOFF=float(os.getenv("ARSENAL_BACKOFF", "1.5")),#Between those retries, it waits 1.5x longer each time.
+        BACKOFF_BASE=float(os.getenv("ARSENAL_BACKOFF_BASE", "0.5")),#First retry waits up to this long (random, so threads don't retry in lockstep)
+        BACKOFF_MAX=float(os.getenv("ARSENAL_BACKOFF_MAX", "30")),
+        RETRY_BUDGET=float(os.getenv("ARSENAL_RETRY_BUDGET", "0.2")),#0.2 = retries can add 20% on top of the traffic, never more
+        RETRY_RESERVE=int(os.getenv("ARSENAL_RETRY_RESERVE", "10")),
+        BREAKERS=os.getenv("ARSENAL_BREAKERS", "true").lower() == "true",#Stop hammering a host that's down or blocking us
+        BREAKER_FAILURES=int(os.getenv("ARSENAL_BREAKER_FAILURES", "5")),
+        BREAKER_WINDOW=int(os.getenv("ARSENAL_BREAKER_WINDOW", "20")),
+        BREAKER_BLOCK_RATIO=float(os.getenv("ARSENAL_BREAKER_BLOCK_RATIO", "0.8")),
+        BREAKER_COOLDOWN=float(os.getenv("ARSENAL_BREAKER_COOLDOWN", "30")),#Seconds a host sits out before one probe tries again
         THREADS=int(os.getenv("ARSENAL_THREADS", "10")),
         DELAY=float(os.getenv("ARSENAL_DELAY", "0.1")),#This is the Sleep Time between every single request.configure this so that you don't get banned
+        ASYNC_CONCURRENCY=int(os.getenv("ARSENAL_ASYNC_CONCURRENCY", "200")),#How many requests --async keeps in the air at once
+        PROCESSES=int(os.getenv("ARSENAL_PROCESSES", "1")),#Worker processes for CPU-heavy scans. 0 = use every core
+        SESSION_POOL_SIZE=int(os.getenv("ARSENAL_SESSION_POOL", "0")),#Sessions per Requester. 0 = one per thread
+        ADAPTIVE=os.getenv("ARSENAL_ADAPTIVE", "false").lower() == "true",
+        CALIBRATE=os.getenv("ARSENAL_CALIBRATE", "false").lower() == "true",
+        CACHE=os.getenv("ARSENAL_CACHE", "false").lower() == "true",
+        CACHE_MAX_ENTRIES=int(os.getenv("ARSENAL_CACHE_ENTRIES", "10000")),
+        CACHE_MAX_MB=int(os.getenv("ARSENAL_CACHE_MB", "64")),
+        CACHE_TTL=float(os.getenv("ARSENAL_CACHE_TTL", "300")),
+        RPS=float(os.getenv("ARSENAL_RPS", "0")),#Exact global request rate (beats DELAY when set)
+        BURST=int(os.getenv("ARSENAL_BURST", "1")),
+        HOST_RPS=float(os.getenv("ARSENAL_HOST_RPS", "0")),#Per-host cap, for programmes that limit per domain
+        HOST_BURST=int(os.getenv("ARSENAL_HOST_BURST", "1")),
+        CHECKPOINT_DIR=os.getenv("ARSENAL_CHECKPOINT_DIR", ".arsenal/checkpoints"),#Where interrupted scans leave their progress
+        STREAM=os.getenv("ARSENAL_STREAM", "false").lower() == "true",
+        STREAM_MAX_BYTES=int(os.getenv("ARSENAL_STREAM_MAX_BYTES", "1048576")),#Byte cap per streamed body (1 MB)
+        STREAM_PREFIX_BYTES=int(os.getenv("ARSENAL_STREAM_PREFIX_BYTES", "65536")),
+        SOFT404=os.getenv("ARSENAL_SOFT404", "true").lower() == "true",#Filter catch-all pages that answer 200 to everything
+        SOFT404_SAMPLES=int(os.getenv("ARSENAL_SOFT404_SAMPLES", "3")),
+        SIGNATURE_PATHS=os.getenv("ARSENAL_SIGNATURES", ""),#Your own detector signatures, e.g. "~/sigs:/opt/team.json"
      
         VERIFY_SSL=os.getenv("ARSENAL_VERIFY_SSL", "false").lower() == "true",#In a lab environment, it's common to use self-signed certificates. Setting VERIFY_SSL to false allows you to bypass SSL verification, preventing those annoying certificate warnings.
         LOG_FILE=os.getenv("ARSENAL_LOG_FILE", "arsenal.log"),#This is the filename where the tool saves the receipts.
+        LOG_SUMMARY_INTERVAL=float(os.getenv("ARSENAL_LOG_INTERVAL", "5")),#Seconds between "200×940 404×60" summaries
+        METRICS=os.getenv("ARSENAL_METRICS", "true").lower() == "true",
+        METRICS_FILE=os.getenv("ARSENAL_METRICS_FILE", ""),#e.g. run1.json, then diff it against run2.json
+        RESULTS_FILE=os.getenv("ARSENAL_RESULTS", ""),#e.g. hits.jsonl, then jq '.url' hits.jsonl
+        RESULTS_FLUSH_INTERVAL=float(os.getenv("ARSENAL_RESULTS_FLUSH", "1")),
+        RESULTS_MAX_BYTES=int(os.getenv("ARSENAL_RESULTS_MAX_BYTES", str(100 * 1024 * 1024))),
+        RESULTS_BACKUPS=int(os.getenv("ARSENAL_RESULTS_BACKUPS", "5")),
         USE_PROXY=os.getenv("ARSENAL_USE_PROXY", "false").lower() == "true",
         PROXY_URL=os.getenv("ARSENAL_PROXY", "http://127.0.0.1:8080"),#
 
@@ -155,6 +273,15 @@ def _load_config() -> ArsenalConfig:
 config = _load_config()
 CONFIG = config                     # ← old tools that do "from core import CONFIG" still work
 __all__ = ["config", "CONFIG"]      # ← explicit exports = pro move
-# Quick sanity check on import
-if config.VERIFY_SSL is False and "LAB" not in os.getenv("ENV", "") and "CTF" not in os.getenv("ENV", ""):
-    print("⚠️  WARNING: VERIFY_SSL=False outside lab environment. Hope you like MITM attacks.")
\ No newline at end of file
+
+_warned_insecure = False
+
+
+def warn_if_insecure() -> None:
+    """Sanity check, once per process — when the first requester is built, not on import."""
+    global _warned_insecure
+    if _warned_insecure:
+        return
+    _warned_insecure = True
+    if config.VERIFY_SSL is False and "LAB" not in os.getenv("ENV", "") and "CTF" not in os.getenv("ENV", ""):
+        print("⚠️  WARNING: VERIFY_SSL=False outside lab environment. Hope you like MITM attacks.")
\ No newline at end of file
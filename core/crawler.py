@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# Module: Crawler
+# Author: Sanchez (The Scout Network)
+# Purpose: Walk a site through the engine — many pages in the air at once, a
+#          priority frontier (shallowest first), one canonical form per URL, a
+#          cap per host, and pages with a body we've already read skipped.
+
+import hashlib
+import heapq
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from core.config import config
+from core.engine import engine
+from core.links import host_of, normalize_url
+from core.logger import logger
+
+
+class Page(NamedTuple):
+    """What the crawler hands on_page: the response is None when the fetch failed."""
+    url: str
+    depth: int
+    response: Any
+    duplicate: bool     # Same body as a page we've already seen — its links were not followed
+
+
+class Crawler:
+    """
+    Concurrent frontier crawler on top of Engine.stream.
+        crawler = Crawler(fetch, extract, scope=..., on_page=...)
+        stats = crawler.crawl([start_url])
+    - fetch(url) → response or None (runs on engine worker threads)
+    - extract(response, url) → absolute links found on the page
+    - scope(url) → True if the link may be followed
+    - on_page(Page) is called from the worker thread for every fetched page
+    - per_host: pages in flight per host at most (THREADS is the overall ceiling)
+    - max_frontier: queued URLs beyond this are dropped (the deepest ones, by arrival)
+    """
+
+    def __init__(self,
+                 fetch: Callable[[str], Any],
+                 extract: Callable[[Any, str], Iterable[str]],
+                 scope: Optional[Callable[[str], bool]] = None,
+                 on_page: Optional[Callable[[Page], None]] = None,
+                 max_pages: int = 10_000,
+                 max_depth: int = 3,
+                 per_host: int = 8,
+                 max_frontier: int = 250_000):
+        self.fetch = fetch
+        self.extract = extract
+        self.scope = scope or (lambda url: True)
+        self.on_page = on_page
+        self.max_pages = max_pages
+        self.max_depth = max_depth
+        self.per_host = max(1, per_host)
+        self.max_frontier = max_frontier
+
+        self._frontier: List[Tuple[int, int, str]] = []       # (depth, arrival, url) min-heap
+        self._parked: Dict[str, Deque[Tuple[int, int, str]]] = {}  # host at its limit → waiting URLs
+        self._active: Dict[str, int] = {}
+        self._seen: Set[str] = set()
+        self._bodies: Set[bytes] = set()
+        self._arrival = 0
+        self._in_flight = 0
+        self._cond = threading.Condition()
+
+        self.scheduled = 0
+        self.fetched = 0
+        self.failed = 0
+        self.duplicates = 0
+        self.dropped = 0
+
+    # ———— Frontier ————
+    def add(self, url: str, depth: int = 0) -> bool:
+        """Queue a URL unless it's out of scope, too deep, or already seen (in any spelling)."""
+        if depth > self.max_depth:
+            return False
+        canonical = normalize_url(url)
+        if canonical is None or not self.scope(canonical):
+            return False
+        with self._cond:
+            if canonical in self._seen:
+                return False
+            if self.queued >= self.max_frontier:
+                self.dropped += 1
+                return False
+            self._seen.add(canonical)
+            self._arrival += 1
+            heapq.heappush(self._frontier, (depth, self._arrival, canonical))
+            self._cond.notify()
+        return True
+
+    @property
+    def queued(self) -> int:
+        return len(self._frontier) + sum(len(q) for q in self._parked.values())
+
+    @property
+    def seen(self) -> int:
+        return len(self._seen)
+
+    def _schedule(self) -> Iterator[Tuple[str, int]]:
+        """The engine's target source: blocks while pages in flight may still add links."""
+        while self.scheduled < self.max_pages:
+            with self._cond:
+                item = self._next()
+                while item is None:
+                    if self._in_flight == 0 and not self._parked:
+                        return
+                    self._cond.wait(0.1)
+                    item = self._next()
+                depth, _, url = item
+                host = host_of(url)
+                self._active[host] = self._active.get(host, 0) + 1
+                self._in_flight += 1
+                self.scheduled += 1
+            yield url, depth
+
+    def _next(self) -> Optional[Tuple[int, int, str]]:
+        """Shallowest URL whose host has a free slot; busy hosts' URLs wait in their own line."""
+        while self._frontier:
+            item = heapq.heappop(self._frontier)
+            host = host_of(item[2])
+            if self._active.get(host, 0) < self.per_host:
+                return item
+            self._parked.setdefault(host, deque()).append(item)
+        return None
+
+    def _release(self, host: str):
+        with self._cond:
+            self._in_flight -= 1
+            self._active[host] -= 1
+            parked = self._parked.get(host)
+            if parked:
+                heapq.heappush(self._frontier, parked.popleft())
+                if not parked:
+                    del self._parked[host]
+            self._cond.notify_all()
+
+    # ———— One page ————
+    def _visit(self, target: Tuple[str, int]) -> None:
+        url, depth = target
+        try:
+            try:
+                res = self.fetch(url)
+            except Exception as e:
+                logger.debug(f"Crawl error on {url}: {e}")
+                res = None
+
+            duplicate = False
+            if res is None:
+                with self._cond:
+                    self.failed += 1
+            else:
+                # Redirected? The landing URL counts as seen too
+                final = normalize_url(str(getattr(res, "url", "") or url))
+                duplicate = not self._first_body(res, final if final != url else None)
+                if not duplicate and depth < self.max_depth:
+                    for link in self.extract(res, url):
+                        self.add(link, depth + 1)
+
+            if self.on_page is not None:
+                self.on_page(Page(url, depth, res, duplicate))
+        finally:
+            self._release(host_of(url))
+        return None   # nothing for the engine to echo or stop on
+
+    def _first_body(self, res: Any, landed: Optional[str] = None) -> bool:
+        """Count the fetch; True unless this exact body has been read before."""
+        digest = getattr(res, "digest", None)
+        if digest is None:
+            digest = hashlib.blake2b(getattr(res, "content", None) or b"", digest_size=16).digest()
+        with self._cond:
+            self.fetched += 1
+            if landed:
+                self._seen.add(landed)
+            if digest in self._bodies:
+                self.duplicates += 1
+                return False
+            self._bodies.add(digest)
+            return True
+
+    # ———— Kick-off ————
+    def crawl(self, seeds: Iterable[str], desc: str = "Crawling") -> Dict[str, int]:
+        for seed in seeds:
+            self.add(seed, 0)
+        # window = THREADS: every future in the air holds a host slot, so none should sit queued
+        for _ in engine.stream(self._visit, self._schedule(), desc=desc, window=config.THREADS):
+            pass
+        return self.stats()
+
+    def stats(self) -> Dict[str, int]:
+        return {"scheduled": self.scheduled, "fetched": self.fetched, "failed": self.failed,
+                "duplicates": self.duplicates, "seen": self.seen, "queued": self.queued,
+                "dropped": self.dropped}
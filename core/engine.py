@@ -7,10 +7,22 @@
 # Purpose: Abstracting away the threading chaos.
 
 import argparse
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Callable, Iterable, List, Any, Optional
+import asyncio
+import multiprocessing as mp
+import os
+import queue
+import threading
+import time
+from dataclasses import fields
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Any, Optional
 from core.config import config
-from core.logger import logger
+from core.logger import logger, status_summary
+from core.metrics import metrics
+from core.ratelimit import effective_rps
+from core.resilience import get_breakers, get_retry_budget
+from core.requester import BATCH_CHUNK, add_observer, remove_observer
 
 # 📊 Try to import tqdm for a pro progress bar, fallback if missing
 try:
@@ -19,6 +31,206 @@ try:
 except ImportError:
     HAS_TQDM = False
 
+# ———— ADAPTIVE CONCURRENCY (The Gaffer) ————
+class AdaptiveController:
+    """
+    Decides how many requests are on the pitch at once.
+    AIMD (the TCP congestion-control recipe):
+    - every healthy window → limit + 1   (additive increase)
+    - 429s, 5xx / transport-error bursts or a latency spike → limit × 0.5
+      (multiplicative decrease)
+    Optional calibration first: double the limit each stage while throughput
+    still climbs >10%; the last level that paid off is the knee we start from.
+    Fed by core.requester observers: observe(latency, status).
+    """
+
+    def __init__(self,
+                 min_limit: int = 1,
+                 max_limit: int = 64,
+                 start: Optional[int] = None,
+                 window: int = 20,
+                 backoff: float = 0.5,
+                 error_threshold: float = 0.1,
+                 latency_factor: float = 2.0,
+                 min_spike: float = 0.05,
+                 calibrate: bool = False,
+                 clock: Callable[[], float] = time.monotonic):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.window = window
+        self.backoff = backoff
+        self.error_threshold = error_threshold
+        self.latency_factor = latency_factor
+        self.min_spike = min_spike    # sub-50ms wobbles are jitter, not a struggling server
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        self.limit = float(start or self.min_limit)
+        self.peak = self.limit
+        self.baseline: Optional[float] = None   # best window mean latency seen (slowly forgiven)
+        self.decreases = 0
+        self._reset_window()
+
+        # Calibration: 1, 2, 4, ... up to max_limit
+        self.calibrating = calibrate
+        self._levels: List[int] = []
+        if calibrate:
+            level = self.min_limit
+            while level < self.max_limit:
+                self._levels.append(level)
+                level *= 2
+            self._levels.append(self.max_limit)
+            self.limit = float(self._levels[0])
+        self._stage = 0
+        self._stage_start = clock()
+        self._best = (0.0, self.min_limit)   # (req/s, level)
+
+    def _reset_window(self):
+        self._samples = 0
+        self._errors = 0
+        self._throttled = 0
+        self._latency_sum = 0.0
+
+    @property
+    def current(self) -> int:
+        """The integer number of in-flight slots the engine should fill."""
+        return max(self.min_limit, min(self.max_limit, int(self.limit)))
+
+    def observe(self, latency: float, status: Optional[int]):
+        with self._lock:
+            self._samples += 1
+            self._latency_sum += latency
+            if status is None:
+                self._errors += 1
+            elif status == 429 or status >= 500:
+                self._throttled += 1
+
+            # A window is at least one full rotation of the current squad
+            needed = max(self.window, self.current * (4 if self.calibrating else 1))
+            if self._samples >= needed:
+                if self.calibrating:
+                    self._calibration_step()
+                else:
+                    self._aimd_step()
+                self._reset_window()
+
+    def _aimd_step(self):
+        mean = self._latency_sum / self._samples
+        throttled = self._throttled / self._samples
+        errors = self._errors / self._samples
+        spike = (self.baseline is not None
+                 and mean > self.baseline * self.latency_factor
+                 and mean - self.baseline > self.min_spike)
+
+        if throttled >= self.error_threshold or errors >= self.error_threshold or spike:
+            new = max(float(self.min_limit), self.limit * self.backoff)
+            if int(new) < self.current:
+                self.decreases += 1
+                if spike and throttled < self.error_threshold and errors < self.error_threshold:
+                    logger.debug(f"🐢 Adaptive: latency spike → concurrency {self.current} → {int(new)}")
+                else:
+                    reason = "429/5xx" if throttled >= self.error_threshold else "errors"
+                    logger.warning(f"🐢 Adaptive: {reason} → concurrency {self.current} → {int(new)}")
+            self.limit = new
+        else:
+            self.limit = min(float(self.max_limit), self.limit + 1)
+            self.peak = max(self.peak, self.limit)
+
+        # The baseline creeps up 1% per window so a target that is just slower
+        # today doesn't keep us pinned to the floor forever
+        self.baseline = mean if self.baseline is None else min(mean, self.baseline * 1.01)
+
+    def _calibration_step(self):
+        now = self._clock()
+        elapsed = max(now - self._stage_start, 1e-9)
+        rps = self._samples / elapsed
+        bad = (self._errors + self._throttled) / self._samples
+        level = self._levels[self._stage]
+        mean = self._latency_sum / self._samples
+
+        best_rps, best_level = self._best
+        if bad >= self.error_threshold or (best_rps and rps < best_rps * 1.10):
+            self._finish_calibration(best_level, best_rps)
+            return
+
+        self._best = (rps, level)
+        self.baseline = mean if self.baseline is None else min(self.baseline, mean)
+        self._stage += 1
+        if self._stage >= len(self._levels):
+            self._finish_calibration(level, rps)
+            return
+        self.limit = float(self._levels[self._stage])
+        self._stage_start = now
+
+    def _finish_calibration(self, level: int, rps: float):
+        self.calibrating = False
+        self.limit = float(level)
+        self.peak = max(self.peak, self.limit)
+        logger.info(f"🎯 Calibration: throughput knee at {level} in-flight (~{rps:.0f} req/s)")
+
+
+# ———— SHARDING (The Squad Rotation) ————
+SHARD_BATCH = 256      # targets per IPC message — pickling one at a time kills the gain
+SHARD_TICK = 256       # completions per progress message from a worker
+
+
+def _config_snapshot() -> dict:
+    """Plain-dict copy of the tactics board, so spawned workers play the same system."""
+    return {f.name: getattr(config, f.name) for f in fields(config)}
+
+
+def _shard_worker(task_function: Callable, inbox, outbox, stop_event, snapshot: dict,
+                  session_factory: Optional[Callable], kwargs: dict) -> None:
+    """
+    One process = one shard. Pulls target batches from the shared inbox, runs them
+    through its own thread pool (and its own Requester), and reports back:
+    ("hit", data) / ("tick", n) / ("error", msg), then ("metrics", snapshot)
+    and ("done", n) on the way out.
+    """
+    for name, value in snapshot.items():
+        setattr(config, name, value)
+
+    done = 0
+    reported = 0
+    lock = threading.Lock()
+
+    def counted(target, **kw):
+        nonlocal done, reported
+        try:
+            return task_function(target, **kw)
+        finally:
+            with lock:
+                done += 1
+                if done - reported >= SHARD_TICK:
+                    outbox.put(("tick", done - reported))
+                    reported = done
+
+    def pull():
+        # Stop pulling the moment anyone (any process) scores the Golden Goal
+        while not stop_event.is_set():
+            try:
+                batch = inbox.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            if batch is None:
+                return
+            yield from batch
+
+    try:
+        if session_factory is not None:
+            kwargs = {**kwargs, "session": session_factory()}
+        for data in engine.stream(counted, pull(), desc=f"shard-{os.getpid()}", progress=False, **kwargs):
+            outbox.put(("hit", data))
+            if stop_event.is_set():
+                break
+    except Exception as e:
+        outbox.put(("error", f"{type(e).__name__}: {e}"))
+    finally:
+        outbox.put(("metrics", (os.getpid(), metrics.snapshot())))   # Before "done": the parent stops reading there
+        with lock:
+            outbox.put(("done", done - reported))
+
+
 class Engine:
     """
     The Playmaker. Handles threading, progress bars, and CLI arguments.
@@ -33,8 +245,10 @@ class Engine:
         # Standard args for every tool
         parser.add_argument("-t", "--threads", type=int, default=config.THREADS, 
                           help=f"Number of threads (default: {config.THREADS})")
-        parser.add_argument("-o", "--output", type=str, 
-                          help="Save valid hits to a file")
+        parser.add_argument("-o", "--output", type=str, default=config.RESULTS_FILE or None,
+                          help="Save hits as they land (*.jsonl = one JSON record per hit)")
+        parser.add_argument("--rps", type=float, default=config.RPS,
+                          help="Exact global requests/second (0 = unlimited)")
         
         return parser
 
@@ -42,76 +256,462 @@ class Engine:
             task_function: Callable, 
             targets: Iterable[Any], 
             desc: str = "Scanning", 
+            total: Optional[int] = None,
+            window: Optional[int] = None,
             **kwargs) -> List[Any]:
         """
         The Heavy Lifter.
         - task_function: function(target) -> returns Result or None
-        - targets: List or Range of inputs
+        - targets: List, Range or any (lazy) iterator of inputs
         - desc: Label for the progress bar
+        - total / window / sink: see stream()
         """
-        
-        # Convert range/generator to list so we know the total size for the progress bar
-        target_list = list(targets)
-        total_targets = len(target_list)
         results = []
 
-        logger.info(f"🚀 {desc}: Processing {total_targets} targets with {config.THREADS} threads...")
+        try:
+            for data in self.stream(task_function, targets, desc=desc, total=total, window=window, **kwargs):
+                results.append(data)
+        except KeyboardInterrupt:
+            logger.critical("\n🛑 Aborted.")
+            return results
+
+        # Golden Goal already announced itself in stream()
+        if config.STOP_ON_SUCCESS and results:
+            return results
+
+        logger.info(f"🏁 Job '{desc}' finished. Found {len(results)} hits.")
+        return results
+
+    @staticmethod
+    def _kick_off():
+        """
+        Fresh counters for a new run, so its match report covers only this run
+        (the registry, breakers and retry budget outlive it in this process).
+        Breaker states and earned retry tokens carry over.
+        """
+        metrics.reset()
+        get_breakers().reset_counts()
+        get_retry_budget().reset_counts()
+
+    @staticmethod
+    def _match_report():
+        """The full-time stats: where the time went, per host and per phase (core.metrics), who got benched."""
+        get_breakers().log_summary()
+        budget = get_retry_budget()
+        if budget.denied:
+            logger.info(f"💸 Retry budget: {budget.spent:,} retries spent, {budget.denied:,} refused")
+        if config.METRICS:
+            metrics.log_summary(config.METRICS_FILE or None)
+
+    def stream(self,
+               task_function: Callable,
+               targets: Iterable[Any],
+               desc: str = "Scanning",
+               total: Optional[int] = None,
+               window: Optional[int] = None,
+               progress: bool = True,
+               adaptive: Optional[AdaptiveController] = None,
+               sink: Any = None,
+               **kwargs) -> Iterator[Any]:
+        """
+        The Conveyor Belt. Same contract as run(), but lazy on both ends:
+        - targets are pulled from the iterator only as slots free up, so a
+          5M-line wordlist never becomes 5M futures
+        - hits are yielded the moment they land
+        - total: size hint for the progress bar when targets has no len()
+        - window: max in-flight futures (default: THREADS * 4)
+        - progress: False silences the bar, hit echo + metrics table (shard workers)
+        - adaptive: an AdaptiveController (default: built when config.ADAPTIVE);
+          it then decides the in-flight count, THREADS is only the ceiling
+        - sink: a core.results.ResultSink; every hit is written to it as it lands
+        """
+        if total is None and hasattr(targets, "__len__"):
+            total = len(targets)
+        limit = window or config.THREADS * 4
+        source = iter(targets)
+        self._kick_off()
+
+        if adaptive is None and (config.ADAPTIVE or config.CALIBRATE):
+            adaptive = AdaptiveController(max_limit=config.THREADS, calibrate=config.CALIBRATE)
+        if adaptive is not None:
+            add_observer(adaptive.observe)
+
+        def capacity() -> int:
+            return adaptive.current if adaptive is not None else limit
+
+        size = f"{total:,}" if total is not None else "a stream of"
+        logger.info(f"🚀 {desc}: Processing {size} targets with {config.THREADS} threads...")
+
+        # 📊 Progress Bar Logic (no total → tqdm still shows count + rate)
+        bar = tqdm(total=total, desc=desc, unit="req", leave=False) if HAS_TQDM and progress else None
 
+        executor = ThreadPoolExecutor(max_workers=config.THREADS)
+        in_flight = set()
         try:
-            with ThreadPoolExecutor(max_workers=config.THREADS) as executor:
-                # Map futures to targets
-                # We pass **kwargs to the function if needed (e.g. url=...)
-                future_to_target = {
-                    executor.submit(task_function, target, **kwargs): target 
-                    for target in target_list
-                }
-
-                # 📊 Progress Bar Logic
-                if HAS_TQDM:
-                    # The "Pro" look
-                    futures_iter = tqdm(as_completed(future_to_target), 
-                                      total=total_targets, 
-                                      desc=desc, 
-                                      unit="req", 
-                                      leave=False) # Clears bar when done
-                else:
-                    # The "Basic" look (fallback)
-                    futures_iter = as_completed(future_to_target)
+            # Kick-off: fill the window
+            # We pass **kwargs to the function if needed (e.g. url=...)
+            for target in islice(source, capacity()):
+                in_flight.add(executor.submit(task_function, target, **kwargs))
+
+            while in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
 
-                # Collect Results
-                for future in futures_iter:
+                for future in done:
+                    if bar is not None:
+                        bar.update(1)
                     try:
                         data = future.result()
-                        if data:
-                            results.append(data)
-                            # If using tqdm, we can write to side without breaking the bar
-                            if HAS_TQDM:
-                                tqdm.write(f"✅ Hit: {data}")
-                                 
-                            # ———— SANCHEZ GOLDEN GOAL LOGIC ————
-                            if config.STOP_ON_SUCCESS:
-                                logger.success("🏆 Golden Goal! Stopping match early.")
-                                executor.shutdown(wait=False) # Kill pending threads
-                                # Cancel remaining futures to stop them processing
-                                for f in future_to_target:
-                                    f.cancel()
-                                return results # Return immediately with the win
-                            # ———————————————————————————————————
-                    except KeyboardInterrupt:
-                        logger.critical("🛑 Scan cancelled by user.")
-                        executor.shutdown(wait=False)
-                        break
-                    except Exception as e:
+                    except Exception:
                         # Log error but keep moving (don't crash the whole scan)
-                        # logger.debug(f"Task failed: {e}") 
-                        pass
-        
-        except KeyboardInterrupt:
+                        continue
+
+                    if data:
+                        # If using tqdm, we can write to side without breaking the bar
+                        if bar is not None:
+                            tqdm.write(f"✅ Hit: {data}")
+                        if sink is not None:
+                            sink.write(data)
+                        yield data
+
+                        # ———— SANCHEZ GOLDEN GOAL LOGIC ————
+                        if config.STOP_ON_SUCCESS:
+                            logger.success("🏆 Golden Goal! Stopping match early.")
+                            return
+                        # ———————————————————————————————————
+
+                # Refill: up to capacity (one-for-one, unless the Gaffer changed the squad size)
+                for target in islice(source, max(0, capacity() - len(in_flight))):
+                    in_flight.add(executor.submit(task_function, target, **kwargs))
+        finally:
+            if adaptive is not None:
+                remove_observer(adaptive.observe)
+                logger.info(f"🎛️ Adaptive concurrency settled at {adaptive.current} "
+                            f"(peak {int(adaptive.peak)}, {adaptive.decreases} cut-backs)")
+            # Runs on completion, Golden Goal, Ctrl-C, or the consumer walking away
+            for f in in_flight:
+                f.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+            if bar is not None:
+                bar.close()
+            status_summary.flush()
+            if progress:
+                self._match_report()
+
+    def stream_batch(self,
+                     check: Callable,
+                     requests: Iterable[Any],
+                     requester: Any = None,
+                     desc: str = "Multiplexing",
+                     total: Optional[int] = None,
+                     chunk: Optional[int] = None,
+                     progress: bool = True,
+                     sink: Any = None,
+                     **kwargs) -> Iterator[Any]:
+        """
+        The One-Two. stream() for HTTP/2: no thread per request, the requests go
+        out through Requester.iter_batch() as concurrent streams on one connection
+        per origin — a handful of handshakes for the whole scan.
+        - check: function(request, response, **kwargs) -> Result or None; runs on
+          this thread as each response lands (response is None on failure)
+        - requests: what Requester.batch() takes — URLs, (method, url[, kwargs])
+        - requester: default the shared one (core.default_requester())
+        - chunk: requests pulled off the source per batch (default BATCH_CHUNK)
+        - sink: as in stream()
+        Falls back to the session pool wherever h2 isn't on (see requester.http2_enabled).
+        """
+        if requester is None:
+            from core import default_requester
+            requester = default_requester()
+        if total is None and hasattr(requests, "__len__"):
+            total = len(requests)
+        self._kick_off()
+
+        size = f"{total:,}" if total is not None else "a stream of"
+        logger.info(f"🚀 {desc}: Processing {size} targets as HTTP/2 streams...")
+        bar = tqdm(total=total, desc=desc, unit="req", leave=False) if HAS_TQDM and progress else None
+        try:
+            for request, response in requester.iter_batch(requests, chunk=chunk or BATCH_CHUNK):
+                if bar is not None:
+                    bar.update(1)
+                try:
+                    data = check(request, response, **kwargs)
+                except Exception:
+                    continue
+
+                if data:
+                    if bar is not None:
+                        tqdm.write(f"✅ Hit: {data}")
+                    if sink is not None:
+                        sink.write(data)
+                    yield data
+
+                    # ———— SANCHEZ GOLDEN GOAL LOGIC ————
+                    if config.STOP_ON_SUCCESS:
+                        logger.success("🏆 Golden Goal! Stopping match early.")
+                        return
+        finally:
+            if bar is not None:
+                bar.close()
+            status_summary.flush()
+            if progress:
+                requester.log_h2_stats()
+                self._match_report()
+
+    async def run_async(self,
+                        task_function: Callable,
+                        targets: Iterable[Any],
+                        desc: str = "Scanning",
+                        concurrency: Optional[int] = None,
+                        total: Optional[int] = None,
+                        sink: Any = None,
+                        **kwargs) -> List[Any]:
+        """
+        The Counter-Press. Same contract as run(), but on one event loop.
+        - task_function: async def f(target, **kwargs) -> Result or None
+          (plain functions still work — they get pushed to worker threads)
+        - targets: List, Range or any (lazy) iterator of inputs
+        - concurrency: max in-flight tasks (default: config.ASYNC_CONCURRENCY)
+        - total: size hint for the progress bar when targets has no len()
+        - sink: as in stream() — hits hit the disk as they land, not when the list comes back
+        """
+        limit = concurrency or config.ASYNC_CONCURRENCY
+        is_coroutine = asyncio.iscoroutinefunction(task_function)
+
+        if total is None and hasattr(targets, "__len__"):
+            total = len(targets)
+        results = []
+        self._kick_off()
+
+        size = f"{total:,}" if total is not None else "a stream of"
+        logger.info(f"🚀 {desc}: Processing {size} targets with {limit} async slots...")
+
+        # The semaphore is the squad limit: a new task only walks on when one walks off
+        slots = asyncio.Semaphore(limit)
+        pending = set()
+        golden_goal = False
+        bar = tqdm(total=total, desc=desc, unit="req", leave=False) if HAS_TQDM else None
+
+        async def _shot(target):
+            if is_coroutine:
+                return await task_function(target, **kwargs)
+            return await asyncio.to_thread(task_function, target, **kwargs)
+
+        def _on_done(task: asyncio.Task):
+            nonlocal golden_goal
+            # Released here (not in _shot) so cancelled-before-start tasks give their slot back too
+            slots.release()
+            pending.discard(task)
+            if bar is not None:
+                bar.update(1)
+            if task.cancelled() or task.exception() is not None or golden_goal:
+                return
+
+            data = task.result()
+            if data:
+                results.append(data)
+                if HAS_TQDM:
+                    tqdm.write(f"✅ Hit: {data}")
+                if sink is not None:
+                    sink.write(data)
+
+                # ———— SANCHEZ GOLDEN GOAL LOGIC ————
+                if config.STOP_ON_SUCCESS:
+                    golden_goal = True
+                    logger.success("🏆 Golden Goal! Stopping match early.")
+                    for t in list(pending):
+                        t.cancel()
+
+        try:
+            # Lazy pull: the semaphore means we never read ahead of free slots
+            for target in targets:
+                await slots.acquire()
+                if golden_goal:
+                    break
+                task = asyncio.create_task(_shot(target))
+                pending.add(task)
+                task.add_done_callback(_on_done)
+
+            if pending:
+                await asyncio.gather(*list(pending), return_exceptions=True)
+
+        except (KeyboardInterrupt, asyncio.CancelledError):
             logger.critical("\n🛑 Aborted.")
+            for t in list(pending):
+                t.cancel()
+            return results
+        finally:
+            if bar is not None:
+                bar.close()
+            status_summary.flush()
+            self._match_report()
+
+        if golden_goal:
             return results
 
         logger.info(f"🏁 Job '{desc}' finished. Found {len(results)} hits.")
         return results
 
+    def run_sharded(self,
+                    task_function: Callable,
+                    targets: Iterable[Any],
+                    desc: str = "Scanning",
+                    processes: Optional[int] = None,
+                    session_factory: Optional[Callable] = None,
+                    total: Optional[int] = None,
+                    **kwargs) -> List[Any]:
+        """
+        The Full Squad. Same contract as run(), spread over N worker processes.
+        - processes: worker count (default: config.PROCESSES, 0 → all cores)
+        - session_factory: called once INSIDE each worker and passed to the task
+          as session= (e.g. Requester). Sessions can't cross process borders.
+        - task_function and kwargs must be picklable (module-level functions).
+        """
+        results = []
+        try:
+            for data in self.stream_sharded(task_function, targets, desc=desc, processes=processes,
+                                            session_factory=session_factory, total=total, **kwargs):
+                results.append(data)
+        except KeyboardInterrupt:
+            logger.critical("\n🛑 Aborted.")
+        return results
+
+    def stream_sharded(self,
+                       task_function: Callable,
+                       targets: Iterable[Any],
+                       desc: str = "Scanning",
+                       processes: Optional[int] = None,
+                       session_factory: Optional[Callable] = None,
+                       total: Optional[int] = None,
+                       sink: Any = None,
+                       **kwargs) -> Iterator[Any]:
+        """
+        The Full Squad, lazily. The parent only feeds batches and merges hits;
+        detection (the CPU-heavy part) runs in the workers, off our GIL.
+        Workers pull from one shared queue, so a slow shard never holds up the rest.
+        Hits are written to `sink` (see stream()) here in the parent, so one file takes them all.
+        """
+        workers = processes if processes is not None else config.PROCESSES
+        workers = workers or os.cpu_count() or 1
+        if total is None and hasattr(targets, "__len__"):
+            total = len(targets)
+        self._kick_off()
+
+        size = f"{total:,}" if total is not None else "a stream of"
+        logger.info(f"🚀 {desc}: Processing {size} targets with {workers} processes × {config.THREADS} threads...")
+
+        # spawn, not fork: tls_client's Go runtime does not survive a fork
+        ctx = mp.get_context("spawn")
+        inbox = ctx.Queue(maxsize=workers * 4)   # backpressure: we never read far ahead
+        outbox = ctx.Queue()
+        stop_event = ctx.Event()
+        snapshot = _config_snapshot()
+
+        # Each shard has its own limiter → split the budget so the SUM hits the target rate
+        rate = effective_rps(config)
+        if rate > 0:
+            snapshot["RPS"] = rate / workers
+        if config.HOST_RPS > 0:
+            snapshot["HOST_RPS"] = config.HOST_RPS / workers
+
+        squad = [
+            ctx.Process(target=_shard_worker, daemon=True,
+                        args=(task_function, inbox, outbox, stop_event, snapshot, session_factory, kwargs))
+            for _ in range(workers)
+        ]
+        for p in squad:
+            p.start()
+
+        def feed():
+            def put(item) -> bool:
+                while not stop_event.is_set():
+                    try:
+                        inbox.put(item, timeout=0.2)
+                        return True
+                    except queue.Full:
+                        continue
+                return False
+
+            source = iter(targets)
+            while not stop_event.is_set():
+                batch = list(islice(source, SHARD_BATCH))
+                if not batch or not put(batch):
+                    break
+            for _ in squad:
+                if not put(None):
+                    break
+
+        feeder = threading.Thread(target=feed, daemon=True)
+        feeder.start()
+
+        bar = tqdm(total=total, desc=desc, unit="req", leave=False) if HAS_TQDM else None
+        processed = 0
+        hits = 0
+        finished = 0
+        reported_metrics = 0
+        golden_goal = False
+
+        def absorb(payload):
+            nonlocal reported_metrics
+            pid, snapshot = payload
+            metrics.merge(snapshot, label=f"shard-{pid}")
+            reported_metrics += 1
+        try:
+            while finished < len(squad):
+                try:
+                    kind, payload = outbox.get(timeout=0.5)
+                except queue.Empty:
+                    # A worker that died hard (OOM, segfault) never says "done"
+                    if not any(p.is_alive() for p in squad):
+                        break
+                    continue
+
+                if kind in ("tick", "done"):
+                    processed += payload
+                    if bar is not None:
+                        bar.update(payload)
+                    finished += kind == "done"
+                elif kind == "error":
+                    logger.error(f"❌ Shard crashed: {payload}")
+                elif kind == "metrics":
+                    absorb(payload)
+                elif kind == "hit" and not golden_goal:
+                    hits += 1
+                    if bar is not None:
+                        tqdm.write(f"✅ Hit: {payload}")
+                    if sink is not None:
+                        sink.write(payload)
+                    yield payload
+
+                    # ———— SANCHEZ GOLDEN GOAL LOGIC (across processes) ————
+                    if config.STOP_ON_SUCCESS:
+                        golden_goal = True
+                        stop_event.set()
+                        logger.success("🏆 Golden Goal! Stopping every shard.")
+        finally:
+            stop_event.set()
+            # Consumer walked away early: still collect the workers' sign-off metrics (briefly)
+            deadline = time.monotonic() + 2
+            while finished < len(squad) and time.monotonic() < deadline and any(p.is_alive() for p in squad):
+                try:
+                    kind, payload = outbox.get(timeout=0.2)
+                except queue.Empty:
+                    continue
+                if kind == "metrics":
+                    absorb(payload)
+                finished += kind == "done"
+            for p in squad:
+                p.join(timeout=2)
+                if p.is_alive():
+                    p.terminate()
+            if bar is not None:
+                bar.close()
+            # Every worker's metrics were merged into ours as it signed off
+            if reported_metrics < len(squad):
+                logger.warning(f"📈 {len(squad) - reported_metrics} shard(s) died before reporting: "
+                               f"their requests are missing from the metrics")
+            self._match_report()
+
+        logger.info(f"🏁 Job '{desc}' finished. {processed:,} targets across {len(squad)} processes, {hits} hits.")
+
 # Singleton instance
 engine = Engine()
\ No newline at end of file
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# Module: Links
+# Author: Sanchez (The Scout Network)
+# Purpose: Pull every link and API endpoint out of a response — HTML attributes,
+#          JSON values, inline and bundled JavaScript (fetch/axios/XHR calls,
+#          route tables) — in ONE pass over the body, fed chunk by chunk.
+
+import re
+from functools import lru_cache
+from typing import List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, quote, unquote, urlencode, urljoin, urlsplit, urlunsplit
+
+MAX_TOKEN = 2048          # Longest link we'll take; bounds how much of a chunk is carried over
+_CARRY = MAX_TOKEN + 64   # ... plus room for the `href = "` / `axios.get(` in front of it
+
+# The "tokenizer": one alternation, compiled once, walking the body left to right in
+# re's C loop (any tokenizer written in Python loses to it). Every branch opens with
+# a literal, so re skips ahead on a first-character set instead of trying each branch
+# at every offset — that alone is ~3x. Hence no \b, no IGNORECASE, and the HTML
+# attributes spelled out (plus upper-case HREF/SRC for the old-school pages).
+_VALUE = r"""\s*=\s*(?:"([^"<>]{1,%d})"|'([^'<>]{1,%d})'|([^\s"'<>`]{1,%d}))""" % ((MAX_TOKEN,) * 3)
+_CALL = r"""\s*\(?\s*["'`]([^"'`\s<>]{1,%d})["'`]""" % MAX_TOKEN
+_QUOTED = r"""((?:\\?/|https?:\\?/\\?/)[^"'`\s<>]{1,%d})""" % MAX_TOKEN
+_ATTRIBUTES = ("href", "src", "action", "poster", "data-src", "data-href", "data-url", "HREF", "SRC")
+_CALLS = (r"fetch", r"axios\.(?:get|post|put|patch|delete|head|request)", r"axios",    # JS calls: any path,
+          r"\.open\s*\(\s*[\"'][A-Za-z]+[\"']\s*,", r"\$\.(?:get|post|getJSON|ajax)")   # even relative
+_LINK = re.compile("|".join(
+    [attr + _VALUE for attr in _ATTRIBUTES]
+    + [call + _CALL for call in _CALLS]
+    + [quote + _QUOTED + quote for quote in "\"'`"]      # Quoted URLs/paths: JSON (\/ too), route tables
+))
+
+# Route parameters in JS: `/users/${id}`, `/users/:id`, `/users/{id}`, `/users/[id]`
+_PLACEHOLDER = re.compile(r"\$\{[^}]*\}|(?<=/):[A-Za-z_]\w*|\{[^}/]*\}|\[[^\]/]*\]")
+_PLAIN_ROOTED = re.compile(r"/[A-Za-z0-9/:@!$&'()*+,;=~._-]*(?:\?[A-Za-z0-9_.~-]*=?[A-Za-z0-9_.~-]*)?\Z")
+_SKIP = ("data:", "javascript:", "mailto:", "tel:", "about:", "blob:", "#")
+_STATIC = (".png", ".jpg", ".jpeg", ".gif", ".svg", ".ico", ".woff", ".woff2", ".ttf", ".css.map", ".js.map")
+
+
+# ———— Canonical URLs (shared with core.crawler's seen-index) ————
+DEFAULT_PORTS = {"http": 80, "https": 443}
+_PATH_SAFE = "/:@!$&'()*+,;=~-._"
+# Already canonical? Most links are, and then the full rebuild below is skipped
+_PLAIN_HOST = re.compile(r"[a-z0-9.-]+\Z")
+_PLAIN_PATH = re.compile(r"/[A-Za-z0-9/:@!$&'()*+,;=~._-]*\Z")
+_PLAIN_QUERY = re.compile(r"[A-Za-z0-9_.~-]*=?[A-Za-z0-9_.~-]*\Z")
+
+
+@lru_cache(maxsize=65_536)
+def normalize_url(url: str) -> Optional[str]:
+    """
+    One spelling per resource, so the seen-index can't be fooled:
+    lower-case scheme + host, no default port, no fragment, dot-segments
+    resolved, percent-escapes made consistent, query keys sorted.
+    Returns None for anything that isn't http(s).
+    """
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return None
+    if (parts.scheme in DEFAULT_PORTS and _PLAIN_HOST.match(parts.netloc) and _PLAIN_PATH.match(parts.path)
+            and "/." not in parts.path and _PLAIN_QUERY.match(parts.query)):
+        return f"{parts.scheme}://{parts.netloc}{parts.path}" + (f"?{parts.query}" if parts.query else "")
+
+    try:
+        port = parts.port
+    except ValueError:
+        return None
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS or not parts.hostname:
+        return None
+
+    host = parts.hostname.lower()
+    if ":" in host:
+        host = f"[{host}]"    # IPv6 literal
+    if port and port != DEFAULT_PORTS[scheme]:
+        host = f"{host}:{port}"
+
+    segments: List[str] = []
+    for segment in parts.path.split("/"):
+        if segment == "..":
+            if segments:
+                segments.pop()
+        elif segment != ".":
+            segments.append(quote(unquote(segment), safe=_PATH_SAFE))
+    path = "/".join(segments)
+    if not path.startswith("/"):
+        path = "/" + path
+    if parts.path.endswith(("/.", "/..")) and not path.endswith("/"):
+        path += "/"
+
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)), doseq=True)
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def host_of(url: str) -> str:
+    return urlsplit(url).netloc
+
+
+@lru_cache(maxsize=131_072)
+def _join(base: str, link: str) -> Optional[str]:
+    return normalize_url(urljoin(base, link))
+
+
+@lru_cache(maxsize=4096)
+def _origin(base_url: str) -> str:
+    canonical = normalize_url(base_url) or base_url
+    parts = urlsplit(canonical)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def resolve(base_url: str, link: str) -> Optional[str]:
+    """
+    Absolute, canonical form of a link found on base_url (None if it isn't http(s)).
+    Rooted ("/api/x") and absolute links skip urljoin altogether (normalize_url
+    resolves dot-segments itself); a rooted link that is already canonical is just
+    glued to the origin, and everything else comes out of an lru_cache.
+    """
+    if link.startswith("/") and not link.startswith("//"):
+        if _PLAIN_ROOTED.match(link) and "/." not in link:
+            return _origin(base_url) + link     # Already canonical: nothing to split or rebuild
+        return normalize_url(_origin(base_url) + link)
+    if link.startswith(("http://", "https://")):
+        return normalize_url(link)
+    return _join(base_url, link)
+
+
+class LinkExtractor:
+    """
+    Incremental extractor for one response:
+        ex = LinkExtractor(url)
+        for chunk in body_chunks: ex.feed(chunk)
+        ex.close()
+        ex.links       → absolute, canonical URLs worth fetching
+        ex.endpoints   → route templates from JS ('/users/{ID}'), not fetchable as-is
+    Matches are deduped raw before anything gets resolved.
+    """
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url
+        self.links: Set[str] = set()
+        self.endpoints: Set[str] = set()
+        self._raw: Set[str] = set()
+        self._carry = ""
+
+    def feed(self, chunk: str):
+        text = self._carry + chunk if self._carry else chunk
+        # Matches starting in the last _CARRY chars could be cut short by the chunk
+        # boundary; they're left for the next feed, which sees them whole
+        cut = len(text) - _CARRY
+        if cut > 0:
+            # Deduped inside the scan: a nav bar repeated 10k times costs 10k set hits, nothing more
+            self._take({m.group(m.lastindex) for m in _LINK.finditer(text) if m.start() < cut})
+            text = text[cut:]
+        self._carry = text
+
+    def close(self) -> "LinkExtractor":
+        self._take({m.group(m.lastindex) for m in _LINK.finditer(self._carry)})
+        self._carry = ""
+        return self
+
+    def _take(self, found: Set[str]):
+        fresh = found - self._raw
+        self._raw |= fresh
+        for link in fresh:
+            self._add(link)
+
+    def _add(self, link: str):
+        if "\\" in link:
+            link = link.replace("\\/", "/")     # Escaped JSON slashes
+        link = link.strip()
+        if not link or link.startswith(_SKIP) or link.lower().endswith(_STATIC):
+            return
+        if any(c in link for c in "${[:"):
+            template = _PLACEHOLDER.sub("{ID}", link)
+            if template != link:
+                resolved = urljoin(self.base_url, template.split("?", 1)[0])
+                if resolved.startswith(("http://", "https://")):
+                    self.endpoints.add(resolved)
+                return
+        resolved = resolve(self.base_url, link)
+        if resolved is not None:
+            self.links.add(resolved)
+
+
+def extract(text: str, base_url: str, chunk_size: int = 1 << 20) -> Tuple[Set[str], Set[str]]:
+    """(links, endpoints) from a whole body, walked in chunk_size slices."""
+    extractor = LinkExtractor(base_url)
+    for start in range(0, len(text), chunk_size):
+        extractor.feed(text[start:start + chunk_size])
+    extractor.close()
+    return extractor.links, extractor.endpoints
+
+
+def extract_links(text: str, base_url: str) -> Set[str]:
+    return extract(text, base_url)[0]
+
@@ -7,12 +7,19 @@ Author: Sanchez
 Purpose: Makes the terminal look like the Emirates on a Champions League night
 """
 
+import atexit
 import logging
+import queue
 import sys
+import threading
+import time
+from collections import Counter
+from logging.handlers import QueueHandler, QueueListener
+from typing import Callable, Dict, Optional
+
 from colorama import Fore, Style, init
 
-# Initialise colorama once, globally – let autoreset handle the cleanup
-init(autoreset=True)
+from core.config import config
 
 
 class ArsenalFormatter(logging.Formatter):
@@ -40,16 +47,61 @@ class ArsenalFormatter(logging.Formatter):
     BASE_FORMAT = "%(asctime)s - %(levelname)-8s - %(message)s"
     DATE_FORMAT = "%H:%M:%S"
 
+    def __init__(self):
+        super().__init__()
+        self._formatters: Dict[int, logging.Formatter] = {}
+
     def format(self, record):
-        # Pull colour & emoji for this level
-        color = self.COLORS.get(record.levelno, Fore.WHITE)
-        emoji = self.EMOJIS.get(record.levelno, "  ")
+        # One formatter per level, built the first time that level shows up
+        formatter = self._formatters.get(record.levelno)
+        if formatter is None:
+            color = self.COLORS.get(record.levelno, Fore.WHITE)
+            emoji = self.EMOJIS.get(record.levelno, "  ")
+            log_fmt = f"{color}{emoji} {self.BASE_FORMAT}{Style.RESET_ALL}"
+            formatter = self._formatters[record.levelno] = logging.Formatter(log_fmt, datefmt=self.DATE_FORMAT)
+        return formatter.format(record)
 
-        # Build final format string with colour codes
-        log_fmt = f"{color}{emoji} {self.BASE_FORMAT}{Style.RESET_ALL}"
 
-        formatter = logging.Formatter(log_fmt, datefmt=self.DATE_FORMAT)
-        return formatter.format(record)
+# The log file gets the receipts without the paint
+FILE_FORMAT = "%(asctime)s - %(levelname)-8s - %(message)s"
+
+# Callers only enqueue; one background thread does the formatting and the writes
+_queue: "queue.Queue[logging.LogRecord]" = queue.Queue()
+_listener: Optional[QueueListener] = None
+
+
+class _ConsoleHandler(logging.StreamHandler):
+    """
+    stdout, resolved on the first line rather than at import: colorama's init()
+    wraps sys.stdout, and importing core shouldn't touch the terminal at all.
+    """
+
+    def __init__(self):
+        super().__init__(sys.stdout)
+        self._painted = False
+
+    def emit(self, record):
+        if not self._painted:
+            # Initialise colorama once, globally – let autoreset handle the cleanup
+            init(autoreset=True)
+            self.setStream(sys.stdout)
+            self._painted = True
+        super().emit(record)
+
+
+def _start_listener(*handlers: logging.Handler) -> QueueListener:
+    global _listener
+    if _listener is None:
+        _listener = QueueListener(_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+    return _listener
+
+
+def flush_logs():
+    """Block until every queued line has been written (call before print()-ing next to log output)."""
+    if _listener is not None and _listener._thread is not None:
+        _queue.join()
 
 
 def get_logger(name: str = "Sanchez_Arsenal") -> logging.Logger:
@@ -68,10 +120,18 @@ def get_logger(name: str = "Sanchez_Arsenal") -> logging.Logger:
     logger.propagate = False
 
     # Console handler
-    ch = logging.StreamHandler(sys.stdout)
+    ch = _ConsoleHandler()
     ch.setFormatter(ArsenalFormatter())
+    handlers = [ch]
+
+    # File handler (opened on the first line, so a --help never leaves an empty log behind)
+    if config.LOG_FILE:
+        fh = logging.FileHandler(config.log_file_path, encoding="utf-8", delay=True)
+        fh.setFormatter(logging.Formatter(FILE_FORMAT))
+        handlers.append(fh)
 
-    logger.addHandler(ch)
+    _start_listener(*handlers)
+    logger.addHandler(QueueHandler(_queue))
     return logger
 
 
@@ -83,4 +143,86 @@ logger.warning = lambda msg, *args, **kwargs: logger.log(30, msg, *args, **kwarg
 logger.critical = lambda msg, *args, **kwargs: logger.log(50, msg, *args, **kwargs)  # type: ignore
 
 # Register SUCCESS level so it shows properly
-logging.addLevelName(25, "SUCCESS")
\ No newline at end of file
+logging.addLevelName(25, "SUCCESS")
+
+
+class StatusSummary:
+    """
+    Per-request status lines, folded. With LOG_SUMMARY_INTERVAL > 0 every response
+    only bumps a counter, and one line per interval reports what came back:
+        📊 5.0s: 1,234 responses (247/s) — 200×1,000 · 404×200 · 500×34
+    The first WAF block of each interval is still shouted immediately.
+    interval=0 restores one line per response.
+    """
+
+    def __init__(self, interval: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        self._interval = interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._counts: Counter = Counter()
+        self._waf = 0
+        self._since = clock()
+
+    @property
+    def interval(self) -> float:
+        """Read lazily: CLI flags land after import."""
+        return config.LOG_SUMMARY_INTERVAL if self._interval is None else self._interval
+
+    def record(self, method: str, url: str, status: int, waf: bool = False):
+        if self.interval <= 0:
+            self._line(method, url, status, waf)
+            return
+
+        with self._lock:
+            self._counts[status] += 1
+            if waf:
+                self._waf += 1
+            first_waf = waf and self._waf == 1
+            due = self._clock() - self._since >= self.interval
+            snapshot = self._take() if due else None
+        if first_waf:
+            logger.critical(f"🛑 WAF Blocked {url} (Status {status}) — further blocks go into the summary")
+        if snapshot:
+            self._emit(*snapshot)
+
+    def flush(self):
+        """Report whatever the current interval has counted (end of a run)."""
+        with self._lock:
+            snapshot = self._take()
+        if snapshot:
+            self._emit(*snapshot)
+
+    def _take(self):
+        now = self._clock()
+        counts, waf, elapsed = self._counts, self._waf, now - self._since
+        self._counts, self._waf, self._since = Counter(), 0, now
+        return (counts, waf, elapsed) if counts else None
+
+    @staticmethod
+    def _emit(counts: Counter, waf: int, elapsed: float):
+        total = sum(counts.values())
+        rate = f" ({total / elapsed:,.0f}/s)" if elapsed > 0 else ""
+        parts = " · ".join(f"{status}×{n:,}" for status, n in sorted(counts.items()))
+        line = f"📊 {elapsed:.1f}s: {total:,} responses{rate} — {parts}"
+        if waf:
+            line += f" · 🛑 {waf:,} WAF blocks"
+        # Server errors and throttling deserve the yellow card
+        if waf or any(s >= 500 or s == 429 for s in counts):
+            logger.warning(line)
+        else:
+            logger.info(line)
+
+    @staticmethod
+    def _line(method: str, url: str, status: int, waf: bool):
+        if waf:
+            logger.critical(f"🛑 WAF Blocked {url} (Status {status})")
+        if 200 <= status < 300:
+            logger.info(f"✅ [{method}] {status} → {url}")
+        elif status >= 500:
+            logger.warning(f"⚠️ Server Error {status} → {url}")
+        else:
+            logger.debug(f"🧱 Status {status} → {url}")
+
+
+# Shared by every requester in the process
+status_summary = StatusSummary()
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+# Module: Metrics
+# Author: Sanchez (The Analyst)
+# Purpose: Where did the time go? Every attempt the requesters make lands here —
+#          per host, per status, retries, timeouts, bytes, protocol and latency
+#          histograms — and Engine.run reads the match report at full time.
+
+import copy
+import json
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+from urllib.parse import urlsplit
+
+from core.logger import logger
+
+# Prometheus wants fixed, cumulative buckets; these are derived from the HDR counts on export
+PROM_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PHASES = ("total", "connect", "ttfb")
+_TOTALS = ("requests", "retries", "timeouts", "errors", "bytes_in", "bytes_out")
+_COUNTERS = ("statuses", "hosts", "host_statuses", "protocols")
+
+
+class LatencyHistogram:
+    """
+    HDR-style log-linear histogram over microseconds: values below 2**SUB_BITS are
+    exact, above that every power of two is split into 2**(SUB_BITS-1) buckets,
+    so any recorded value is within ~3% of the truth. Sparse, mergeable, O(1) record.
+    """
+    SUB_BITS = 6
+
+    def __init__(self):
+        self.buckets: Counter = Counter()
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    @classmethod
+    def _index(cls, micros: int) -> int:
+        shift = max(0, micros.bit_length() - cls.SUB_BITS)
+        return (shift << cls.SUB_BITS) | (micros >> shift)
+
+    @classmethod
+    def _value(cls, index: int) -> float:
+        """Seconds at the middle of a bucket."""
+        shift, top = index >> cls.SUB_BITS, index & ((1 << cls.SUB_BITS) - 1)
+        low = top << shift
+        return (low + ((1 << shift) - 1) / 2) / 1e6
+
+    def record(self, seconds: float):
+        self.buckets[self._index(max(0, int(seconds * 1e6)))] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def merge(self, other: "LatencyHistogram"):
+        self.buckets.update(other.buckets)
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def percentile(self, q: float) -> float:
+        """q in 0-100 → seconds (0.0 when empty)."""
+        if not self.count:
+            return 0.0
+        rank = max(1, round(self.count * q / 100))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(max(self._value(index), self.min), self.max)
+        return self.max
+
+    def cumulative(self, bounds: Iterable[float]) -> List[int]:
+        """Counts at or below each bound (Prometheus 'le' buckets)."""
+        ordered = sorted((self._value(i), n) for i, n in self.buckets.items())
+        out, seen, pos = [], 0, 0
+        for bound in bounds:
+            while pos < len(ordered) and ordered[pos][0] <= bound:
+                seen += ordered[pos][1]
+                pos += 1
+            out.append(seen)
+        return out
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.min if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+
+def _host(url: str) -> str:
+    try:
+        return urlsplit(url).netloc or "-"
+    except ValueError:
+        return "-"
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:.1f}ms" if seconds < 10 else f"{seconds:.1f}s"
+
+
+def _size(n: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024 or unit == "GB":
+            return f"{n:,.0f} {unit}" if unit == "B" else f"{n:,.1f} {unit}"
+        n /= 1024
+    return f"{n} B"
+
+
+class Metrics:
+    """
+    The registry. record() is called once per attempt by core.requester; the
+    rest reads. A single lock guards everything — an attempt costs a handful of
+    dict bumps, nothing next to the network round trip it describes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.retries = 0
+            self.timeouts = 0
+            self.errors = 0
+            self.bytes_in = 0
+            self.bytes_out = 0
+            self.statuses: Counter = Counter()
+            self.hosts: Counter = Counter()
+            self.host_statuses: Counter = Counter()     # (host, status or "error")
+            self.protocols: Counter = Counter()
+            self.latency: Dict[str, LatencyHistogram] = {phase: LatencyHistogram() for phase in PHASES}
+            self.host_latency: Dict[str, LatencyHistogram] = {}
+            self.connections: Dict[str, Dict[str, Any]] = {}   # Multiplexed connections: streams carried
+
+    def record(self, url: str, latency: float, status: Optional[int], attempt: int = 0,
+               error: Optional[BaseException] = None, sent: int = 0, received: int = 0,
+               protocol: Optional[str] = None, phases: Optional[Dict[str, float]] = None):
+        host = _host(url)
+        timed_out = error is not None and is_timeout(error)
+        with self._lock:
+            self.requests += 1
+            self.hosts[host] += 1
+            if attempt:
+                self.retries += 1
+            if status is None:
+                self.errors += 1
+                self.timeouts += timed_out
+                self.host_statuses[host, "error"] += 1
+            else:
+                self.statuses[status] += 1
+                self.host_statuses[host, status] += 1
+            self.bytes_out += sent
+            self.bytes_in += received
+            if protocol:
+                self.protocols[protocol] += 1
+
+            self.latency["total"].record(latency)
+            per_host = self.host_latency.get(host)
+            if per_host is None:
+                per_host = self.host_latency[host] = LatencyHistogram()
+            per_host.record(latency)
+            for phase, seconds in (phases or {}).items():
+                hist = self.latency.get(phase)
+                if hist is None:
+                    hist = self.latency[phase] = LatencyHistogram()
+                hist.record(seconds)
+
+    def record_connection(self, name: str, protocol: str, streams: int, peak: int):
+        """Running totals for one multiplexed connection (Requester.batch), overwritten as it carries more."""
+        with self._lock:
+            self.connections[name] = {"protocol": protocol, "streams": streams, "peak_concurrent": peak}
+
+    # ———— Shards (Engine.stream_sharded) ————
+    def snapshot(self) -> Dict[str, Any]:
+        """The raw registry, picklable: what a shard worker sends home for merge()."""
+        with self._lock:
+            return copy.deepcopy({name: getattr(self, name) for name in
+                                  _TOTALS + _COUNTERS + ("latency", "host_latency", "connections")})
+
+    def merge(self, snapshot: Dict[str, Any], label: str = ""):
+        """Add another process's snapshot(). Its connections are prefixed with `label` (ids restart per process)."""
+        with self._lock:
+            for name in _TOTALS:
+                setattr(self, name, getattr(self, name) + snapshot[name])
+            for name in _COUNTERS:
+                getattr(self, name).update(snapshot[name])
+            for phase, hist in snapshot["latency"].items():
+                self.latency.setdefault(phase, LatencyHistogram()).merge(hist)
+            for host, hist in snapshot["host_latency"].items():
+                self.host_latency.setdefault(host, LatencyHistogram()).merge(hist)
+            for name, conn in snapshot["connections"].items():
+                self.connections[f"{label} {name}" if label else name] = conn
+
+    # ———— Reports ————
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "retries": self.retries,
+                "timeouts": self.timeouts,
+                "errors": self.errors,
+                "bytes_in": self.bytes_in,
+                "bytes_out": self.bytes_out,
+                "statuses": {str(k): v for k, v in sorted(self.statuses.items())},
+                "protocols": dict(self.protocols),
+                "latency": {phase: h.summary() for phase, h in self.latency.items() if h.count},
+                "connections": {name: dict(c) for name, c in self.connections.items()},
+                "hosts": {
+                    host: {
+                        "requests": n,
+                        "statuses": {str(s): c for (h, s), c in self.host_statuses.items() if h == host},
+                        "latency": self.host_latency[host].summary(),
+                    }
+                    for host, n in self.hosts.most_common()
+                },
+            }
+
+    def to_prometheus(self, prefix: str = "arsenal") -> str:
+        """Prometheus text exposition format, for a textfile collector or a diff between runs."""
+        with self._lock:
+            lines = [
+                f"# HELP {prefix}_requests_total Attempts by host and status (status=\"error\" = no response).",
+                f"# TYPE {prefix}_requests_total counter",
+            ]
+            for (host, status), n in sorted(self.host_statuses.items(), key=lambda kv: (kv[0][0], str(kv[0][1]))):
+                lines.append(f'{prefix}_requests_total{{host="{host}",status="{status}"}} {n}')
+            for name, value, help_text in (
+                ("retries", self.retries, "Attempts that were retries."),
+                ("timeouts", self.timeouts, "Attempts that timed out."),
+                ("bytes_received", self.bytes_in, "Response body bytes read."),
+                ("bytes_sent", self.bytes_out, "Request bytes sent (line + headers + body)."),
+            ):
+                lines += [f"# HELP {prefix}_{name}_total {help_text}", f"# TYPE {prefix}_{name}_total counter",
+                          f"{prefix}_{name}_total {value}"]
+            if self.protocols:
+                lines += [f"# HELP {prefix}_protocol_total Responses by negotiated protocol.",
+                          f"# TYPE {prefix}_protocol_total counter"]
+                lines += [f'{prefix}_protocol_total{{protocol="{p}"}} {n}' for p, n in sorted(self.protocols.items())]
+            if self.connections:
+                lines += [f"# HELP {prefix}_connection_streams_total Streams carried per multiplexed connection.",
+                          f"# TYPE {prefix}_connection_streams_total counter"]
+                lines += [f'{prefix}_connection_streams_total{{connection="{name}",protocol="{c["protocol"]}"}} '
+                          f'{c["streams"]}' for name, c in sorted(self.connections.items())]
+
+            metric = f"{prefix}_request_duration_seconds"
+            lines += [f"# HELP {metric} Attempt latency by phase.", f"# TYPE {metric} histogram"]
+            for phase, hist in self.latency.items():
+                if not hist.count:
+                    continue
+                for bound, n in zip(PROM_BUCKETS, hist.cumulative(PROM_BUCKETS)):
+                    lines.append(f'{metric}_bucket{{phase="{phase}",le="{bound}"}} {n}')
+                lines += [f'{metric}_bucket{{phase="{phase}",le="+Inf"}} {hist.count}',
+                          f'{metric}_sum{{phase="{phase}"}} {hist.total:.6f}',
+                          f'{metric}_count{{phase="{phase}"}} {hist.count}']
+            return "\n".join(lines) + "\n"
+
+    def export(self, path: Union[str, Path]) -> Path:
+        """*.prom / *.txt → Prometheus text, anything else → JSON."""
+        path = Path(path).expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix in (".prom", ".txt"):
+            path.write_text(self.to_prometheus(), encoding="utf-8")
+        else:
+            path.write_text(json.dumps(self.to_dict(), indent=2), encoding="utf-8")
+        return path
+
+    def table(self, max_hosts: int = 10) -> List[str]:
+        """The full-time report, one line per list item."""
+        data = self.to_dict()
+        if not data["requests"]:
+            return []
+        protocols = " · ".join(f"{p}×{n:,}" for p, n in data["protocols"].items()) or "protocol n/a"
+        lines = [
+            f"📈 {data['requests']:,} attempts · {data['retries']:,} retries · {data['timeouts']:,} timeouts · "
+            f"{data['errors']:,} errors · {_size(data['bytes_in'])} in / {_size(data['bytes_out'])} out · {protocols}",
+            f"   {'phase':<8} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}",
+        ]
+        for phase, s in data["latency"].items():
+            lines.append(f"   {phase:<8} {_ms(s['p50']):>9} {_ms(s['p90']):>9} {_ms(s['p99']):>9} {_ms(s['max']):>9}")
+        if data["connections"]:
+            conns = data["connections"].values()
+            lines.append(f"   🔀 {sum(c['streams'] for c in conns):,} streams over {len(conns)} multiplexed "
+                         f"connection(s), peak {max(c['peak_concurrent'] for c in conns)} in flight on one")
+
+        lines.append(f"   {'host':<32} {'reqs':>7} {'2xx':>6} {'3xx':>6} {'4xx':>6} {'5xx':>6} {'err':>6} {'p50':>9} {'p99':>9}")
+        for host, h in list(data["hosts"].items())[:max_hosts]:
+            classes = Counter()
+            for status, n in h["statuses"].items():
+                classes["err" if status == "error" else f"{status[0]}xx"] += n
+            lat = h["latency"]
+            lines.append(f"   {host[:32]:<32} {h['requests']:>7,} "
+                         + " ".join(f"{classes[c]:>6,}" for c in ("2xx", "3xx", "4xx", "5xx", "err"))
+                         + f" {_ms(lat['p50']):>9} {_ms(lat['p99']):>9}")
+        if len(data["hosts"]) > max_hosts:
+            lines.append(f"   ... and {len(data['hosts']) - max_hosts} more hosts")
+        return lines
+
+    def log_summary(self, export_to: Optional[str] = None):
+        for line in self.table():
+            logger.info(line)
+        if export_to:
+            logger.success(f"📊 Metrics written to {self.export(export_to)}")
+
+
+def is_timeout(error: BaseException) -> bool:
+    """Every client spells it differently (TimeoutError, ReadTimeoutError, 'Client.Timeout exceeded', ...)."""
+    if isinstance(error, TimeoutError):
+        return True
+    text = f"{type(error).__name__} {error}".lower()
+    return "timeout" in text or "timed out" in text or "deadline exceeded" in text
+
+
+def request_size(method: str, url: str, headers: Optional[Dict[str, str]], body: object = None) -> int:
+    """Bytes on the wire for an HTTP/1.1 request, near enough (HTTP/2 compresses the headers)."""
+    size = len(method) + len(url) + 12
+    if headers:
+        size += sum(len(k) + len(str(v)) + 4 for k, v in headers.items())
+    if isinstance(body, (str, bytes)):
+        size += len(body)
+    elif isinstance(body, dict):
+        size += sum(len(str(k)) + len(str(v)) + 2 for k, v in body.items())
+    return size
+
+
+# Process-wide registry: every requester reports here
+metrics = Metrics()
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+# Module: Multiplex
+# Author: Sanchez (The One-Two)
+# Purpose: Many requests, one connection — HTTP/2 streams over a single TCP/TLS
+#          handshake, never more in the air than the server's
+#          MAX_CONCURRENT_STREAMS allows. Behind Requester.batch().
+
+import json
+import socket
+import ssl
+import time
+import zlib
+from collections import deque
+from itertools import count
+from typing import Any, Deque, Dict, Iterator, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+try:
+    import h2.config
+    import h2.connection
+    import h2.events
+    import h2.exceptions
+    import h2.settings
+    HAS_H2 = True
+except ImportError:   # pip install h2 (comes with httpx[http2])
+    HAS_H2 = False
+
+DEFAULT_MAX_STREAMS = 100     # Our own ceiling, for servers that don't announce one (RFC 9113 says "unlimited")
+WINDOW = 1 << 24              # Receive window we grant: 16 MB per stream and per connection
+READ_SIZE = 1 << 16
+
+# Hop-by-hop headers HTTP/2 forbids (RFC 9113 §8.2.2) — the browser disguise carries some of them
+_HOP_BY_HOP = {"connection", "keep-alive", "proxy-connection", "transfer-encoding", "upgrade", "host"}
+_serial = count(1)
+
+
+class NotHTTP2(Exception):
+    """The server answered the handshake in something other than h2."""
+
+
+class BatchRequest(NamedTuple):
+    method: str
+    url: str
+    headers: Optional[Dict[str, str]] = None
+    body: Optional[bytes] = None
+
+
+def as_batch_request(item: Any) -> BatchRequest:
+    """URL / (method, url) / (method, url, kwargs) → BatchRequest, body encoded like Requester.stream() does."""
+    if isinstance(item, BatchRequest):
+        return item
+    if isinstance(item, str):
+        return BatchRequest("GET", item)
+    method, url, kwargs = (tuple(item) + ({},))[:3]
+    headers = dict(kwargs.get("headers") or {})
+    body = kwargs.get("data")
+    if kwargs.get("json") is not None:
+        body = json.dumps(kwargs["json"])
+        headers.setdefault("Content-Type", "application/json")
+    elif isinstance(body, dict):
+        body = urlencode(body)
+        headers.setdefault("Content-Type", "application/x-www-form-urlencoded")
+    if isinstance(body, str):
+        body = body.encode()
+    return BatchRequest(method.upper(), url, headers or None, body)
+
+
+def origin_of(url: str) -> Tuple[str, str, int]:
+    """(scheme, host, port): the unit a connection is shared by."""
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    return scheme, (parts.hostname or "").lower(), parts.port or (443 if scheme == "https" else 80)
+
+
+def decode_body(body: bytes, encoding: Optional[str]) -> bytes:
+    if encoding == "gzip":
+        return zlib.decompress(body, 16 + zlib.MAX_WBITS)
+    if encoding == "deflate":
+        try:
+            return zlib.decompress(body)
+        except zlib.error:
+            return zlib.decompress(body, -zlib.MAX_WBITS)    # Raw deflate, as some servers send it
+    return body
+
+
+class _Stream:
+    """One request in the air."""
+    __slots__ = ("index", "request", "started", "ttfb", "status", "headers", "body", "pending")
+
+    def __init__(self, index: int, request: BatchRequest, started: float):
+        self.index = index
+        self.request = request
+        self.started = started
+        self.ttfb: Optional[float] = None
+        self.status = 0
+        self.headers: Dict[str, str] = {}
+        self.body = bytearray()
+        self.pending = memoryview(request.body or b"")   # Request body still held back by flow control
+
+
+class H2Session:
+    """
+    One HTTP/2 connection to one origin. run() takes (index, BatchRequest) pairs
+    and yields (index, response or exception) as streams finish — in completion
+    order, not submission order. Opening a stream waits for a free slot under
+    min(server MAX_CONCURRENT_STREAMS, max_streams); request bodies respect both
+    flow-control windows.
+
+    https:// negotiates h2 through ALPN (NotHTTP2 if the server says http/1.1);
+    http:// speaks h2c with prior knowledge. Plain TLS: no chrome_120 fingerprint.
+    Not thread-safe — one run() at a time (Requester holds a lock per session).
+    """
+
+    def __init__(self, url: str, timeout: float = 10.0, verify: bool = True,
+                 max_streams: int = DEFAULT_MAX_STREAMS):
+        if not HAS_H2:
+            raise ImportError("HTTP/2 batches need h2 → pip install h2")
+        self.scheme, self.host, self.port = origin_of(url)
+        self.origin = f"{self.scheme}://{self.host}:{self.port}"
+        self.timeout = timeout
+        self.verify = verify
+        self.max_streams = max_streams
+        self.sock: Optional[socket.socket] = None
+        self.conn: Any = None
+        self.alive = False
+        self.goaway = False           # Server said "no new streams": finish what's open, then hang up
+        # Requests the server never started (GOAWAY, or we died first): the caller re-queues them
+        self.leftover: List[Tuple[int, BatchRequest]] = []
+        self._refused: List[Tuple[int, BatchRequest]] = []
+        self._held: Dict[int, _Stream] = {}      # Streams waiting on their last frame (hold/release)
+
+        # 📊 What this connection carried
+        self.id = next(_serial)
+        self.streams = 0
+        self.peak_concurrent = 0
+        self.server_max_streams: Optional[int] = None
+        self.connect_time = 0.0
+
+    # ———— The handshake ————
+    def connect(self) -> "H2Session":
+        started = time.perf_counter()
+        raw = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        raw.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if self.scheme == "https":
+            ctx = ssl.create_default_context()
+            if not self.verify:
+                ctx.check_hostname = False
+                ctx.verify_mode = ssl.CERT_NONE
+            ctx.set_alpn_protocols(["h2", "http/1.1"])
+            try:
+                raw = ctx.wrap_socket(raw, server_hostname=self.host)
+            except Exception:
+                raw.close()
+                raise
+            if raw.selected_alpn_protocol() != "h2":
+                raw.close()
+                raise NotHTTP2(f"{self.origin} negotiated {raw.selected_alpn_protocol() or 'http/1.1'}")
+        self.sock = raw
+
+        self.conn = h2.connection.H2Connection(config=h2.config.H2Configuration(
+            client_side=True, header_encoding="utf-8"))
+        self.conn.local_settings = h2.settings.Settings(client=True, initial_values={
+            h2.settings.SettingCodes.ENABLE_PUSH: 0,
+            h2.settings.SettingCodes.INITIAL_WINDOW_SIZE: WINDOW,
+            h2.settings.SettingCodes.MAX_CONCURRENT_STREAMS: 0,   # We push nothing to them either
+        })
+        self.conn.initiate_connection()
+        self.conn.increment_flow_control_window(WINDOW - 65535)
+        self._flush()
+
+        # The server's SETTINGS come first: no stream opens before we know its limit
+        try:
+            while self.server_max_streams is None:
+                self._receive()
+        except h2.exceptions.ProtocolError as e:
+            self.close()
+            raise NotHTTP2(f"{self.origin} doesn't speak h2 ({e})") from e
+        self.alive = True
+        self.connect_time = time.perf_counter() - started
+        return self
+
+    @property
+    def limit(self) -> int:
+        server = self.server_max_streams if self.server_max_streams is not None else DEFAULT_MAX_STREAMS
+        return max(1, min(server, self.max_streams))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "origin": self.origin,
+            "streams": self.streams,
+            "peak_concurrent": self.peak_concurrent,
+            "max_concurrent_streams": self.server_max_streams,
+            "alive": self.alive,
+        }
+
+    def close(self):
+        self.alive = False
+        if self.sock is not None:
+            try:
+                if self.conn is not None:
+                    self.conn.close_connection()
+                    self.sock.sendall(self.conn.data_to_send())
+            except Exception:
+                pass
+            self.sock.close()
+            self.sock = None
+
+    # ———— The match ————
+    def run(self, items: List[Tuple[int, BatchRequest]], before_send: Any = None) -> Iterator[Tuple[int, Any]]:
+        """
+        before_send(url) is called as each stream is about to open (the rate limiter
+        slots in here). Whatever hasn't started when the connection goes away ends
+        up in .leftover instead of being yielded.
+        """
+        queue: Deque[Tuple[int, BatchRequest]] = deque(items)
+        active: Dict[int, _Stream] = {}
+        finished: List[Tuple[int, Any]] = []
+        self.leftover, self._refused = [], []
+
+        try:
+            while self.alive and ((queue and not self.goaway) or active):
+                # Fill every free slot, then go back to reading
+                while queue and len(active) < self.limit and not self.goaway:
+                    index, request = queue.popleft()
+                    if before_send is not None:
+                        before_send(request.url)
+                    self._open(index, request, active)
+                self._flush()
+
+                self._receive(active, finished)
+                yield from finished
+                finished.clear()
+        except Exception as e:
+            self.close()
+            for stream in active.values():
+                yield stream.index, e
+            active.clear()
+        finally:
+            # Refused by GOAWAY or never sent: not an error, just not this connection's to answer
+            self.leftover = self._refused + [(s.index, s.request) for s in active.values()] + list(queue)
+            if self.goaway:
+                self.close()
+
+    def _headers(self, request: BatchRequest) -> List[Tuple[str, str]]:
+        parts = urlsplit(request.url)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        authority = parts.netloc.rsplit("@", 1)[-1]
+        headers = [(":method", request.method.upper()), (":authority", authority),
+                   (":scheme", self.scheme), (":path", path)]
+        headers += [(k.lower(), str(v)) for k, v in (request.headers or {}).items()
+                    if k.lower() not in _HOP_BY_HOP]
+        return headers
+
+    def _open(self, index: int, request: BatchRequest, active: Dict[int, _Stream]):
+        stream_id = self.conn.get_next_available_stream_id()
+        stream = active[stream_id] = _Stream(index, request, time.perf_counter())
+        self.conn.send_headers(stream_id, self._headers(request), end_stream=not stream.pending)
+        self.streams += 1
+        self.peak_concurrent = max(self.peak_concurrent, len(active))
+        if stream.pending:
+            self._send_body(stream_id, stream)
+
+    def _send_body(self, stream_id: int, stream: _Stream):
+        """As much of the body as both windows allow; the rest goes out on WindowUpdated."""
+        while stream.pending:
+            room = min(self.conn.local_flow_control_window(stream_id), self.conn.max_outbound_frame_size)
+            if room <= 0:
+                return
+            chunk, stream.pending = stream.pending[:room], stream.pending[room:]
+            self.conn.send_data(stream_id, chunk.tobytes(), end_stream=not stream.pending)
+
+    # ———— The held shot (single-packet races, core.race) ————
+    def hold(self, index: int, request: BatchRequest):
+        """
+        Send all of a request but its last frame: the headers, and the body minus its
+        final byte (body-less requests keep an empty END_STREAM DATA frame back).
+        The server has the request in hand but can't act on it until release().
+        """
+        if len(self._held) >= self.limit:
+            raise ValueError(f"{self.origin} allows {self.limit} concurrent streams, can't hold more")
+        body = request.body or b""
+        room = min(self.conn.remote_settings.initial_window_size, self.conn.outbound_flow_control_window,
+                   self.conn.max_outbound_frame_size)
+        if len(body) - 1 > room:
+            raise ValueError(f"A {len(body):,}-byte body doesn't fit in one window: it can't be held back")
+        stream_id = self.conn.get_next_available_stream_id()
+        stream = self._held[stream_id] = _Stream(index, request, 0.0)
+        self.conn.send_headers(stream_id, self._headers(request), end_stream=False)
+        if len(body) > 1:
+            self.conn.send_data(stream_id, body[:-1])
+        stream.pending = memoryview(body[-1:])
+        self.streams += 1
+        self.peak_concurrent = max(self.peak_concurrent, len(self._held))
+        self._flush()
+
+    def release(self) -> Tuple[float, int]:
+        """
+        Every held tail in ONE write — one TCP segment when they fit the MSS, so the
+        server's kernel hands them over together. Returns (perf_counter just before
+        the write, bytes written).
+        """
+        for stream_id, stream in self._held.items():
+            self.conn.send_data(stream_id, stream.pending.tobytes(), end_stream=True)
+            stream.pending = memoryview(b"")
+        data = self.conn.data_to_send()
+        now = time.perf_counter()
+        for stream in self._held.values():
+            stream.started = now
+        self.sock.sendall(data)
+        return now, len(data)
+
+    def collect(self) -> Iterator[Tuple[int, Any]]:
+        """(index, response or exception) for every released stream, as they finish."""
+        active, self._held = self._held, {}
+        finished: List[Tuple[int, Any]] = []
+        self._refused = []
+        try:
+            while active:
+                self._receive(active, finished)
+                yield from finished
+                finished.clear()
+        except Exception as e:
+            self.close()
+            for stream in active.values():
+                yield stream.index, e
+        for index, _ in self._refused:
+            yield index, ConnectionError("refused by GOAWAY before it ran")
+
+    def _flush(self):
+        data = self.conn.data_to_send()
+        if data:
+            self.sock.sendall(data)
+
+    def _receive(self, active: Optional[Dict[int, _Stream]] = None,
+                 finished: Optional[List[Tuple[int, Any]]] = None):
+        data = self.sock.recv(READ_SIZE)
+        if not data:
+            raise ConnectionError(f"{self.origin} closed the connection")
+        now = time.perf_counter()
+        for event in self.conn.receive_data(data):
+            if isinstance(event, h2.events.RemoteSettingsChanged):
+                self.server_max_streams = self.conn.remote_settings.max_concurrent_streams
+                if self.server_max_streams > 1 << 31:
+                    self.server_max_streams = DEFAULT_MAX_STREAMS   # Not announced = "unlimited"
+                continue
+            if isinstance(event, h2.events.ConnectionTerminated):
+                # GOAWAY: streams above last_stream_id were never processed → retried elsewhere;
+                # the ones below still get their answers on this connection
+                self.goaway = True
+                last = event.last_stream_id if event.last_stream_id is not None else 0
+                for stream_id in [s for s in (active or {}) if s > last]:
+                    stream = active.pop(stream_id)
+                    self._refused.append((stream.index, stream.request))
+                continue
+            if isinstance(event, h2.events.DataReceived):
+                # Acknowledged even for a stream we gave up on, or the connection window leaks away
+                self.conn.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+            stream = (active or {}).get(getattr(event, "stream_id", None))
+            if stream is None:
+                continue
+            if isinstance(event, h2.events.ResponseReceived):
+                stream.ttfb = now - stream.started
+                stream.headers = dict(event.headers)
+                stream.status = int(stream.headers.get(":status", 0))
+            elif isinstance(event, h2.events.DataReceived):
+                stream.body += event.data
+            elif isinstance(event, h2.events.WindowUpdated):
+                self._send_body(event.stream_id, stream)
+            elif isinstance(event, h2.events.StreamEnded):
+                finished.append((active.pop(event.stream_id).index, self._response(stream, now)))
+            elif isinstance(event, h2.events.StreamReset):
+                finished.append((active.pop(event.stream_id).index,
+                                 ConnectionError(f"stream reset by server (error {event.error_code})")))
+        if isinstance(active, dict):
+            # Connection-level WINDOW_UPDATE carries stream_id 0: every held-back body gets a go
+            for stream_id, stream in list(active.items()):
+                if stream.pending:
+                    self._send_body(stream_id, stream)
+        self._flush()
+
+    def _response(self, stream: _Stream, now: float) -> Any:
+        from core.requester import AsyncResponse   # Same duck type every other path returns
+
+        headers = {k: v for k, v in stream.headers.items() if not k.startswith(":")}
+        content = decode_body(bytes(stream.body), headers.get("content-encoding"))
+        charset = None
+        if "charset=" in headers.get("content-type", ""):
+            charset = headers["content-type"].split("charset=", 1)[1].split(";")[0].strip() or None
+        timings = {"ttfb": stream.ttfb if stream.ttfb is not None else now - stream.started,
+                   "total": now - stream.started}
+        return AsyncResponse(stream.status, headers, content, stream.request.url, charset, "HTTP/2", timings)
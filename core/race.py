@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+# Module: Race
+# Author: Sanchez (The Photo Finish)
+# Purpose: Race-condition shots that land together. Every connection is opened
+#          and every request sent BUT its last byte (HTTP/1.1) or last frame
+#          (HTTP/2) before anything is released; then the tails go out back to
+#          back — or, over h2, in one single packet. Each request's send offset
+#          is recorded, so the report says how tight the window really was.
+
+import http.client
+import selectors
+import socket
+import ssl
+import statistics
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlsplit
+
+from core.config import config
+from core.logger import logger
+from core.multiplex import HAS_H2, BatchRequest, H2Session, NotHTTP2, as_batch_request, decode_body, origin_of
+from core.ratelimit import get_limiter
+from core.requester import BROWSER_HEADERS, AsyncResponse, _log_status, _report, http2_enabled
+
+MODES = ("auto", "single-packet", "last-byte")
+SETTLE = 0.1     # Seconds between arming and release: the held prefixes reach the server and get parsed
+
+
+class RaceShot(NamedTuple):
+    index: int
+    offset: float                 # Seconds after the first tail went out that this one did
+    ttfb: Optional[float]         # Tail sent → first response byte
+    status: Optional[int]
+    response: Any                 # AsyncResponse-like, None on failure
+    error: Optional[str] = None
+
+
+class RaceResult:
+    """One round: the shots in request order, how many counted as a success, and the window they went out in."""
+
+    def __init__(self, mode: str, shots: List[RaceShot], success: Callable[[Any], bool], packet_bytes: int = 0):
+        self.mode = mode
+        self.shots = sorted(shots, key=lambda s: s.index)
+        self.wins = [s for s in self.shots if s.response is not None and success(s.response)]
+        self.statuses = Counter(s.status if s.status is not None else "error" for s in self.shots)
+        self.packet_bytes = packet_bytes
+
+    @property
+    def successes(self) -> int:
+        return len(self.wins)
+
+    @property
+    def spread(self) -> float:
+        """First tail to last tail, in seconds (0.0 for a single packet)."""
+        offsets = [s.offset for s in self.shots]
+        return max(offsets) - min(offsets) if offsets else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        offsets = [s.offset for s in self.shots]
+        ttfbs = [s.ttfb for s in self.shots if s.ttfb is not None]
+        return {
+            "mode": self.mode,
+            "requests": len(self.shots),
+            "successes": self.successes,
+            "statuses": {str(k): v for k, v in self.statuses.items()},
+            "spread_ms": self.spread * 1000,
+            "offset_p50_ms": statistics.median(offsets) * 1000 if offsets else 0.0,
+            "packet_bytes": self.packet_bytes,
+            "ttfb_ms": {
+                "min": min(ttfbs) * 1000, "p50": statistics.median(ttfbs) * 1000, "max": max(ttfbs) * 1000,
+            } if ttfbs else {},
+        }
+
+    def lines(self) -> List[str]:
+        st = self.stats()
+        statuses = " · ".join(f"{k}×{v}" for k, v in sorted(st["statuses"].items())) or "no answers"
+        window = (f"one {st['packet_bytes']:,}-byte write" if self.mode == "single-packet"
+                  else f"spread {st['spread_ms']:.3f} ms (p50 offset {st['offset_p50_ms']:.3f} ms)")
+        lines = [f"🏁 {self.mode}: {st['successes']}/{st['requests']} succeeded · {statuses}",
+                 f"   release window: {window}"]
+        if st["ttfb_ms"]:
+            t = st["ttfb_ms"]
+            lines.append(f"   tail → first byte: min {t['min']:.1f} · p50 {t['p50']:.1f} · max {t['max']:.1f} ms")
+        return lines
+
+    def log(self):
+        for line in self.lines():
+            logger.info(line)
+
+
+def _status_is_2xx(response: Any) -> bool:
+    return 200 <= response.status_code < 300
+
+
+def _wire(request: BatchRequest) -> bytes:
+    """The HTTP/1.1 bytes of one request (the keep-alive disguise minus what we set ourselves)."""
+    parts = urlsplit(request.url)
+    target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+    body = request.body or b""
+    lines = [f"{request.method} {target} HTTP/1.1", f"Host: {parts.netloc.rsplit('@', 1)[-1]}"]
+    lines += [f"{k}: {v}" for k, v in (request.headers or {}).items()
+              if k.lower() not in ("host", "content-length", "connection")]
+    if body or request.method in ("POST", "PUT", "PATCH"):
+        lines.append(f"Content-Length: {len(body)}")
+    lines.append("Connection: close")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+
+class RaceWindow:
+    """
+    The starting gate:
+        race = RaceWindow([("POST", url, {"json": order})] * 20)
+        result = race.fire()            # arm → settle → release → collect
+        result.log()
+    Items are whatever Requester.batch() takes. mode:
+    - "single-packet": one HTTP/2 connection, every stream held one frame short,
+      all tails in one write. Up to the server's MAX_CONCURRENT_STREAMS requests.
+    - "last-byte": one HTTP/1.1 connection per request, each held one byte
+      short, tails sent back to back. Works everywhere.
+    - "auto": single-packet when h2 is on (see requester.http2_enabled) and the
+      server negotiates it, last-byte otherwise.
+    Plain sockets (ssl, h2): no chrome_120 fingerprint, like Requester.stream().
+    """
+
+    def __init__(self, requests: Iterable[Any], mode: str = "auto", timeout: Optional[float] = None,
+                 settle: float = SETTLE, headers: Optional[Dict[str, str]] = None):
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {', '.join(MODES)}")
+        base = dict(BROWSER_HEADERS)
+        base["Accept-Encoding"] = "gzip, deflate"
+        base.update(config.CUSTOM_HEADERS or {})
+        base.update(headers or {})
+        self.requests = [r._replace(headers={**base, **(r.headers or {})})
+                         for r in map(as_batch_request, requests)]
+        if not self.requests:
+            raise ValueError("Nothing to race")
+        if len({origin_of(r.url) for r in self.requests}) > 1:
+            raise ValueError("Every request in a race must go to the same origin")
+        self.mode = mode
+        self.timeout = timeout or config.TIMEOUT
+        self.settle = settle
+        self._h2: Optional[H2Session] = None
+        self._sockets: List[Tuple[int, Any, bytes]] = []    # (index, socket, withheld tail)
+        self._packet_bytes = 0
+
+    # ———— 1. Arm: connections open, everything but the tails sent ————
+    def arm(self) -> "RaceWindow":
+        try:
+            self._arm()
+        except BaseException:
+            self.close()                    # Whatever got connected before it failed hangs up too
+            raise
+        time.sleep(self.settle)
+        return self
+
+    def _arm(self):
+        url = self.requests[0].url
+        scheme = origin_of(url)[0]
+        want_h2 = self.mode == "single-packet" or (
+            self.mode == "auto" and HAS_H2 and http2_enabled() and (scheme == "https" or config.FORCE_HTTP2))
+        if want_h2:
+            try:
+                self._h2 = H2Session(url, timeout=self.timeout, verify=config.VERIFY_SSL,
+                                     max_streams=len(self.requests)).connect()
+            except NotHTTP2 as e:
+                if self.mode == "single-packet":
+                    raise
+                logger.debug(f"🏁 {e}: last-byte sync instead")
+        if self._h2 is not None:
+            self.mode = "single-packet"
+            if len(self.requests) > self._h2.limit:
+                raise ValueError(f"Server allows {self._h2.limit} concurrent streams, "
+                                 f"not {len(self.requests)}: race in smaller batches")
+            for index, request in enumerate(self.requests):
+                self._h2.hold(index, request)
+        else:
+            self.mode = "last-byte"
+            for index, request in enumerate(self.requests):
+                wire = _wire(request)
+                sock = self._connect(request.url)
+                self._sockets.append((index, sock, wire[-1:]))
+                sock.sendall(wire[:-1])
+
+    def _connect(self, url: str) -> Any:
+        scheme, host, port = origin_of(url)
+        sock = socket.create_connection((host, port), timeout=self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if scheme == "https":
+            ctx = ssl.create_default_context()
+            if not config.VERIFY_SSL:
+                ctx.check_hostname = False
+                ctx.verify_mode = ssl.CERT_NONE
+            ctx.set_alpn_protocols(["http/1.1"])
+            try:
+                sock = ctx.wrap_socket(sock, server_hostname=host)
+            except BaseException:
+                sock.close()
+                raise
+        return sock
+
+    # ———— 2 + 3. Release and collect ————
+    def fire(self, success: Callable[[Any], bool] = _status_is_2xx) -> RaceResult:
+        """Arm (unless already armed), release every tail, read every answer."""
+        if self._h2 is None and not self._sockets:
+            self.arm()
+        get_limiter().wait(self.requests[0].url)   # One slot for the whole volley
+        shots = self._fire_h2() if self._h2 is not None else self._fire_last_byte()
+        result = RaceResult(self.mode, shots, success, packet_bytes=self._packet_bytes)
+        for shot in result.shots:
+            request = self.requests[shot.index]
+            protocol = "h2" if self.mode == "single-packet" else "h1"
+            _report(shot.ttfb or 0.0, shot.status, request.url, protocol=protocol,
+                    received=len(shot.response.content) if shot.response is not None else 0,
+                    phases={"ttfb": shot.ttfb} if shot.ttfb is not None else None)
+            if shot.response is not None:
+                _log_status(request.method, request.url, shot.response)
+        return result
+
+    def _fire_h2(self) -> List[RaceShot]:
+        session, self._h2 = self._h2, None
+        shots = []
+        try:
+            _, self._packet_bytes = session.release()
+            for index, result in session.collect():
+                if isinstance(result, Exception):
+                    shots.append(RaceShot(index, 0.0, None, None, None, str(result)))
+                else:
+                    shots.append(RaceShot(index, 0.0, result.timings["ttfb"], result.status_code, result))
+        finally:
+            session.close()
+        return shots
+
+    def _fire_last_byte(self) -> List[RaceShot]:
+        held, self._sockets = self._sockets, []
+        try:
+            return self._release_and_read(held)
+        finally:
+            for _, sock, _ in held:           # Every one, even when a tail never made it out
+                sock.close()
+
+    def _release_and_read(self, held: List[Tuple[int, Any, bytes]]) -> List[RaceShot]:
+        sent: Dict[int, float] = {}
+        started = time.perf_counter()
+        for index, sock, tail in held:        # Nothing else in this loop: the tails go out back to back
+            sock.send(tail)
+            sent[index] = time.perf_counter()
+
+        # First byte of each answer, whichever comes first
+        first: Dict[int, float] = {}
+        with selectors.DefaultSelector() as selector:
+            for index, sock, _ in held:
+                selector.register(sock, selectors.EVENT_READ, index)
+            deadline = started + self.timeout
+            while len(first) < len(held) and time.perf_counter() < deadline:
+                for key, _ in selector.select(timeout=max(0.0, deadline - time.perf_counter())):
+                    first[key.data] = time.perf_counter()
+                    selector.unregister(key.fileobj)
+
+        shots = []
+        gun = min(sent.values())      # Offsets count from the first tail out
+        for index, sock, _ in held:
+            offset = sent[index] - gun
+            try:
+                if index not in first:
+                    raise TimeoutError(f"no answer within {self.timeout}s")
+                shots.append(self._read_h1(index, sock, offset, first[index] - sent[index]))
+            except Exception as e:
+                shots.append(RaceShot(index, offset, None, None, None, str(e)))
+        return shots
+
+    def _read_h1(self, index: int, sock: Any, offset: float, ttfb: float) -> RaceShot:
+        raw = http.client.HTTPResponse(sock)
+        raw.begin()
+        body = raw.read()
+        headers = {k.lower(): v for k, v in raw.getheaders()}
+        content = decode_body(body, headers.get("content-encoding"))
+        charset = raw.headers.get_content_charset()
+        response = AsyncResponse(raw.status, headers, content, self.requests[index].url, charset,
+                                 "HTTP/1.1", {"ttfb": ttfb})
+        return RaceShot(index, offset, ttfb, raw.status, response)
+
+    def close(self):
+        """Hang up without releasing (an armed race you changed your mind about)."""
+        if self._h2 is not None:
+            self._h2.close()
+            self._h2 = None
+        for _, sock, _ in self._sockets:
+            sock.close()
+        self._sockets = []
+
+
+def race(requests: Iterable[Any], mode: str = "auto", success: Callable[[Any], bool] = _status_is_2xx,
+         **kwargs: Any) -> RaceResult:
+    """One volley: RaceWindow(requests, mode, **kwargs).fire(success)."""
+    return RaceWindow(requests, mode=mode, **kwargs).fire(success)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# Module: Rate Limiter
+# Author: Sanchez (The Referee)
+# Purpose: Exact requests-per-second, global and per host. Replaces the old
+#          per-worker time.sleep(DELAY), where the real rate was THREADS × DELAY × luck.
+
+import asyncio
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from core.config import config
+
+
+class TokenBucket:
+    """
+    Token bucket in its GCRA form: instead of counting tokens we track the
+    'theoretical arrival time' of the next request. Every caller books its
+    slot under the lock and then sleeps OUTSIDE it, so no worker ever waits
+    on another worker's sleep — only on the clock.
+    - rate: tokens (requests) per second
+    - burst: how many requests may go back-to-back after an idle spell
+    """
+
+    def __init__(self, rate: float, burst: int = 1, clock: Callable[[], float] = time.monotonic):
+        if rate <= 0:
+            raise ValueError("TokenBucket rate must be positive")
+        self.rate = rate
+        self.burst = max(1, int(burst))
+        self.interval = 1.0 / rate
+        self._tolerance = (self.burst - 1) * self.interval
+        self._clock = clock
+        self._tat = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Book one slot. Returns how long the caller must wait before sending."""
+        with self._lock:
+            now = self._clock()
+            tat = max(self._tat, now)
+            wait = max(0.0, tat - now - self._tolerance)
+            self._tat = tat + self.interval
+            return wait
+
+    def acquire(self):
+        """Blocking (threads)."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Non-blocking (event loop)."""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+def effective_rps(cfg=config) -> float:
+    """
+    The global rate the config asks for (0.0 = unlimited).
+    RPS wins. Otherwise DELAY keeps its old meaning — each of THREADS workers
+    pauses DELAY between shots — but enforced exactly: THREADS / DELAY req/s.
+    """
+    if cfg.RPS > 0:
+        return cfg.RPS
+    if cfg.DELAY > 0:
+        return cfg.THREADS / cfg.DELAY
+    return 0.0
+
+
+class RateLimiter:
+    """
+    The Referee: one global bucket plus one bucket per host.
+    A request goes when BOTH buckets allow it.
+    """
+
+    def __init__(self, rps: float = 0.0, burst: int = 1,
+                 host_rps: float = 0.0, host_burst: int = 1):
+        self.rps = rps
+        self.host_rps = host_rps
+        self.host_burst = host_burst
+        self._global: Optional[TokenBucket] = TokenBucket(rps, burst) if rps > 0 else None
+        self._hosts: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, cfg=config) -> "RateLimiter":
+        return cls(effective_rps(cfg), cfg.BURST, cfg.HOST_RPS, cfg.HOST_BURST)
+
+    @property
+    def active(self) -> bool:
+        return self._global is not None or self.host_rps > 0
+
+    def _host_bucket(self, url: str) -> Optional[TokenBucket]:
+        if self.host_rps <= 0:
+            return None
+        host = urlsplit(url).netloc
+        bucket = self._hosts.get(host)
+        if bucket is None:
+            with self._lock:
+                bucket = self._hosts.setdefault(host, TokenBucket(self.host_rps, self.host_burst))
+        return bucket
+
+    def reserve(self, url: str) -> float:
+        wait = self._global.reserve() if self._global else 0.0
+        host_bucket = self._host_bucket(url)
+        if host_bucket:
+            wait = max(wait, host_bucket.reserve())
+        return wait
+
+    def wait(self, url: str):
+        """Blocking (threads)."""
+        delay = self.reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def wait_async(self, url: str):
+        """Non-blocking (event loop)."""
+        delay = self.reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+# ———— Shared limiter (rebuilt when the tactics board changes) ————
+_limiter: Optional[RateLimiter] = None
+_limiter_key: Optional[Tuple] = None
+_limiter_lock = threading.Lock()
+
+
+def get_limiter() -> RateLimiter:
+    """
+    The process-wide referee. CLI flags land in config AFTER modules import,
+    so the limiter is keyed on the settings and rebuilt if they change.
+    """
+    global _limiter, _limiter_key
+    key = (config.RPS, config.BURST, config.DELAY, config.THREADS, config.HOST_RPS, config.HOST_BURST)
+    if key != _limiter_key:
+        with _limiter_lock:
+            if key != _limiter_key:
+                _limiter = RateLimiter.from_config(config)
+                _limiter_key = key
+    return _limiter
@@ -2,87 +2,363 @@
 # Module: Requester(Stealth Edition)
 # Author: Sanchez (now officially undroppable)
 # Power: Impersonates Chrome 120 to bypass Cloudflare/Akamai
+import asyncio
+import hashlib
+import importlib
+import importlib.util
+import json
+import threading
 import time
 import tls_client  # Ensure tls-client is installed
-import urllib3
-from typing import Optional, Dict, Any
-from core.config import config
-from .logger import logger
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from itertools import islice
+from typing import Optional, Dict, Any, Callable, Iterable, Iterator, List, Set, Tuple
+from urllib.parse import urlencode
+from core.config import config, warn_if_insecure
+from .logger import logger, status_summary
+from .ratelimit import get_limiter
+from .cache import ResponseCache, CACHEABLE_METHODS
+from .signatures import SignatureSet, StreamScanner, get_signatures
+from .metrics import metrics, request_size
+from .resilience import CLOSED, ERROR, backoff_delay, get_breakers, get_retry_budget, note_shed, outcome_of
 
+# ⚡ The async path (Engine.run_async). Both optional, like tqdm:
+#    aiohttp = raw HTTP/1.1 pace, httpx = HTTP/2 multiplexing.
+# Located now, imported on first use: aiohttp alone is ~150 ms of every tool's startup.
+HAS_AIOHTTP = importlib.util.find_spec("aiohttp") is not None
+HAS_HTTPX = importlib.util.find_spec("httpx") is not None
+HAS_H2 = importlib.util.find_spec("h2") is not None   # HTTP/2 framing: httpx http2=True and batch() (core.multiplex)
+aiohttp: Any = None
+httpx: Any = None
+urllib3: Any = None   # only Requester.stream() needs it
 
+BATCH_CHUNK = 1000    # Requests iter_batch() pulls off a lazy source at a time
 
-  
 
+def _lazy(name: str) -> Any:
+    """Import one of the heavy client libraries above the first time it's needed."""
+    module = globals()[name]
+    if module is None:
+        module = importlib.import_module(name)
+        if name == "urllib3" and not config.VERIFY_SSL:
+            # Silence SSL warnings only in lab mode
+            module.disable_warnings(module.exceptions.InsecureRequestWarning)
+        globals()[name] = module
+    return module
 
-# Silence SSL warnings only in lab mode
-if not config.VERIFY_SSL:
-    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+# ———— THE DISGUISE (shared by sync + async requesters) ————
+BROWSER_HEADERS = {
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+    "Accept-Encoding": "gzip, deflate, br",
+    "DNT": "1",
+    "Connection": "keep-alive",
+    "Upgrade-Insecure-Requests": "1",
+    "Sec-Fetch-Dest": "document",
+    "Sec-Fetch-Mode": "navigate",
+    "Sec-Fetch-Site": "none",
+    "Sec-Fetch-User": "?1",
+    "Pragma": "no-cache",
+    "Cache-Control": "no-cache"
+}
+
+
+# ———— FEEDBACK (who's watching the match) ————
+# Observers get (latency_seconds, status_code or None on a transport error) for
+# every attempt. The adaptive controller in core.engine listens here; the
+# core.metrics registry gets the full story (host, retry, bytes, protocol, phases).
+_observers: List[Callable[[float, Optional[int]], None]] = []
+
+
+def add_observer(fn: Callable[[float, Optional[int]], None]):
+    _observers.append(fn)
+
+
+def remove_observer(fn: Callable[[float, Optional[int]], None]):
+    if fn in _observers:
+        _observers.remove(fn)
+
+
+def _report(latency: float, status: Optional[int], url: str = "", **info: Any):
+    for fn in _observers:
+        fn(latency, status)
+    # 'total' = whole attempt when the observers were given time-to-headers
+    metrics.record(url, info.pop("total", latency), status, **info)
+
+
+def _protocol(version: Any) -> Optional[str]:
+    """urllib3 11 / aiohttp HttpVersion(1, 1) / httpx 'HTTP/2' → 'h1' / 'h2'."""
+    if version is None:
+        return None
+    if hasattr(version, "major"):
+        return f"h{version.major}"
+    if isinstance(version, int):
+        return "h2" if version >= 20 else "h1"
+    text = str(version).upper().replace("HTTP/", "")
+    return f"h{text[0]}" if text[:1].isdigit() else None
+
+
+def http2_enabled() -> bool:
+    """
+    The protocol switch, read per request (the CLI sets it after import).
+    FORCE_HTTP2 → h2 everywhere we can: ALPN, async client, h2c batches.
+    AUTO_HTTP2_CLOUDFLARE → offer h2 in ALPN like Chrome does; CDNs take it, plain servers stay on 1.1.
+    Both off → HTTP/1.1 only.
+    """
+    return config.FORCE_HTTP2 or config.AUTO_HTTP2_CLOUDFLARE
+
+
+# ———— THE MEDICAL STAFF (core.resilience) ————
+def _breaker(url: str) -> Any:
+    """This host's circuit breaker, or None with BREAKERS off."""
+    return get_breakers().get(url) if config.BREAKERS else None
+
+
+def _admit(url: str) -> Tuple[bool, Any]:
+    """(go ahead?, breaker). A benched host's request is shed: counted (note_shed) and never sent."""
+    breaker = _breaker(url)
+    if breaker is not None and not breaker.allow():
+        note_shed()
+        return False, breaker
+    return True, breaker
+
+
+def _settle(breaker: Any, response: Any):
+    if breaker is not None:
+        breaker.record(outcome_of(response))
+
+
+def _may_retry(attempt: int, breaker: Any, url: str, error: BaseException) -> bool:
+    """Another go? Only under RETRIES, on a host that isn't benched, within the run's retry budget."""
+    if breaker is not None:
+        breaker.record(ERROR)
+    if attempt >= config.RETRIES or (breaker is not None and breaker.state != CLOSED):
+        logger.warning(f"💀 {url}: {error} (gave up after {attempt + 1} attempt(s))")
+        return False
+    if not get_retry_budget().withdraw():
+        logger.debug(f"💸 {url}: {error} (retry budget spent, not retrying)")
+        return False
+    logger.debug(f"🔁 {url}: {error} (retry {attempt + 1}/{config.RETRIES})")
+    return True
+
+
+def _log_status(method: str, url: str, response: Any):
+    """Every response goes through here; core.logger folds them into periodic summaries."""
+    # Check for WAF blocks (Cloudflare often returns 403 or 429)
+    waf = response.status_code in (403, 429) and "cloudflare" in response.text.lower()
+    status_summary.record(method, url, response.status_code, waf=waf)
+
+
+class SessionPool:
+    """
+    The Squad Rotation. Sessions are checked out per request and handed back
+    LIFO, so the warmest session (live keep-alive connections) plays next.
+    Every session has its own cookie jar — no more threads fighting over one.
+    """
+
+    def __init__(self, factory: Callable[[], Any], size: Optional[int] = None):
+        self._factory = factory
+        self._size = size
+        self._idle: List[Any] = []
+        self._all: List[Any] = []
+        self._cond = threading.Condition()
+
+        # 📊 Utilisation counters
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.checkouts = 0
+        self.waits = 0
+
+    @property
+    def max_size(self) -> int:
+        """Read lazily: tools often build the Requester before -t is parsed."""
+        return self._size or config.SESSION_POOL_SIZE or config.THREADS
+
+    @property
+    def sessions(self) -> List[Any]:
+        with self._cond:
+            return list(self._all)
+
+    def prime(self) -> Any:
+        """Create one idle session up front (the captain) and return it."""
+        with self._cond:
+            session = self._factory()
+            self._all.append(session)
+            self._idle.append(session)
+            return session
+
+    @contextmanager
+    def checkout(self) -> Iterator[Any]:
+        with self._cond:
+            if not self._idle and len(self._all) >= self.max_size:
+                self.waits += 1
+                while not self._idle and len(self._all) >= self.max_size:
+                    self._cond.wait()
+
+            if self._idle:
+                session = self._idle.pop()
+            else:
+                session = self._factory()
+                self._all.append(session)
+
+            self.checkouts += 1
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+        try:
+            yield session
+        finally:
+            with self._cond:
+                self.in_use -= 1
+                self._idle.append(session)
+                self._cond.notify()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "size": len(self._all),
+                "max_size": self.max_size,
+                "in_use": self.in_use,
+                "peak_in_use": self.peak_in_use,
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "utilisation": self.peak_in_use / self.max_size if self.max_size else 0.0,
+            }
 
 
 class Requester:
     """
     The Midfield Engine v4 — Stealth Mode.
     Uses tls_client to mimic real browser TLS fingerprints (JA3).
+    Requests are spread over a SessionPool: shared disguise (headers, proxy,
+    JA3), separate keep-alive connections and cookie jars.
     """
 
 
 
-    def __init__(self):
+    def __init__(self, pool_size: Optional[int] = None, cache: Optional[bool] = None):
         
         self.config = config
-        # Initialize the Stealth Session
+        warn_if_insecure()
+        self._shared_cookies: Dict[str, str] = {}
+        # cache=None → follow config.CACHE (read on first request, after the CLI has spoken)
+        self._cache_opt = cache
+        self._cache: Optional[ResponseCache] = None
+        # urllib3 pool behind stream(), built on first use
+        self._streamer: Optional["urllib3.PoolManager"] = None
+        self._streamer_lock = threading.Lock()
+        # HTTP/2 connections behind batch(): idle ones per origin, checked out per run
+        self._h2_idle: Dict[Tuple[str, str, int], List["H2Session"]] = {}
+        self._h2_all: List["H2Session"] = []
+        self._h2_lock = threading.Lock()
+        self._h1_only: Set[Tuple[str, str, int]] = set()   # Origins that answered h2 with http/1.1
+
+        # Initialize the Stealth Squad (pool_size=None → one session per thread)
+        self.pool = SessionPool(self._new_session, size=pool_size)
+        # The captain stays reachable as .session ("from core import session" still works)
+        self.session = self.pool.prime()
+
+        if config.USE_PROXY:
+            logger.warning(f"🎭 Stealth Traffic routed via {config.PROXY_URL}")
+
+    def _new_session(self) -> Any:
+        """One squad member, dressed exactly like the rest."""
         # client_identifier="chrome_120" -> tells the server "I am literally Chrome"
-        self.session = tls_client.Session(
+        session = tls_client.Session(
             client_identifier="chrome_120",
-            random_tls_extension_order=True
+            random_tls_extension_order=True,
+            force_http1=not http2_enabled()
         )
         
-        
         # ———— BRIDGE 1: HTTP/1.1 (Requests) ————
         if config.USE_PROXY:
             proxies = {
                 "http": config.PROXY_URL,
                 "https": config.PROXY_URL,
             }
-            self.session.proxies.update(proxies)
-            self.session.verify = False # REQUIRED for Burp
+            session.proxies.update(proxies)
+            session.verify = False # REQUIRED for Burp
 
-            logger.warning(f"🎭 Stealth Traffic routed via {config.PROXY_URL}")
-        # 3. Sync headers
-        self._sync_headers()
+        # 3. Sync headers + cookies set via update_cookies()
+        self._sync_headers(session)
+        if self._shared_cookies:
+            session.cookies.update(self._shared_cookies)
+        return session
 
-    def _sync_headers(self):
+    def _sync_headers(self, session: Any = None):
         """Load headers from config into the session."""
-        base_headers = {
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.5",
-            "Accept-Encoding": "gzip, deflate, br",
-            "DNT": "1",
-            "Connection": "keep-alive",
-            "Upgrade-Insecure-Requests": "1",
-            "Sec-Fetch-Dest": "document",
-            "Sec-Fetch-Mode": "navigate",
-            "Sec-Fetch-Site": "none",
-            "Sec-Fetch-User": "?1",
-            "Pragma": "no-cache",
-            "Cache-Control": "no-cache"
-        }
+        session = session if session is not None else self.session
+        base_headers = dict(BROWSER_HEADERS)
         
         # Add Custom Headers from Config
         if hasattr(config, "CUSTOM_HEADERS") and config.CUSTOM_HEADERS:
             base_headers.update(config.CUSTOM_HEADERS)
 
-        self.session.headers.update(base_headers)    
+        session.headers.update(base_headers)    
         
 
     def update_cookies(self, cookies: Dict[str, str]):
-        """Helper to update cookies since tls_client works slightly differently."""
-        self.session.cookies.update(cookies)
+        """Helper to update cookies since tls_client works slightly differently.
+        Applied to every session in the pool (and any created later)."""
+        self._shared_cookies.update(cookies)
+        for session in self.pool.sessions:
+            session.cookies.update(cookies)
+
+    @property
+    def cache(self) -> Optional[ResponseCache]:
+        """This Requester's response cache, or None when caching is off."""
+        enabled = self.config.CACHE if self._cache_opt is None else self._cache_opt
+        if enabled and self._cache is None:
+            self._cache = ResponseCache.from_config()
+        return self._cache if enabled else None
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Size + utilisation of the session pool."""
+        return self.pool.stats()
+
+    def log_pool_stats(self):
+        st = self.pool.stats()
+        logger.info(
+            f"🔄 Session pool: {st['size']}/{st['max_size']} sessions, peak {st['peak_in_use']} in use "
+            f"({st['utilisation']:.0%}), {st['checkouts']:,} checkouts, {st['waits']:,} waits"
+        )
+        self.log_h2_stats()
+
+    def h2_stats(self) -> List[Dict[str, Any]]:
+        """One entry per HTTP/2 connection batch() opened: streams carried, peak in flight, server limit."""
+        with self._h2_lock:
+            return [s.stats() for s in self._h2_all]
+
+    def log_h2_stats(self, limit: int = 5):
+        st = self.h2_stats()
+        if not st:
+            return
+        streams = sum(c["streams"] for c in st)
+        logger.info(f"🔀 HTTP/2: {streams:,} streams over {len(st)} connection(s)")
+        for c in st[:limit]:
+            logger.info(f"   #{c['id']} {c['origin']}: {c['streams']:,} streams, peak {c['peak_concurrent']} "
+                        f"in flight (server max {c['max_concurrent_streams']})")
+        if len(st) > limit:
+            logger.info(f"   ... and {len(st) - limit} more")
 
     def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None, **kwargs) -> Any:
-        # Add delay for politeness
-        if self.config.DELAY > 0:
-            time.sleep(self.config.DELAY)
+        # 🧊 Kit Man first: same GET already answered (or already in the air)? Share it.
+        cache = self.cache
+        if cache is None or method.upper() not in CACHEABLE_METHODS:
+            return self._request(method, url, headers, **kwargs)
+
+        key = cache.make_key(method, url, headers, kwargs)
+        return cache.fetch(key, lambda: self._request(method, url, headers, **kwargs))
+
+    def _request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None, **kwargs) -> Any:
+        # Benched host: shed the shot before it even queues for the limiter
+        admitted, breaker = _admit(url)
+        if not admitted:
+            return None
+        # Politeness: wait for our slot from the global/per-host token buckets
+        get_limiter().wait(url)
+        get_retry_budget().deposit()
 
         # Prepare arguments for tls_client
         # ———— TRANSLATION LAYER (Requests -> tls_client) ————
@@ -103,42 +379,122 @@ class Requester:
         req_headers = self.session.headers.copy()
         if headers:
             req_headers.update(headers)
+        sent = request_size(method, url, req_headers, kwargs.get('data') or kwargs.get('json'))
 
         for attempt in range(self.config.RETRIES + 1):
+            started = time.perf_counter()
             try:
-                response = self.session.execute_request(
-                    method=method,
-                    url=url,
-                    headers=req_headers,
-                    timeout_seconds=timeout_val,
-                    insecure_skip_verify=insecure_skip,
-                    allow_redirects=allow_redirects,
-                    **kwargs
-                )
+                # Check a session out per attempt — nobody holds one through a backoff
+                with self.pool.checkout() as session:
+                    session.force_http1 = not http2_enabled()
+                    response = session.execute_request(
+                        method=method,
+                        url=url,
+                        headers=req_headers,
+                        timeout_seconds=timeout_val,
+                        insecure_skip_verify=insecure_skip,
+                        allow_redirects=allow_redirects,
+                        **kwargs
+                    )
+                _report(time.perf_counter() - started, response.status_code, url, attempt=attempt,
+                        sent=sent, received=len(response.content or b""))
                 
-                # Check for WAF blocks (Cloudflare often returns 403 or 429)
-                if response.status_code in [403, 429] and "cloudflare" in response.text.lower():
-                    logger.critical(f"🛑 WAF Blocked {url} (Status {response.status_code})")
-                    
-                # Logging
-                if 200 <= response.status_code < 300:
-                    logger.info(f"✅ [{method}] {response.status_code} → {url}")
-                elif response.status_code >= 500:
-                    logger.warning(f"⚠️ Server Error {response.status_code} → {url}")
-                else:
-                    logger.debug(f"🧱 Status {response.status_code} → {url}")
-
+                _log_status(method, url, response)
+                _settle(breaker, response)
                 return response
 
             
             except Exception as e:
-                logger.critical(f"Unexpected error: {e}")
-                if attempt < self.config.RETRIES:
-                    time.sleep(self.config.BACKOFF)
+                _report(time.perf_counter() - started, None, url, attempt=attempt, error=e, sent=sent)
+                if not _may_retry(attempt, breaker, url, e):
+                    break
+                time.sleep(backoff_delay(attempt))
 
             
         return None
 
+    def _stream_pool(self) -> "urllib3.PoolManager":
+        """tls_client only hands back whole bodies; urllib3 lets us hang up halfway through one."""
+        if self._streamer is None:
+            with self._streamer_lock:
+                if self._streamer is None:
+                    _lazy("urllib3")
+                    opts = dict(num_pools=64, maxsize=self.pool.max_size, retries=False,
+                                cert_reqs="CERT_REQUIRED" if self.config.VERIFY_SSL else "CERT_NONE")
+                    self._streamer = (urllib3.ProxyManager(self.config.PROXY_URL, **opts)
+                                      if self.config.USE_PROXY else urllib3.PoolManager(**opts))
+        return self._streamer
+
+    def stream(self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
+               signatures: Optional[SignatureSet] = None, stop_on: Optional[Set[str]] = None,
+               max_bytes: Optional[int] = None, **kwargs) -> Optional["StreamedResponse"]:
+        """
+        The Early Whistle: read the body chunk by chunk, matching signatures as it
+        arrives, and hang up on the first hit (any signature, or only those in
+        stop_on) or after max_bytes (default config.STREAM_MAX_BYTES).
+        Returns a StreamedResponse — a bounded prefix + digest — or None.
+        Note: urllib3 speaks plain TLS, without the chrome_120 fingerprint.
+        """
+        admitted, breaker = _admit(url)
+        if not admitted:
+            return None
+        get_limiter().wait(url)
+        get_retry_budget().deposit()
+        _lazy("urllib3")
+
+        # ———— TRANSLATION LAYER (Requests -> urllib3) ————
+        timeout_val = kwargs.pop('timeout', self.config.TIMEOUT)
+        kwargs.pop('verify', None)  # TLS verification is fixed per pool
+        allow_redirects = kwargs.pop('allow_redirects', True)
+
+        req_headers = dict(self.session.headers)
+        # urllib3 only decodes 'br' with brotli installed — don't ask for what we can't read
+        req_headers["Accept-Encoding"] = "gzip, deflate"
+        if headers:
+            req_headers.update(headers)
+        cookies = {**self._shared_cookies, **(kwargs.pop('cookies', None) or {})}
+        if cookies:
+            req_headers["Cookie"] = "; ".join(f"{k}={v}" for k, v in cookies.items())
+
+        body = kwargs.pop('data', None)
+        json_body = kwargs.pop('json', None)
+        if json_body is not None:
+            body = json.dumps(json_body)
+            req_headers.setdefault("Content-Type", "application/json")
+        elif isinstance(body, dict):
+            body = urlencode(body)
+            req_headers.setdefault("Content-Type", "application/x-www-form-urlencoded")
+
+        sigs = signatures if signatures is not None else get_signatures()
+        cap = max_bytes or self.config.STREAM_MAX_BYTES
+        sent = request_size(method, url, req_headers, body)
+
+        for attempt in range(self.config.RETRIES + 1):
+            started = time.perf_counter()
+            try:
+                raw = self._stream_pool().request(
+                    method, url, body=body, headers=req_headers, preload_content=False,
+                    redirect=allow_redirects, timeout=urllib3.Timeout(total=timeout_val),
+                )
+                ttfb = time.perf_counter() - started
+                response = StreamedResponse.consume(raw, url, sigs.scanner(), stop_on, cap,
+                                                    self.config.STREAM_PREFIX_BYTES)
+                # Observers get time to headers — the body is ours to cut short
+                _report(ttfb, raw.status, url, attempt=attempt, sent=sent, received=response.bytes_read,
+                        protocol=_protocol(getattr(raw, "version", None)),
+                        total=time.perf_counter() - started, phases={"ttfb": ttfb})
+                _log_status(method, url, response)
+                _settle(breaker, response)
+                return response
+
+            except Exception as e:
+                _report(time.perf_counter() - started, None, url, attempt=attempt, error=e, sent=sent)
+                if not _may_retry(attempt, breaker, url, e):
+                    break
+                time.sleep(backoff_delay(attempt))
+
+        return None
+
     # Convenience methods
     def get(self, url: str, **kwargs) -> Any:
         return self.request("GET", url, **kwargs)
@@ -146,4 +502,434 @@ class Requester:
         return self.request("POST", url, **kwargs)
     
     def head(self, url: str, **kwargs) -> Any:
-        return self.request("HEAD", url, **kwargs)
\ No newline at end of file
+        return self.request("HEAD", url, **kwargs)
+
+    # ———— THE ONE-TWO (HTTP/2 multiplexing) ————
+    def batch(self, requests: Iterable[Any]) -> List[Any]:
+        """
+        Many requests, few connections: each origin gets ONE HTTP/2 connection and
+        the requests go out as concurrent streams, never more in flight than the
+        server's MAX_CONCURRENT_STREAMS. Items are URLs (GET), (method, url) or
+        (method, url, {"headers"|"data"|"json": ...}). Returns the responses in
+        input order, None where a request failed.
+        Origins that can't do h2 (flags off, proxy, server said http/1.1) fall back
+        to the session pool. The response cache is not consulted.
+        """
+        items = list(requests)
+        results: List[Any] = [None] * len(items)
+        for index, response in self._batch(items):
+            results[index] = response
+        return results
+
+    def iter_batch(self, requests: Iterable[Any], chunk: int = BATCH_CHUNK) -> Iterator[Tuple[Any, Any]]:
+        """batch() over a lazy source: (item, response) pairs in completion order, chunk items at a time."""
+        source = iter(requests)
+        while True:
+            items = list(islice(source, chunk))
+            if not items:
+                return
+            for index, response in self._batch(items):
+                yield items[index], response
+
+    def _multiplexes(self, origin: Tuple[str, str, int]) -> bool:
+        if not (HAS_H2 and http2_enabled()) or self.config.USE_PROXY or origin in self._h1_only:
+            return False
+        # Cleartext h2 (prior knowledge) only when forced: nothing negotiates it
+        return origin[0] == "https" or (origin[0] == "http" and self.config.FORCE_HTTP2)
+
+    def _batch(self, items: List[Any]) -> Iterator[Tuple[int, Any]]:
+        from .multiplex import as_batch_request, origin_of   # h2 + hpack: ~20 ms nobody else should pay
+        groups: Dict[Tuple[str, str, int], List[Tuple[int, "BatchRequest"]]] = {}
+        pooled: List[Tuple[int, "BatchRequest"]] = []
+        for index, item in enumerate(items):
+            request = as_batch_request(item)
+            origin = origin_of(request.url)
+            if self._multiplexes(origin):
+                groups.setdefault(origin, []).append((index, request))
+            else:
+                pooled.append((index, request))
+
+        for origin, group in groups.items():
+            admitted, breaker = _admit(group[0][1].url)
+            if not admitted:                    # Benched host: the whole group is shed
+                breaker.count_shed(len(group) - 1)      # allow() / _admit() counted the first
+                for _ in group[1:]:
+                    note_shed()
+                for index, _ in group:
+                    yield index, None
+                continue
+            pooled += yield from self._multiplex(origin, group, breaker)
+        if pooled:
+            yield from self._pooled(pooled)
+
+    def _pooled(self, group: List[Tuple[int, "BatchRequest"]]) -> Iterator[Tuple[int, Any]]:
+        """The HTTP/1.1 fallback: the usual request() path, one session per request."""
+        with ThreadPoolExecutor(max_workers=self.pool.max_size) as executor:
+            futures = {executor.submit(self.request, r.method, r.url, headers=r.headers, data=r.body): index
+                       for index, r in group}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+    def _h2_checkout(self, origin: Tuple[str, str, int], url: str) -> "H2Session":
+        from .multiplex import H2Session
+        with self._h2_lock:
+            idle = self._h2_idle.get(origin)
+            if idle:
+                return idle.pop()
+        session = H2Session(url, timeout=self.config.TIMEOUT, verify=self.config.VERIFY_SSL).connect()
+        with self._h2_lock:
+            self._h2_all.append(session)
+        return session
+
+    def _multiplex(self, origin: Tuple[str, str, int], group: List[Tuple[int, "BatchRequest"]],
+                   breaker: Any = None) -> Iterator[Tuple[int, Any]]:
+        """
+        One origin's share of a batch over its h2 connection. Streams cut off by a
+        GOAWAY are replayed on a fresh connection; failed ones are retried like
+        _request() does (backoff, retry budget, breaker). Returns what has to go
+        through the pool instead.
+        """
+        from .multiplex import NotHTTP2
+        base = dict(self.session.headers)
+        base["Accept-Encoding"] = "gzip, deflate"   # We decode these two ourselves
+        if self._shared_cookies:
+            base["Cookie"] = "; ".join(f"{k}={v}" for k, v in self._shared_cookies.items())
+        originals = dict(group)
+        pending = [(index, r._replace(headers={**base, **(r.headers or {})})) for index, r in group]
+        requests = dict(pending)
+        limiter = get_limiter()
+        budget = get_retry_budget()
+        for _ in group:
+            budget.deposit()
+        attempt = 0
+
+        while pending:
+            try:
+                session = self._h2_checkout(origin, pending[0][1].url)
+            except NotHTTP2 as e:
+                logger.debug(f"🔀 {e}: back to the session pool")
+                self._h1_only.add(origin)
+                return [(index, originals[index]) for index, _ in pending]
+            except Exception as e:
+                for index, request in pending:
+                    _report(0.0, None, request.url, attempt=attempt, error=e)
+                if not _may_retry(attempt, breaker, pending[0][1].url, e):
+                    for index, _ in pending:
+                        yield index, None
+                    return []
+                time.sleep(backoff_delay(attempt))
+                attempt += 1
+                continue
+
+            failed: List[Tuple[int, "BatchRequest"]] = []
+            answered = 0
+            try:
+                for index, result in session.run(pending, before_send=limiter.wait):
+                    request = requests[index]
+                    sent = request_size(request.method, request.url, request.headers, request.body)
+                    if isinstance(result, Exception):
+                        _report(0.0, None, request.url, attempt=attempt, error=result, sent=sent, protocol="h2")
+                        failed.append((index, request))
+                        continue
+                    _report(result.timings["ttfb"], result.status_code, request.url, attempt=attempt,
+                            sent=sent, received=len(result.content), protocol="h2",
+                            total=result.timings["total"], phases={"ttfb": result.timings["ttfb"]})
+                    _log_status(request.method, request.url, result)
+                    _settle(breaker, result)
+                    answered += 1
+                    yield index, result
+            finally:
+                with self._h2_lock:
+                    if session.alive:
+                        self._h2_idle.setdefault(origin, []).append(session)
+                metrics.record_connection(f"#{session.id} {session.origin}", "h2", session.streams,
+                                          session.peak_concurrent)
+
+            if not answered and not failed:
+                failed, session.leftover = session.leftover, []   # GOAWAY before a single stream: no progress
+            if failed:
+                error = f"{len(failed)} stream(s) failed on {session.origin}"
+                # _may_retry() pays for the first stream; the rest each need a token of their own
+                retry = _may_retry(attempt, breaker, failed[0][1].url, error)
+                keep: List[Tuple[int, "BatchRequest"]] = []
+                for n, (index, request) in enumerate(failed):
+                    if retry and (n == 0 or budget.withdraw()):
+                        keep.append((index, request))
+                    else:
+                        yield index, None
+                if keep:
+                    time.sleep(backoff_delay(attempt))
+                    attempt += 1
+                failed = keep
+            pending = session.leftover + failed
+        return []
+
+
+class StreamedResponse:
+    """
+    What's left of a streamed body: status, headers, the first STREAM_PREFIX_BYTES
+    (.content / .text), a SHA-256 of everything read, and the signatures seen on the way.
+    - bytes_read: body bytes actually pulled off the wire
+    - stopped_by: "signature" | "cap" | None (read to the end)
+    """
+    __slots__ = ("status_code", "headers", "url", "content", "encoding", "bytes_read",
+                 "digest", "stopped_by", "signatures", "_text")
+
+    CHUNK = 16 * 1024
+
+    def __init__(self, status_code: int, headers: Any, url: str, content: bytes, encoding: Optional[str],
+                 bytes_read: int, digest: str, stopped_by: Optional[str], signatures: Set[str]):
+        self.status_code = status_code
+        self.headers = headers
+        self.url = url
+        self.content = content
+        self.encoding = encoding or "utf-8"
+        self.bytes_read = bytes_read
+        self.digest = digest
+        self.stopped_by = stopped_by
+        self.signatures = signatures
+        self._text: Optional[str] = None
+
+    @property
+    def truncated(self) -> bool:
+        return self.stopped_by is not None
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = self.content.decode(self.encoding, errors="replace")
+        return self._text
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    @classmethod
+    def consume(cls, raw: Any, url: str, scanner: StreamScanner, stop_on: Optional[Set[str]],
+                max_bytes: int, keep: int) -> "StreamedResponse":
+        digest = hashlib.sha256()
+        prefix = bytearray()
+        read = 0
+        stopped_by = None
+        try:
+            for chunk in raw.stream(cls.CHUNK, decode_content=True):
+                chunk = chunk[:max_bytes - read]
+                read += len(chunk)
+                digest.update(chunk)
+                if len(prefix) < keep:
+                    prefix += chunk[:keep - len(prefix)]
+
+                fired = scanner.feed(chunk)
+                if fired and (stop_on is None or fired & stop_on):
+                    stopped_by = "signature"
+                    break
+                if read >= max_bytes:
+                    stopped_by = "cap"
+                    break
+        finally:
+            if stopped_by:
+                # Hang up: the unread rest of the body must not reach the next request
+                raw.close()
+            raw.release_conn()
+
+        charset = None
+        content_type = raw.headers.get("content-type", "")
+        if "charset=" in content_type:
+            charset = content_type.split("charset=", 1)[1].split(";")[0].strip() or None
+        return cls(raw.status, raw.headers, getattr(raw, "url", None) or url, bytes(prefix), charset,
+                   read, digest.hexdigest(), stopped_by, scanner.matched)
+
+
+class AsyncResponse:
+    """
+    A fully-read aiohttp response dressed like a tls_client/httpx one
+    (status_code, headers, content, text, json) so checks don't care who fetched it.
+    """
+    __slots__ = ("status_code", "headers", "content", "url", "encoding", "http_version", "timings", "_text")
+
+    def __init__(self, status_code: int, headers: Any, content: bytes, url: str, encoding: Optional[str],
+                 http_version: Any = None, timings: Optional[Dict[str, float]] = None):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.url = url
+        self.encoding = encoding or "utf-8"
+        self.http_version = http_version
+        self.timings = timings or {}
+        self._text: Optional[str] = None
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = self.content.decode(self.encoding, errors="replace")
+        return self._text
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+
+def _connect_trace() -> Any:
+    """aiohttp tells us when it opens a connection (TCP + TLS); the timing lands in the request's timings dict."""
+    trace = aiohttp.TraceConfig()
+
+    async def start(session, ctx, params):
+        if ctx.trace_request_ctx is not None:
+            ctx.trace_request_ctx["_connect"] = time.perf_counter()
+
+    async def end(session, ctx, params):
+        timings = ctx.trace_request_ctx
+        if timings is not None and "_connect" in timings:
+            timings["connect"] = time.perf_counter() - timings.pop("_connect")
+
+    trace.on_connection_create_start.append(start)
+    trace.on_connection_create_end.append(end)
+    return trace
+
+
+class AsyncRequester:
+    """
+    The Counter-Attack — Async Edition.
+    Same contract as Requester (get/post/head return a response or None),
+    but every call is awaitable so thousands of shots share one event loop.
+    Backend: aiohttp when installed (fastest HTTP/1.1), otherwise httpx.
+    """
+
+    def __init__(self, max_connections: Optional[int] = None):
+        if not (HAS_AIOHTTP or HAS_HTTPX):
+            raise ImportError("Async mode needs aiohttp or httpx → pip install aiohttp")
+
+        self.config = config
+        warn_if_insecure()
+        # aiohttp only speaks HTTP/1.1: FORCE_HTTP2 hands the async path to httpx
+        forced = config.FORCE_HTTP2 and HAS_HTTPX and HAS_H2
+        self.backend = "aiohttp" if HAS_AIOHTTP and not forced else "httpx"
+        _lazy(self.backend)
+        self.max_connections = max_connections or config.ASYNC_CONCURRENCY
+
+        self.headers = dict(BROWSER_HEADERS)
+        # Neither client decodes 'br' without brotli installed — don't ask for what we can't read
+        self.headers["Accept-Encoding"] = "gzip, deflate"
+        if config.CUSTOM_HEADERS:
+            self.headers.update(config.CUSTOM_HEADERS)
+
+        self.proxy = config.PROXY_URL if config.USE_PROXY else None
+        if self.proxy:
+            logger.warning(f"🎭 Async Traffic routed via {self.proxy}")
+
+        # Built lazily: aiohttp sessions must be born inside a running loop
+        self.session: Any = None
+        self.cookies: Dict[str, str] = {}           # Held until then, so update_cookies() works from sync code
+
+    def _client(self) -> Any:
+        if self.session is None:
+            if self.backend == "aiohttp":
+                self.session = aiohttp.ClientSession(
+                    headers=self.headers,
+                    connector=aiohttp.TCPConnector(limit=self.max_connections,
+                                                   ssl=None if self.config.VERIFY_SSL else False),
+                    trace_configs=[_connect_trace()],
+                )
+            else:
+                self.session = httpx.AsyncClient(
+                    headers=self.headers,
+                    verify=self.config.VERIFY_SSL,
+                    proxy=self.proxy,
+                    http2=HAS_H2 and http2_enabled(),
+                    limits=httpx.Limits(max_connections=self.max_connections,
+                                        max_keepalive_connections=self.max_connections),
+                )
+            if self.cookies:
+                self._apply_cookies(self.cookies)
+        return self.session
+
+    def _apply_cookies(self, cookies: Dict[str, str]):
+        if self.backend == "aiohttp":
+            self.session.cookie_jar.update_cookies(cookies)
+        else:
+            self.session.cookies.update(cookies)
+
+    def update_cookies(self, cookies: Dict[str, str]):
+        self.cookies.update(cookies)
+        if self.session is not None:
+            self._apply_cookies(cookies)
+
+    async def _send(self, method: str, url: str, headers: Dict[str, str], timeout_val: float,
+                    allow_redirects: bool, **kwargs) -> Any:
+        client = self._client()
+        if self.backend == "aiohttp":
+            timings: Dict[str, float] = {}
+            started = time.perf_counter()
+            async with client.request(method, url, headers=headers, proxy=self.proxy,
+                                      timeout=aiohttp.ClientTimeout(total=timeout_val),
+                                      allow_redirects=allow_redirects, trace_request_ctx=timings,
+                                      **kwargs) as res:
+                timings["ttfb"] = time.perf_counter() - started
+                body = await res.read()
+                return AsyncResponse(res.status, res.headers, body, str(res.url), res.charset,
+                                     res.version, timings)
+
+        # httpx: per-request cookies are deprecated → send them as a header
+        cookies = kwargs.pop('cookies', None)
+        if cookies:
+            headers = {**headers, "Cookie": "; ".join(f"{k}={v}" for k, v in cookies.items())}
+        # Raw string bodies (php://input payloads) go in as content
+        if isinstance(kwargs.get('data'), (str, bytes)):
+            kwargs['content'] = kwargs.pop('data')
+        return await client.request(method, url, headers=headers, timeout=timeout_val,
+                                    follow_redirects=allow_redirects, **kwargs)
+
+    async def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None, **kwargs) -> Any:
+        admitted, breaker = _admit(url)
+        if not admitted:
+            return None
+        # Politeness: same token buckets, but we yield the loop instead of parking a thread
+        await get_limiter().wait_async(url)
+        get_retry_budget().deposit()
+
+        # ———— TRANSLATION LAYER (Requests -> aiohttp/httpx) ————
+        timeout_val = kwargs.pop('timeout', self.config.TIMEOUT)
+        kwargs.pop('verify', None)  # TLS verification is fixed per client, not per request
+        allow_redirects = kwargs.pop('allow_redirects', True)
+        req_headers = dict(headers) if headers else {}
+        sent = request_size(method, url, {**self.headers, **req_headers}, kwargs.get('data') or kwargs.get('json'))
+
+        for attempt in range(self.config.RETRIES + 1):
+            started = time.perf_counter()
+            try:
+                response = await self._send(method, url, req_headers, timeout_val, allow_redirects, **kwargs)
+                _report(time.perf_counter() - started, response.status_code, url, attempt=attempt,
+                        sent=sent, received=len(response.content or b""),
+                        protocol=_protocol(getattr(response, "http_version", None)),
+                        phases=getattr(response, "timings", None))
+
+                _log_status(method, url, response)
+                _settle(breaker, response)
+                return response
+
+            except Exception as e:
+                _report(time.perf_counter() - started, None, url, attempt=attempt, error=e, sent=sent)
+                if not _may_retry(attempt, breaker, url, e):
+                    break
+                await asyncio.sleep(backoff_delay(attempt))
+
+        return None
+
+    # Convenience methods
+    async def get(self, url: str, **kwargs) -> Any:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> Any:
+        return await self.request("POST", url, **kwargs)
+
+    async def head(self, url: str, **kwargs) -> Any:
+        return await self.request("HEAD", url, **kwargs)
+
+    async def aclose(self):
+        if self.session is not None:
+            await (self.session.close() if self.backend == "aiohttp" else self.session.aclose())
+            self.session = None
+
+    async def __aenter__(self) -> "AsyncRequester":
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+# Module: Resilience
+# Author: Sanchez (The Medical Staff)
+# Purpose: What happens after a shot goes wrong. Exponential backoff with full
+#          jitter, a retry budget so retries stay a fraction of the traffic, and
+#          a circuit breaker per host: a dead or WAF-blocking host gets benched
+#          and its queued work shed, until a single half-open probe gets through.
+
+import random
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from core.config import config
+from core.logger import logger
+
+# Block pages from the usual gatekeepers (a plain 403 is an answer, not a block)
+WAF_MARKERS = ("cloudflare", "akamai", "incapsula", "imperva", "sucuri", "attention required",
+               "request blocked", "web application firewall")
+
+OK, ERROR, BLOCK = "ok", "error", "block"
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+# Requests shed in this thread / asyncio task so far. A shed request comes back as
+# None like any failure; this is how a caller (CheckpointStore.track) tells them apart.
+_shed_here: ContextVar[int] = ContextVar("arsenal_shed", default=0)
+
+
+def note_shed():
+    _shed_here.set(_shed_here.get() + 1)
+
+
+def shed_count() -> int:
+    """Shed so far in the current thread / task: compare before and after a call."""
+    return _shed_here.get()
+
+
+# ———— Backoff (The Recovery Time) ————
+def backoff_delay(attempt: int, cfg: Any = config, rand: Callable[[], float] = random.random) -> float:
+    """
+    "Full jitter": uniform(0, min(BACKOFF_MAX, BACKOFF_BASE × BACKOFF^attempt)).
+    The spread is the point — threads that failed together don't retry together.
+    """
+    ceiling = min(cfg.BACKOFF_MAX, cfg.BACKOFF_BASE * cfg.BACKOFF ** attempt)
+    return ceiling * rand()
+
+
+def is_block(response: Any) -> bool:
+    """429 always; 403 only when the body is somebody's WAF page."""
+    status = getattr(response, "status_code", None)
+    if status == 429:
+        return True
+    if status != 403:
+        return False
+    try:
+        head = response.text[:4096].lower()
+    except Exception:
+        return False
+    return any(marker in head for marker in WAF_MARKERS)
+
+
+def outcome_of(response: Any) -> str:
+    if response is None:
+        return ERROR
+    return BLOCK if is_block(response) else OK
+
+
+# ———— Retry budget (The Squad Rotation Limit) ————
+class RetryBudget:
+    """
+    Every first attempt deposits `ratio` of a token, every retry spends a whole
+    one: over a run, retries ≤ ratio × requests + reserve. The reserve (also the
+    cap) lets a quiet run retry a few times before it has earned anything.
+    A blocking host can't turn 10k payloads into 40k attempts.
+    """
+
+    def __init__(self, ratio: float = 0.2, reserve: int = 10):
+        self.ratio = ratio
+        self.reserve = max(0, reserve)
+        self._tokens = float(self.reserve)
+        self._lock = threading.Lock()
+        self.deposits = 0
+        self.spent = 0
+        self.denied = 0
+
+    def deposit(self):
+        with self._lock:
+            self.deposits += 1
+            self._tokens = min(self._tokens + self.ratio, max(float(self.reserve), 1.0))
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                self.spent += 1
+                return True
+            self.denied += 1
+            return False
+
+    def reset_counts(self):
+        """A new run's scoresheet: the tokens already earned stay."""
+        with self._lock:
+            self.deposits = self.spent = self.denied = 0
+
+
+# ———— Circuit breaker (The Sin Bin) ————
+class CircuitBreaker:
+    """
+    closed    → everything goes; `failures` transport errors in a row, or a WAF
+                block on `block_ratio` of the last `window` answers, opens it
+    open      → everything is shed (allow() is False) for `cooldown` seconds
+    half-open → exactly one probe goes; success closes, failure re-opens with
+                the cooldown doubled (up to max_cooldown)
+    """
+
+    def __init__(self, host: str, failures: int = 5, window: int = 20, block_ratio: float = 0.8,
+                 cooldown: float = 30.0, max_cooldown: float = 300.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.host = host
+        self.failures = max(1, failures)
+        self.window = max(1, window)
+        self.block_ratio = block_ratio
+        self.base_cooldown = cooldown
+        self.cooldown = cooldown
+        self.max_cooldown = max(cooldown, max_cooldown)
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        self.state = CLOSED
+        self._errors = 0                            # Consecutive transport errors
+        self._recent: Deque[bool] = deque(maxlen=self.window)   # True = WAF block
+        self._opened_at = 0.0
+        self._probing = False
+        self.trips = 0
+        self.shed = 0
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and self._clock() - self._opened_at >= self.cooldown:
+                self.state = HALF_OPEN
+                self._probing = False
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True                # This caller is the probe
+                return True
+            self.shed += 1
+            return False
+
+    def count_shed(self, n: int):
+        """n more requests shed on one allow() (a whole batch group)."""
+        with self._lock:
+            self.shed += n
+
+    def reset_counts(self):
+        """A new run's scoresheet: an open circuit stays open."""
+        with self._lock:
+            self.trips = self.shed = 0
+
+    def record(self, outcome: str):
+        with self._lock:
+            if self.state == HALF_OPEN:
+                if outcome == OK:
+                    self._close()
+                else:
+                    self._open(f"probe {'blocked' if outcome == BLOCK else 'failed'}", self.cooldown * 2)
+                return
+            if self.state == OPEN:
+                return                              # Stragglers sent before it opened
+
+            self._errors = self._errors + 1 if outcome == ERROR else 0
+            if outcome != ERROR:
+                self._recent.append(outcome == BLOCK)
+            if self._errors >= self.failures:
+                self._open(f"{self._errors} connection errors in a row", self.base_cooldown)
+            elif len(self._recent) == self.window and sum(self._recent) >= self.block_ratio * self.window:
+                self._open(f"{sum(self._recent)}/{self.window} answers were WAF blocks", self.base_cooldown)
+
+    def _open(self, reason: str, cooldown: float):
+        self.state = OPEN
+        self.cooldown = min(cooldown, self.max_cooldown)
+        self._opened_at = self._clock()
+        self._probing = False
+        self.trips += 1
+        logger.warning(f"🟥 {self.host}: circuit open ({reason}) — shedding its work for {self.cooldown:.0f}s")
+
+    def _close(self):
+        self.state = CLOSED
+        self.cooldown = self.base_cooldown
+        self._errors = 0
+        self._recent.clear()
+        self._probing = False
+        logger.info(f"🟩 {self.host}: probe answered, circuit closed")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"host": self.host, "state": self.state, "trips": self.trips, "shed": self.shed}
+
+
+class BreakerBoard:
+    """One CircuitBreaker per host (netloc), made on first sight."""
+
+    def __init__(self, factory: Callable[[str], CircuitBreaker]):
+        self._factory = factory
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> CircuitBreaker:
+        host = urlsplit(url).netloc
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(host, self._factory(host))
+        return breaker
+
+    def stats(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return [b.stats() for b in breakers if b.trips or b.shed]
+
+    def reset_counts(self):
+        with self._lock:
+            breakers = list(self._breakers.values())
+        for breaker in breakers:
+            breaker.reset_counts()
+
+    def log_summary(self):
+        tripped = self.stats()
+        for st in tripped:
+            logger.info(f"🟥 {st['host']}: tripped {st['trips']}×, {st['shed']:,} requests shed, now {st['state']}")
+        shed = sum(st["shed"] for st in tripped)
+        if shed:
+            logger.warning(f"🟥 {shed:,} requests shed by open circuits were not sent "
+                           f"(checkpointed scans leave them pending for --resume)")
+
+
+# ———— Shared instances (rebuilt when the tactics board changes) ————
+_shared: Optional[Tuple[RetryBudget, BreakerBoard]] = None
+_shared_key: Optional[Tuple] = None
+_shared_lock = threading.Lock()
+
+
+def _settings_key(cfg: Any = config) -> Tuple:
+    return (cfg.RETRY_BUDGET, cfg.RETRY_RESERVE, cfg.BREAKER_FAILURES, cfg.BREAKER_WINDOW,
+            cfg.BREAKER_BLOCK_RATIO, cfg.BREAKER_COOLDOWN)
+
+
+def _resilience() -> Tuple[RetryBudget, BreakerBoard]:
+    """Like get_limiter(): CLI flags land after import, so the pair is keyed on the settings."""
+    global _shared, _shared_key
+    key = _settings_key()
+    if key != _shared_key:
+        with _shared_lock:
+            if key != _shared_key:
+                budget = RetryBudget(config.RETRY_BUDGET, config.RETRY_RESERVE)
+                board = BreakerBoard(lambda host: CircuitBreaker(
+                    host, failures=config.BREAKER_FAILURES, window=config.BREAKER_WINDOW,
+                    block_ratio=config.BREAKER_BLOCK_RATIO, cooldown=config.BREAKER_COOLDOWN))
+                _shared, _shared_key = (budget, board), key
+    return _shared
+
+
+def get_retry_budget() -> RetryBudget:
+    return _resilience()[0]
+
+
+def get_breakers() -> BreakerBoard:
+    return _resilience()[1]
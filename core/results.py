@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# Module: Results
+# Author: Sanchez (The Scoresheet)
+# Purpose: Hits go to disk the moment they land, not after the final whistle.
+#          One JSON record per hit (tool, url, payload, status, size, signature,
+#          timestamp), buffered, flushed at least every RESULTS_FLUSH_INTERVAL
+#          seconds, and rotated before the file gets unwieldy.
+
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from core.config import config
+from core.logger import logger
+
+FIELDS = ("tool", "url", "payload", "status", "size", "signature", "timestamp")
+
+
+def response_size(response: Any) -> Optional[int]:
+    """Body bytes actually read: a streamed body that was cut off counts what came over the wire."""
+    if response is None:
+        return None
+    size = getattr(response, "bytes_read", None)
+    return size if size is not None else len(getattr(response, "content", b"") or b"")
+
+
+class Hit(str):
+    """
+    A hit that still reads like the one-line message every tool prints, but
+    carries its details for the sink:
+        return Hit(f"🔥 LFI FOUND: {url}", url=url, payload=p, response=res, signature="lfi.passwd")
+    Being a str, it goes through the engine, checkpoints and worker queues unchanged.
+    """
+
+    def __new__(cls, text: str, url: Optional[str] = None, payload: Optional[str] = None,
+                response: Any = None, signature: Optional[str] = None,
+                status: Optional[int] = None, size: Optional[int] = None) -> "Hit":
+        hit = super().__new__(cls, text)
+        hit.url = url
+        hit.payload = payload
+        hit.signature = signature
+        hit.status = status if status is not None else getattr(response, "status_code", None)
+        hit.size = size if size is not None else response_size(response)
+        return hit
+
+
+def to_record(hit: Any, tool: str) -> Dict[str, Any]:
+    """Any hit → the sink's record. Fields the hit doesn't have (a plain str has none) are null."""
+    record = {"tool": tool}
+    for field in FIELDS[1:-1]:
+        value = getattr(hit, field, None)
+        record[field] = value if value is None or isinstance(value, (int, float)) else str(value)
+    record["timestamp"] = datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+    record["hit"] = str(hit)
+    return record
+
+
+class ResultSink:
+    """
+    Append-as-you-go hit file, safe to share between threads:
+        with ResultSink("hits.jsonl", tool="fuzzer") as sink:
+            engine.run(check, targets, sink=sink)
+    - *.jsonl → one to_record() JSON object per line; anything else → the hit text
+    - writes are buffered; the buffer is flushed every `buffer` hits and, via a
+      one-shot timer, no later than `interval` seconds after a hit lands
+    - past `max_bytes` the file is rotated: FILE → FILE.1 → ... → FILE.<backups> (at least one kept)
+    """
+
+    def __init__(self, path: Union[str, Path], tool: str, append: bool = False,
+                 buffer: int = 100, interval: Optional[float] = None,
+                 max_bytes: Optional[int] = None, backups: Optional[int] = None):
+        self.path = Path(path).expanduser()
+        self.tool = tool
+        self.jsonl = self.path.suffix.lower() == ".jsonl"
+        self.buffer = max(1, buffer)
+        self.interval = interval if interval is not None else config.RESULTS_FLUSH_INTERVAL
+        self.max_bytes = max_bytes if max_bytes is not None else config.RESULTS_MAX_BYTES
+        self.backups = backups if backups is not None else config.RESULTS_BACKUPS
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.path.open("a" if append else "w", encoding="utf-8")
+        self._size = self._file.tell()
+        self._pending: List[str] = []
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self.count = 0
+        self.rotations = 0
+
+    def write(self, hit: Any):
+        line = (json.dumps(to_record(hit, self.tool), ensure_ascii=False, default=str)
+                if self.jsonl else str(hit)) + "\n"
+        with self._lock:
+            if self._file is None:
+                return
+            self._pending.append(line)
+            self.count += 1
+            if len(self._pending) >= self.buffer:
+                self._flush()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending or self._file is None:
+            return
+        chunk = "".join(self._pending)
+        self._pending.clear()
+        self._file.write(chunk)
+        self._file.flush()
+        self._size += len(chunk.encode("utf-8"))
+        if self.max_bytes and self._size >= self.max_bytes:
+            self._rotate()
+
+    def _rotate(self):
+        self._file.close()
+        for n in range(max(1, self.backups) - 1, 0, -1):     # The oldest falls off the end
+            older = self.path.with_name(f"{self.path.name}.{n}")
+            if older.exists():
+                os.replace(older, self.path.with_name(f"{self.path.name}.{n + 1}"))
+        os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+        self._file = self.path.open("w", encoding="utf-8")
+        self._size = 0
+        self.rotations += 1
+        logger.debug(f"🧾 {self.path} rotated ({self.rotations}×)")
+
+    def close(self):
+        with self._lock:
+            self._flush()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self) -> "ResultSink":
+        return self
+
+    def __exit__(self, *exc: Any):
+        self.close()
+
+
+def open_sink(tool: str, path: Optional[str] = None, append: bool = False) -> Optional[ResultSink]:
+    """The tool's sink: `path` (its -o flag) or config.RESULTS_FILE; None when neither is set or it can't open."""
+    path = path or config.RESULTS_FILE
+    if not path:
+        return None
+    try:
+        return ResultSink(path, tool, append=append)
+    except OSError as e:
+        logger.error(f"❌ Could not open {path}: {e}")
+        return None
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# Module: Signatures
+# Author: Sanchez (The VAR)
+# Purpose: Every detector pattern in one automaton. A response body is read ONCE,
+#          as bytes, and we get back every signature that matched — whether we
+#          carry twenty signatures or twenty thousand.
+
+import json
+import os
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+from core.config import config
+
+# Optional C automaton (pip install pyahocorasick); the regex fallback is exact, just slower
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+SIGNATURE_DIR = Path(__file__).resolve().parent / "data" / "signatures"
+
+
+@dataclass(frozen=True)
+class Signature:
+    """
+    One detector rule. It fires when ANY of its patterns is in the body
+    (or ALL of them, with require_all). ignore_case folds ASCII only.
+    """
+    id: str
+    patterns: Tuple[bytes, ...]
+    require_all: bool = False
+    ignore_case: bool = False
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Signature":
+        patterns = tuple(p.encode("utf-8") for p in data["patterns"])
+        if not data.get("id") or not patterns or not all(patterns):
+            raise ValueError(f"Signature needs an id and non-empty patterns: {data!r}")
+        return cls(data["id"], patterns, bool(data.get("all", False)), bool(data.get("ignore_case", False)))
+
+
+def _trie_regex(words: Iterable[bytes]) -> bytes:
+    """Factor the words into a prefix trie so the regex branches once per byte, not once per word."""
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for byte in word:
+            node = node.setdefault(byte, {})
+        node[None] = True
+
+    def build(node: dict) -> bytes:
+        branches = [re.escape(bytes([b])) + build(child)
+                    for b, child in sorted((k, v) for k, v in node.items() if k is not None)]
+        if not branches:
+            return b""
+        body = branches[0] if len(branches) == 1 else b"(?:" + b"|".join(branches) + b")"
+        # Greedy optional tail: the longest word at this spot wins, shorter ones are recovered below
+        return b"(?:" + body + b")?" if None in node else body
+
+    return build(trie)
+
+
+class _Matcher:
+    """Multi-pattern search over bytes → indexes of every pattern present (overlaps included)."""
+
+    def __init__(self, patterns: Sequence[bytes]):
+        self.patterns = list(patterns)
+        self._index: Dict[bytes, int] = {p: i for i, p in enumerate(self.patterns)}
+        self._automaton = None
+        self._regex = None
+
+        if not self.patterns:
+            return
+        if HAS_AHOCORASICK:
+            # latin-1 maps bytes 1:1 onto code points, so the str automaton works on raw bytes
+            self._automaton = ahocorasick.Automaton()
+            for word, i in self._index.items():
+                self._automaton.add_word(word.decode("latin-1"), i)
+            self._automaton.make_automaton()
+        else:
+            # Zero-width lookahead: every start offset is tried, so overlapping hits aren't lost
+            self._regex = re.compile(b"(?=(" + _trie_regex(self._index) + b"))", re.DOTALL)
+            self._lengths = sorted({len(p) for p in self.patterns})
+
+    def find(self, body: bytes) -> Set[int]:
+        if self._automaton is not None:
+            return {i for _, i in self._automaton.iter(body.decode("latin-1"))}
+
+        found: Set[int] = set()
+        if self._regex is None:
+            return found
+        index, lengths = self._index, self._lengths
+        for m in self._regex.finditer(body):
+            longest = m.group(1)
+            # Shorter patterns that start at the same offset are prefixes of the longest one
+            for n in lengths:
+                if n > len(longest):
+                    break
+                i = index.get(longest[:n])
+                if i is not None:
+                    found.add(i)
+        return found
+
+
+class SignatureSet:
+    """
+    The registry: add()/load() signatures, then match(body) → set of signature ids.
+    Compiled lazily into (at most) two automata — case-sensitive and ASCII-folded —
+    and recompiled only when signatures are added.
+    """
+
+    def __init__(self, signatures: Iterable[Signature] = ()):
+        self._signatures: Dict[str, Signature] = {}
+        self._lock = threading.Lock()
+        self._compiled: Optional[tuple] = None
+        for sig in signatures:
+            self.add(sig)
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, sig_id: str) -> bool:
+        return sig_id in self._signatures
+
+    def add(self, signature: Signature):
+        with self._lock:
+            self._signatures[signature.id] = signature
+            self._compiled = None
+
+    def load(self, path: Union[str, Path]) -> int:
+        """Load a JSON list of {"id", "patterns", "all"?, "ignore_case"?} — or every *.json in a directory."""
+        path = Path(path).expanduser()
+        files = sorted(path.glob("*.json")) if path.is_dir() else [path]
+        count = 0
+        for file in files:
+            for entry in json.loads(file.read_text(encoding="utf-8")):
+                self.add(Signature.from_dict(entry))
+                count += 1
+        return count
+
+    def _compile(self) -> tuple:
+        if self._compiled is not None:
+            return self._compiled
+        with self._lock:
+            if self._compiled is not None:
+                return self._compiled
+            sides = []
+            for fold in (False, True):
+                words: Dict[bytes, int] = {}
+                owners: List[List[Tuple[str, bool, int]]] = []
+                for sig in self._signatures.values():
+                    if sig.ignore_case != fold:
+                        continue
+                    unique = {p.lower() if fold else p for p in sig.patterns}
+                    for word in unique:
+                        if word not in words:
+                            words[word] = len(owners)
+                            owners.append([])
+                        owners[words[word]].append((sig.id, sig.require_all, len(unique)))
+                if words:
+                    # A match can straddle two chunks by at most (longest word - 1) bytes
+                    overlap = max(len(w) for w in words) - 1
+                    sides.append((fold, _Matcher(list(words)), owners, overlap))
+            self._compiled = tuple(sides)
+            return self._compiled
+
+    def scanner(self) -> "StreamScanner":
+        """Incremental matching for bodies that arrive in chunks."""
+        return StreamScanner(self._compile())
+
+    def match(self, body: Union[bytes, str, None]) -> Set[str]:
+        """Ids of every signature the body triggers. One pass per case mode, whatever the signature count."""
+        if not body:
+            return set()
+        if isinstance(body, str):
+            body = body.encode("utf-8", "ignore")
+        scanner = self.scanner()
+        scanner.feed(body, final=True)
+        return scanner.matched
+
+
+class StreamScanner:
+    """
+    Feed body chunks as they arrive; feed() returns the signatures that fired on
+    that chunk. Only a (longest pattern - 1) byte tail is carried between chunks,
+    so a hit split across two reads is still caught.
+    """
+
+    def __init__(self, compiled: tuple):
+        self._sides = compiled
+        self._tails = [b""] * len(compiled)
+        self._found: List[Set[int]] = [set() for _ in compiled]
+        self._partial: Dict[str, int] = {}
+        self.matched: Set[str] = set()
+
+    def feed(self, chunk: bytes, final: bool = False) -> Set[str]:
+        fired: Set[str] = set()
+        for n, (fold, matcher, owners, overlap) in enumerate(self._sides):
+            text = self._tails[n] + (chunk.lower() if fold else chunk)
+            found = self._found[n]
+            for i in matcher.find(text) - found:
+                found.add(i)
+                for sig_id, require_all, needed in owners[i]:
+                    if require_all:
+                        self._partial[sig_id] = self._partial.get(sig_id, 0) + 1
+                        if self._partial[sig_id] < needed:
+                            continue
+                    if sig_id not in self.matched:
+                        self.matched.add(sig_id)
+                        fired.add(sig_id)
+            if not final:
+                self._tails[n] = text[-overlap:] if overlap else b""
+        return fired
+
+
+# ———— Shared registry (bundled data files + ARSENAL_SIGNATURES) ————
+_default: Optional[SignatureSet] = None
+_default_lock = threading.Lock()
+
+
+def get_signatures() -> SignatureSet:
+    """The process-wide set: core/data/signatures/*.json plus any paths in config.SIGNATURE_PATHS."""
+    global _default
+    if _default is None:
+        with _default_lock:
+            if _default is None:
+                sigs = SignatureSet()
+                sigs.load(SIGNATURE_DIR)
+                for extra in filter(None, config.SIGNATURE_PATHS.split(os.pathsep)):
+                    sigs.load(extra)
+                _default = sigs
+    return _default
+
+
+def match_response(res) -> Set[str]:
+    """Signature ids for a response (tls_client, AsyncResponse or anything with .content)."""
+    # Streamed responses were matched on the wire, over more than the prefix they kept
+    streamed = getattr(res, "signatures", None)
+    if streamed is not None:
+        return streamed
+    content = getattr(res, "content", None)
+    if content is None:
+        content = getattr(res, "text", "")
+    return get_signatures().match(content)
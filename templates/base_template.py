@@ -3,6 +3,7 @@
 The Arsenal Base Template — Fixed & Optimized.
 """
 import argparse
+import asyncio
 import sys
 import textwrap
 from pathlib import Path
@@ -20,6 +21,11 @@ if str(root_path) not in sys.path:
 
 try:
     from core import engine, logger, config, get_banner, Requester
+    from core.requester import AsyncRequester
+    from core.checkpoint import CheckpointStore
+    from core.results import open_sink
+    from core.wordlist import Wordlist, parse_shard
+    from core.logger import flush_logs
 except ImportError:
     print(f"{Fore.RED}❌ CRITICAL: Could not import 'core'. Are you running this from the right folder?{Style.RESET_ALL}")
     sys.exit(1)
@@ -38,34 +44,113 @@ def get_base_parser(tool_name: str) -> argparse.ArgumentParser:
 
     # PAYLOADS
     g_payload = parser.add_argument_group('💣 Payloads')
-    g_payload.add_argument("-w", "--wordlist", help="Wordlist file")
+    g_payload.add_argument("-w", "--wordlist", action="append",
+                           help="Wordlist file (.txt, .gz or .awl pack). Repeat to chain several")
+    g_payload.add_argument("--dedupe", action="store_true",
+                           help="Drop repeated payloads across all wordlists")
+    g_payload.add_argument("--shard", metavar="K/N",
+                           help="Only take slice K of N (split one list across machines; O(1) on .awl packs)")
 
     # TACTICS
     g_tactics = parser.add_argument_group('🛠️ Tactics')
     g_tactics.add_argument("-t", "--threads", type=int, default=10, help="Thread count")
-    g_tactics.add_argument("--delay", type=float, default=0.0, help="Delay in seconds")
+    g_tactics.add_argument("--delay", type=float, default=0.0,
+                           help="Per-thread delay in seconds (enforced as THREADS/DELAY req/s)")
+    g_tactics.add_argument("--rps", type=float, default=0.0,
+                           help="🚦 Exact global requests/second (overrides --delay)")
+    g_tactics.add_argument("--host-rps", type=float, default=0.0, help="🚦 Per-host requests/second cap")
+    g_tactics.add_argument("--burst", type=int, default=1, help="Requests allowed back-to-back (default: 1)")
+    g_tactics.add_argument("--cache", action="store_true",
+                           help="🧊 Cache GET/HEAD responses + coalesce identical in-flight requests")
+    g_tactics.add_argument("--adaptive", action="store_true",
+                           help="🎛️ AIMD concurrency: grow while healthy, halve on 429/5xx/latency (-t = ceiling)")
+    g_tactics.add_argument("--calibrate", action="store_true",
+                           help="🎯 Find the throughput knee first, then go adaptive")
+    g_tactics.add_argument("--no-soft404", action="store_true",
+                           help="📏 Skip soft-404 calibration (random-path baselines per directory/extension)")
+    g_tactics.add_argument("--stream", action="store_true",
+                           help="🌊 Stream bodies: hang up on the first signature hit or --max-body (plain TLS, no JA3)")
+    g_tactics.add_argument("--max-body", type=int, default=config.STREAM_MAX_BYTES,
+                           help="Byte cap per streamed body (default: %(default)s)")
     # Kept for legacy compatibility, though tls_client is auto-H2
     g_tactics.add_argument("--h2", action="store_true", help="Force HTTP/2 (Ferrari Mode)") 
     g_tactics.add_argument("--stop", action="store_true", help="🏆 Golden Goal: Stop on first hit")
+    g_tactics.add_argument("--async", action="store_true", dest="async_mode",
+                           help="⚡ Counter-Press: one event loop, thousands of requests in flight")
+    g_tactics.add_argument("-c", "--concurrency", type=int, default=config.ASYNC_CONCURRENCY,
+                           help=f"In-flight requests in --async mode (default: {config.ASYNC_CONCURRENCY})")
+    g_tactics.add_argument("-P", "--processes", type=int, default=config.PROCESSES,
+                           help="Worker processes, each with its own threads + session (0 = all cores)")
+    g_tactics.add_argument("--resume", action="store_true",
+                           help="⏯️ Pick up an interrupted scan (same tool, URL + wordlist) where it stopped")
     
     # ✅ SANCHEZ FIX: dest="headers" ensures args.headers is a list
     g_tactics.add_argument("-H", "--header", action="append", dest="headers", default=[], help="Custom headers")
     
     # OUTPUT
     g_output = parser.add_argument_group('💾 Output')
-    g_output.add_argument("-o", "--output", help="Save hits to file")
+    g_output.add_argument("-o", "--output", default=config.RESULTS_FILE or None,
+                          help="🧾 Save hits as they land (*.jsonl = one JSON record per hit)")
+    g_output.add_argument("--metrics", metavar="FILE",
+                          help="📈 Export run metrics (*.prom = Prometheus text, else JSON)")
 
     return parser
 
-def run_scan(tool_name: str, check_func, args, extra_kwargs: dict = None):
+def _kickoff_async(check_func, async_check_func, targets, args, extra_kwargs: dict = None,
+                   total: int = None, sink=None):
+    """Runs the scan on the event loop. Tools without an async check fall back to worker threads."""
+    # --delay is per worker; on the loop every in-flight slot is a worker
+    if not config.RPS and config.DELAY > 0:
+        config.RPS = config.ASYNC_CONCURRENCY / config.DELAY
+    if async_check_func is None:
+        logger.warning("⚠️ No async check for this tool — sync checks will run in worker threads.")
+
+        # The sync check still needs a blocking session
+        return asyncio.run(engine.run_async(
+            check_func,
+            targets,
+            total=total,
+            sink=sink,
+            base_url=args.url,
+            session=Requester(),
+            **(extra_kwargs or {})
+        ))
+
+    async def _run_native():
+        async with AsyncRequester(max_connections=config.ASYNC_CONCURRENCY) as areq:
+            return await engine.run_async(
+                async_check_func,
+                targets,
+                total=total,
+                sink=sink,
+                base_url=args.url,
+                session=areq,
+                **(extra_kwargs or {})
+            )
+
+    return asyncio.run(_run_native())
+
+def run_scan(tool_name: str, check_func, args, extra_kwargs: dict = None, async_check_func=None):
     # Print Banner if not already printed by help
     # print(get_banner(tool_name)) # (Optional, argparse desc might cover it)
 
     # 1. Config Injection (Tactics Board)
     if args.threads: config.THREADS = args.threads
     if args.delay: config.DELAY = args.delay
+    if getattr(args, "rps", None): config.RPS = args.rps
+    if getattr(args, "host_rps", None): config.HOST_RPS = args.host_rps
+    if getattr(args, "burst", None): config.BURST = config.HOST_BURST = args.burst
+    if getattr(args, "cache", False): config.CACHE = True
+    if getattr(args, "adaptive", False): config.ADAPTIVE = True
+    if getattr(args, "calibrate", False): config.CALIBRATE = True
+    if getattr(args, "stream", False): config.STREAM = True
+    if getattr(args, "no_soft404", False): config.SOFT404 = False
+    if getattr(args, "max_body", None): config.STREAM_MAX_BYTES = args.max_body
     if args.h2: config.FORCE_HTTP2 = True
     if args.stop: config.STOP_ON_SUCCESS = True
+    if getattr(args, "concurrency", None): config.ASYNC_CONCURRENCY = args.concurrency
+    if getattr(args, "processes", None) is not None: config.PROCESSES = args.processes
+    if getattr(args, "metrics", None): config.METRICS_FILE = args.metrics
 
     # 2. Header Parsing
     headers = {}
@@ -78,64 +163,136 @@ def run_scan(tool_name: str, check_func, args, extra_kwargs: dict = None):
 
     # 3. Target Loading (The Scouting Report)
     targets = [""] # Default to single shot if no wordlist
-    if args.wordlist:
-        path = Path(args.wordlist).expanduser().resolve()
-        if not path.exists():
+    total = None
+    wordlists = [args.wordlist] if isinstance(args.wordlist, str) else (args.wordlist or [])
+    shard = getattr(args, "shard", None)
+    if wordlists:
+        # '#' lines are payloads here (#/admin, #<script>), as they always were
+        wordlist = Wordlist(wordlists, skip_comments=False, dedupe=getattr(args, "dedupe", False))
+        for path in wordlist.missing():
             logger.critical(f"❌ Wordlist offside: {path}")
             sys.exit(1)
-        
+
         try:
-            # Efficient reading
-            with path.open("r", encoding="utf-8", errors="ignore") as f:
-                targets = [line.strip() for line in f if line.strip()]
-            logger.info(f"📋 Loaded {len(targets)} payloads.")
+            # Streamed, not loaded: the engine pulls lines as slots free up
+            total = wordlist.count()
+            targets = wordlist
+            if shard:
+                index, count = parse_shard(shard)
+                targets = wordlist.shard(index, count)
+                if hasattr(targets, "__len__"):
+                    total = len(targets)
+                elif total is not None:
+                    total = -(-total // count)  # striped: every Nth line
+            size = f"~{total:,}" if total is not None else "a stream of"
+            logger.info(f"📋 Streaming {size} payloads.")
         except Exception as e:
             logger.critical(f"❌ Failed to read wordlist: {e}")
             sys.exit(1)
 
-    # 4. Kickoff
+    # 4. Checkpoint (every wordlist scan records progress; --resume skips what's done)
+    checkpoint = None
+    if wordlists:
+        if config.PROCESSES != 1:
+            logger.warning("⚠️ Checkpoints are single-process only — this sharded run can't be resumed.")
+        else:
+            checkpoint = CheckpointStore.for_wordlist(tool_name, args.url, wordlists,
+                                                      dedupe=getattr(args, "dedupe", False),
+                                                      shard=parse_shard(shard) if shard else None)
+            if getattr(args, "resume", False):
+                checkpoint.log_resume()
+                if total is not None:
+                    total = max(total - checkpoint.completed, 0)
+            else:
+                checkpoint.reset()
+            targets = checkpoint.pending(targets)
+            check_func = checkpoint.track(check_func)
+            if async_check_func is not None:
+                async_check_func = checkpoint.track(async_check_func)
+
+    # 5. Kickoff
     logger.info(f"🚀 Starting {tool_name} → {args.url}")
-    
-    # Initialize Persistent Requester ONCE (The Ferrari)
-    global_req = Requester()
 
-    # 🚨 CRITICAL FIX: Pass 'session' as the keyword argument if Engine expects it,
-    # or pass it as part of kwargs if Engine unpacks it.
-    # Looking at our engine.py, it likely accepts **kwargs and passes them to the task.
-    # We will pass 'session=global_req' explicitly so the task_function receives it.
-    
-    hits = engine.run(
-        task_function=check_func,
-        targets=targets,
-        
-        # KEY ARGUMENTS FOR THE TASK FUNCTION:
-        base_url=args.url,
-        session=global_req, 
-        
-        **(extra_kwargs or {})
-    )
+    # Hits are written the moment they land (core.results) — a crash at 99% keeps the first 99%.
+    # A resumed scan appends: the earlier hits are already in the file.
+    resumed = checkpoint is not None and getattr(args, "resume", False)
+    sink = open_sink(tool_name.lower().replace(" ", "_"), args.output, append=resumed)
+
+    # Only the count and a preview stay in memory; the sink has the rest
+    previous = checkpoint.previous_hits() if checkpoint else []
+    found, preview = len(previous), previous[:15]
+    try:
+        if getattr(args, "async_mode", False):
+            new_hits = _kickoff_async(check_func, async_check_func, targets, args, extra_kwargs,
+                                      total=total, sink=sink)
+            found += len(new_hits)
+            preview += new_hits[:15 - len(preview)]
+        else:
+            if config.PROCESSES != 1:
+                # Full Squad: every process builds its own Requester (sessions can't be pickled)
+                hit_stream = engine.stream_sharded(
+                    check_func,
+                    targets,
+                    total=total,
+                    sink=sink,
+                    session_factory=Requester,
+                    base_url=args.url,
+                    **(extra_kwargs or {})
+                )
+            else:
+                # Initialize Persistent Requester ONCE (The Ferrari)
+                global_req = Requester()
+
+                # 🚨 CRITICAL FIX: Pass 'session' as the keyword argument if Engine expects it,
+                # or pass it as part of kwargs if Engine unpacks it.
+                # We will pass 'session=global_req' explicitly so the task_function receives it.
+                hit_stream = engine.stream(
+                    check_func,
+                    targets,
+                    total=total,
+                    sink=sink,
+
+                    # KEY ARGUMENTS FOR THE TASK FUNCTION:
+                    base_url=args.url,
+                    session=global_req,
 
-    # 5. Victory Lap & Saving
-    if hits:
+                    **(extra_kwargs or {})
+                )
+
+            for hit in hit_stream:
+                found += 1
+                if len(preview) < 15:
+                    preview.append(hit)
+
+            if config.PROCESSES == 1:
+                global_req.log_pool_stats()
+                if global_req.cache is not None:
+                    global_req.cache.log_stats()
+    except KeyboardInterrupt:
+        logger.critical("\n🛑 Aborted. Keeping the hits we already have.")
+    finally:
+        if sink:
+            sink.close()
+        if checkpoint:
+            checkpoint.close()
+            if not checkpoint.finished:
+                logger.info(f"⏯️ Progress saved ({checkpoint.completed:,} done). Re-run with --resume to continue.")
+
+    # 6. Victory Lap (queued log lines first, so print() doesn't overtake them)
+    flush_logs()
+    if found:
         print("\n" + "═" * 60)
-        logger.info(f"🔥 FOUND {len(hits)} HITS")
+        logger.info(f"🔥 FOUND {found} HITS")
+        flush_logs()
         
         # Print first few
-        for h in hits[:15]:
+        for h in preview:
             print(f"   {h}")
-        if len(hits) > 15:
-            print(f"   ... and {len(hits)-15} more")
-            
-        # Save to file if requested
-        if args.output:
-            try:
-                out_path = Path(args.output)
-                with out_path.open('w', encoding="utf-8") as f:
-                    for h in hits:
-                        f.write(f"{h}\n")
-                logger.success(f"💾 Saved results to {out_path}")
-            except Exception as e:
-                logger.error(f"❌ Could not save file: {e}")
+        if found > len(preview):
+            print(f"   ... and {found - len(preview)} more")
+
+        if sink:
+            logger.success(f"💾 Saved results to {sink.path}")
                 
         print("═" * 60)
     else:
@@ -14,63 +14,113 @@ if str(root_path) not in sys.path:
 
 from templates.base_template import get_base_parser, run_scan
 from core import logger
+from core.signatures import match_response
+from core.config import config
+from core.soft404 import Soft404Filter
+from core.results import Hit
 
-def check(target_input: str, base_url: str, session, **kwargs) -> str | None:
+# Directory mode: signatures a catch-all page shows for ANY path aren't hits
+SOFT404 = Soft404Filter()
+
+# Signatures that settle the verdict — a streamed body is cut off as soon as one shows up
+VERDICT_SIGNATURES = {"lfi.passwd", "lfi.boot_ini", "lfi.win_ini", "rce.id_output", "sqli.error"}
+
+def build_url(target_input: str, base_url: str) -> str:
     """
-    The Attack Logic.
+    Payload placement (shared by the sync and async checks).
     """
-    # ———— 1. PAYLOAD PLACEMENT ————
     if "{PAYLOAD}" in base_url:
         # Injection Mode (e.g. ?id={PAYLOAD})
         # We generally encode here to be safe, but LFI sometimes hates encoding.
         # Let's trust the wordlist. If user wants encoded, use an encoded wordlist.
         # But to prevent crashing the URL parser, we safely quote specific chars if needed.
         # For now, let's inject RAW to allow power-user payloads like '../../'
-        url = base_url.replace("{PAYLOAD}", target_input)
-    else:
-        # Append Mode (Directory Fuzzing)
-        if not base_url.endswith("/"):
-            base_url += "/"
-        # Strip leading slash from payload to avoid double //
-        payload = target_input.lstrip("/")
-        url = f"{base_url}{payload}"
+        return base_url.replace("{PAYLOAD}", target_input)
+
+    # Append Mode (Directory Fuzzing)
+    if not base_url.endswith("/"):
+        base_url += "/"
+    # Strip leading slash from payload to avoid double //
+    payload = target_input.lstrip("/")
+    return f"{base_url}{payload}"
+
+def analyze(res, url: str, payload: str | None = None) -> Hit | None:
+    """
+    The Detection Logic. One signature pass over the raw bytes (tls_client or async responses).
+    """
+    hits = match_response(res)
+    if not hits:
+        return None
+    found = lambda text, sig: Hit(text, url=url, payload=payload, response=res, signature=sig)
+
+    # LFI (Linux)
+    if "lfi.passwd" in hits:
+         return found(f"🔥 LFI FOUND (passwd): {url}", "lfi.passwd")
+
+    # LFI (Windows)
+    if "lfi.boot_ini" in hits or "lfi.win_ini" in hits:
+         return found(f"🔥 LFI FOUND (win.ini): {url}", "lfi.boot_ini" if "lfi.boot_ini" in hits else "lfi.win_ini")
+
+    # RCE (Linux): uid= + gid= + groups=
+    if "rce.id_output" in hits:
+         return found(f"🚨 RCE CONFIRMED: {url}", "rce.id_output")
+
+    # Error Based SQLi (Bonus)
+    if "sqli.error" in hits:
+         return found(f"💉 SQLi HINT: {url}", "sqli.error")
+
+    return None
+
+def check(target_input: str, base_url: str, session, **kwargs) -> Hit | None:
+    """
+    The Attack Logic.
+    """
+    # ———— 1. PAYLOAD PLACEMENT ————
+    url = build_url(target_input, base_url)
 
     # ———— 2. FIRE ————
     try:
         # session is the Persistent Engine passed from base_template
-        res = session.get(url, allow_redirects=False)
+        if config.STREAM:
+            # Early Whistle: stop reading on a verdict or the byte cap (huge files cost 1 MB, not 200)
+            res = session.stream("GET", url, stop_on=VERDICT_SIGNATURES, allow_redirects=False)
+        else:
+            res = session.get(url, allow_redirects=False)
         
         if not res: return None
 
         # ———— 3. DETECTION ————
-        
-        # LFI (Linux)
-        if "root:x:0:0:" in res.text:
-             return f"🔥 LFI FOUND (passwd): {url}"
-        
-        # LFI (Windows)
-        if "[boot loader]" in res.text or "win.ini" in res.text:
-             return f"🔥 LFI FOUND (win.ini): {url}"
-        
-        # RCE (Linux)
-        if "uid=" in res.text and "gid=" in res.text and "groups=" in res.text:
-             return f"🚨 RCE CONFIRMED: {url}"
-
-        # Error Based SQLi (Bonus)
-        sql_errors = [
-            "You have an error in your SQL syntax",
-            "Warning: mysql_",
-            "Unclosed quotation mark",
-            "ORA-01756" 
-        ]
-        if any(err in res.text for err in sql_errors):
-             return f"💉 SQLi HINT: {url}"
+        hit = analyze(res, url, target_input)
+        if hit and config.SOFT404 and "{PAYLOAD}" not in base_url:
+            probe = lambda p: session.get(build_url(p, base_url), allow_redirects=False)
+            if SOFT404.is_soft404(res, target_input, probe):
+                return None
+        return hit
 
     except Exception:
         pass
     
     return None
 
+async def check_async(target_input: str, base_url: str, session, **kwargs) -> Hit | None:
+    """
+    The Attack Logic — Counter-Press edition (session is an AsyncRequester).
+    """
+    url = build_url(target_input, base_url)
+    try:
+        res = await session.get(url, allow_redirects=False)
+        if res is None: return None
+        hit = analyze(res, url, target_input)
+        if hit and config.SOFT404 and "{PAYLOAD}" not in base_url:
+            probe = lambda p: session.get(build_url(p, base_url), allow_redirects=False)
+            if await SOFT404.is_soft404_async(res, target_input, probe):
+                return None
+        return hit
+    except Exception:
+        pass
+
+    return None
+
 def main():
     parser = get_base_parser("FUZZER")
     args = parser.parse_args()
@@ -80,7 +130,7 @@ def main():
          logger.critical("❌ Fuzzer requires a payload wordlist (-w)!")
          sys.exit(1)
 
-    run_scan("FUZZER", check, args)
+    run_scan("FUZZER", check, args, async_check_func=check_async)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -6,15 +6,52 @@ Run with: pytest tests/test_core.py -v
 """
 import sys
 import os
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import pickle
+import socket
+import subprocess
+import threading
+import time
 import pytest
+from itertools import islice
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
+from urllib.parse import urljoin, urlparse
 
 # ———— PATH HACK ————
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
 
 from core.config import config
-from core.requester import Requester
-from core.engine import engine
+from core.requester import AsyncRequester, Requester, SessionPool, StreamedResponse, _protocol
+from core.engine import engine, AdaptiveController
+import core.signatures as signatures_mod
+from core.cache import ResponseCache
+from core.checkpoint import CheckpointStore
+from core.cli import discover
+from core.crawler import Crawler, normalize_url
+from core.links import LinkExtractor, extract, resolve
+from core.logger import StatusSummary, ArsenalFormatter, flush_logs
+from core.metrics import LatencyHistogram, Metrics, is_timeout, metrics
+from core.race import RaceWindow, race
+from core.ratelimit import TokenBucket, RateLimiter, effective_rps, get_limiter
+from core.resilience import (BLOCK, CLOSED, ERROR, HALF_OPEN, OK, OPEN, CircuitBreaker, RetryBudget,
+                             backoff_delay, get_breakers, is_block)
+from core.results import FIELDS, Hit, ResultSink, to_record
+from core.signatures import Signature, SignatureSet, get_signatures, match_response
+from core.soft404 import Soft404Filter, simhash
+from core.wordlist import SeenHashes, Wordlist, WordlistPack, compile_pack, parse_shard
+from modules.access_control import guesser
+from modules.access_control.detector import (CandidateIndex, detect_id_parameters, detect_id_routes,
+                                             is_in_scope, route_key)
+from modules.access_control.guesser import iter_id_payloads, generate_id_payloads
+from modules.access_control.tester import Identity, check_id, json_shape, parse_identities, run_idor, shape_of
+from benchmarks.suite import compare
+from benchmarks.target import LocalTarget, WALLET_GAP
+from templates.base_template import get_base_parser, run_scan
 
 # ———— 1. CONFIG TESTS (The Brain) ————
 def test_config_is_mutable():
@@ -48,7 +85,8 @@ def test_requester_initialization(mock_tls_session):
     # 2. Assert the Session was created with the right disguise
     mock_tls_session.assert_called_with(
         client_identifier="chrome_120",
-        random_tls_extension_order=True
+        random_tls_extension_order=True,
+        force_http1=not (config.FORCE_HTTP2 or config.AUTO_HTTP2_CLOUDFLARE)
     )
     # Check that our session attribute is actually the mock
     assert req.session == mock_tls_session.return_value
@@ -127,4 +165,1324 @@ def test_engine_golden_goal():
     assert len(results) < 100 
     
     # Reset config
-    config.STOP_ON_SUCCESS = False
\ No newline at end of file
+    config.STOP_ON_SUCCESS = False
+
+# ———— 4. ASYNC ENGINE TESTS (The Counter-Press) ————
+
+async def async_dummy_task(target, **kwargs):
+    await asyncio.sleep(0)
+    return f"Hit: {target}" if target != "miss" else None
+
+def test_engine_async_runs_coroutines():
+    """run_async awaits coroutine tasks and keeps the same result contract."""
+    results = asyncio.run(engine.run_async(
+        async_dummy_task, ["A", "miss", "B"], session=None, desc="Async Test"
+    ))
+    assert sorted(results) == ["Hit: A", "Hit: B"]
+
+def test_engine_async_accepts_sync_tasks():
+    """Plain (sync) task functions still work — they go to worker threads."""
+    results = asyncio.run(engine.run_async(dummy_task, ["A", "B"], session=None))
+    assert sorted(results) == ["Hit: A", "Hit: B"]
+
+def test_engine_async_respects_concurrency():
+    """No more than `concurrency` tasks are ever in flight."""
+    in_flight = 0
+    peak = 0
+
+    async def tracked(t, **kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.001)
+        in_flight -= 1
+        return None
+
+    asyncio.run(engine.run_async(tracked, range(50), concurrency=5))
+    assert 1 <= peak <= 5
+
+def test_engine_async_golden_goal():
+    """STOP_ON_SUCCESS cancels the rest of the async match."""
+    config.STOP_ON_SUCCESS = True
+    try:
+        async def scoring_task(t, **kwargs):
+            await asyncio.sleep(0.001)
+            return "GOAL"
+
+        results = asyncio.run(engine.run_async(scoring_task, range(1000), concurrency=10))
+        assert 1 <= len(results) < 1000
+    finally:
+        config.STOP_ON_SUCCESS = False
+
+
+def test_async_requester_takes_cookies_before_the_loop_starts():
+    """Sync setup code sets cookies; the session (and the jar) is only built once run_async is on the loop."""
+    req = AsyncRequester()
+    req.update_cookies({"sid": "a1"})
+    assert req.session is None
+
+    async def jar(target, **kwargs):
+        client = req._client()
+        if req.backend == "aiohttp":
+            return {m.key: m.value for m in client.cookie_jar}
+        return dict(client.cookies)
+
+    async def match():
+        try:
+            return await engine.run_async(jar, ["A"])
+        finally:
+            await req.aclose()
+    assert asyncio.run(match()) == [{"sid": "a1"}]
+
+# ———— 5. STREAMING ENGINE TESTS (The Conveyor Belt) ————
+
+def test_engine_stream_is_lazy_and_bounded():
+    """Targets are pulled only as slots free up — never more than `window` ahead."""
+    pulled = 0
+    done = 0
+    peak_ahead = 0
+    lock = threading.Lock()
+
+    def source():
+        nonlocal pulled, peak_ahead
+        for i in range(500):
+            pulled += 1
+            with lock:
+                peak_ahead = max(peak_ahead, pulled - done)
+            yield i
+
+    def task(t, **kwargs):
+        nonlocal done
+        with lock:
+            done += 1
+        return t if t % 100 == 0 else None
+
+    hits = list(engine.stream(task, source(), window=8))
+    assert sorted(hits) == [100, 200, 300, 400]  # 0 is falsy → not a hit
+    assert pulled == 500
+    assert peak_ahead <= 8 + 1
+
+def test_engine_stream_yields_before_finishing():
+    """A consumer can walk away after the first hit; the rest is never pulled."""
+    pulled = 0
+
+    def source():
+        nonlocal pulled
+        for i in range(10_000):
+            pulled += 1
+            yield i
+
+    gen = engine.stream(lambda t, **kw: f"hit {t}", source(), window=4)
+    first = next(gen)
+    gen.close()
+    assert first.startswith("hit")
+    assert pulled < 10_000
+
+def test_engine_run_accepts_generators():
+    """run() no longer needs len(): generators + a size hint work."""
+    results = engine.run(dummy_task, (c for c in "XYZ"), total=3)
+    assert sorted(results) == ["Hit: X", "Hit: Y", "Hit: Z"]
+
+
+# ———— 6. SHARDED ENGINE TESTS (The Full Squad) ————
+def shard_task(target, **kwargs):
+    """Module-level so spawned workers can unpickle it."""
+    return f"Hit: {target}" if target % 50 == 0 else None
+
+def shard_goal(target, **kwargs):
+    return "GOAL"
+
+def test_engine_sharded_merges_hits():
+    """Hits from every process are merged back into the parent."""
+    results = engine.run_sharded(shard_task, range(1, 501), processes=2)
+    assert sorted(results) == sorted(f"Hit: {i}" for i in range(50, 501, 50))
+
+def shard_measured(target, **kwargs):
+    metrics.record(f"http://shard.test/{target}", 0.002 * (1 + target % 5), 200 if target % 4 else 404)
+    return None
+
+def test_engine_sharded_merges_worker_metrics():
+    """Each worker's registry comes home, so the match report covers every process."""
+    metrics.reset()
+    engine.run_sharded(shard_measured, range(400), processes=2)
+    data = metrics.to_dict()
+    assert data["requests"] == 400 and data["statuses"] == {"200": 300, "404": 100}
+    assert data["hosts"]["shard.test"]["requests"] == 400
+    assert data["latency"]["total"]["count"] == 400
+    metrics.reset()
+
+def test_engine_sharded_golden_goal():
+    """STOP_ON_SUCCESS propagates across processes."""
+    config.STOP_ON_SUCCESS = True
+    try:
+        results = engine.run_sharded(shard_goal, range(100_000), processes=2)
+        assert len(results) == 1
+    finally:
+        config.STOP_ON_SUCCESS = False
+
+
+# ———— 7. SESSION POOL TESTS (The Squad Rotation) ————
+
+def test_session_pool_grows_to_limit_and_reuses():
+    """Concurrent checkouts get distinct sessions, capped at the pool size."""
+    created = []
+    pool = SessionPool(lambda: created.append(object()) or created[-1], size=3)
+    barrier = threading.Barrier(3)
+    seen = set()
+
+    def worker():
+        with pool.checkout() as s:
+            seen.add(id(s))
+            barrier.wait(timeout=2)
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+
+    assert len(seen) == 3
+    # Sequential checkouts reuse the warm sessions (no growth past the limit)
+    for _ in range(10):
+        with pool.checkout():
+            pass
+    stats = pool.stats()
+    assert stats["size"] == 3
+    assert stats["peak_in_use"] == 3
+    assert stats["checkouts"] == 13
+    assert stats["utilisation"] == 1.0
+
+@patch("core.requester.tls_client.Session")
+def test_requester_cookies_reach_every_session(mock_tls_session):
+    """update_cookies applies to pooled sessions, including ones built later."""
+    mock_tls_session.side_effect = lambda **kw: MagicMock()
+    req = Requester(pool_size=2)
+    req.update_cookies({"sid": "abc"})
+
+    with req.pool.checkout() as first, req.pool.checkout() as second:
+        assert first is not second
+        second.cookies.update.assert_called_with({"sid": "abc"})
+    req.session.cookies.update.assert_called_with({"sid": "abc"})
+
+
+# ———— 8. RATE LIMITER TESTS (The Referee) ————
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+    def __call__(self):
+        return self.now
+
+def test_token_bucket_spaces_requests_exactly():
+    """10 rps, burst 1 → every booking is 0.1s after the previous one."""
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, burst=1, clock=clock)
+    waits = [bucket.reserve() for _ in range(5)]
+    assert waits == pytest.approx([0.0, 0.1, 0.2, 0.3, 0.4])
+
+def test_token_bucket_burst_then_refill():
+    """Burst lets N go at once; after an idle spell the bucket refills (but never beyond burst)."""
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, burst=3, clock=clock)
+    assert [bucket.reserve() for _ in range(4)] == pytest.approx([0.0, 0.0, 0.0, 0.1])
+    clock.now += 10  # long idle → full bucket again, still capped at 3
+    assert [bucket.reserve() for _ in range(4)] == pytest.approx([0.0, 0.0, 0.0, 0.1])
+
+def test_rate_limiter_per_host_buckets_are_independent():
+    limiter = RateLimiter(rps=0, host_rps=1)
+    assert limiter.reserve("http://a.example/x") == 0.0
+    assert limiter.reserve("http://b.example/x") == 0.0   # different host → own bucket
+    assert limiter.reserve("http://a.example/y") > 0.5
+
+def test_effective_rps_from_config():
+    """RPS wins; otherwise DELAY is enforced as THREADS / DELAY."""
+    original = (config.RPS, config.DELAY, config.THREADS)
+    try:
+        config.RPS, config.DELAY, config.THREADS = 0.0, 0.5, 10
+        assert effective_rps(config) == 20
+        assert get_limiter().rps == 20   # rebuilt from the new tactics
+        config.RPS = 7.0
+        assert effective_rps(config) == 7.0
+        config.RPS, config.DELAY = 0.0, 0.0
+        assert not get_limiter().active
+    finally:
+        config.RPS, config.DELAY, config.THREADS = original
+
+
+# ———— 9. ADAPTIVE CONCURRENCY TESTS (The Gaffer) ————
+
+def test_adaptive_grows_additively_and_cuts_multiplicatively():
+    ctl = AdaptiveController(min_limit=1, max_limit=32, start=8, window=10)
+    for _ in range(30):                      # 3 healthy windows → +3
+        ctl.observe(0.05, 200)
+    assert ctl.current == 11
+
+    for _ in range(ctl.current):             # a window full of 429s → halve
+        ctl.observe(0.05, 429)
+    assert ctl.current == 5
+    assert ctl.decreases == 1
+
+def test_adaptive_cuts_on_latency_spike_and_respects_floor():
+    ctl = AdaptiveController(min_limit=2, max_limit=32, start=4, window=10)
+    for _ in range(10):
+        ctl.observe(0.05, 200)               # baseline ≈ 50ms
+    for _ in range(10):
+        ctl.observe(0.50, 200)               # 10× slower → spike
+    assert ctl.current == 2
+    for _ in range(10):
+        ctl.observe(0.50, None)              # transport errors can't go below the floor
+    assert ctl.current == 2
+
+def test_adaptive_calibration_finds_the_knee():
+    """Throughput doubles up to 8 in-flight, then flattens → knee = 8."""
+    clock = FakeClock()
+    ctl = AdaptiveController(min_limit=1, max_limit=64, window=8, calibrate=True, clock=clock)
+    while ctl.calibrating:
+        level = ctl.current
+        rps = min(level, 8) * 100.0          # the server saturates at 8
+        clock.now += 1.0 / rps
+        ctl.observe(0.01, 200)
+    assert ctl.current == 8
+
+def test_engine_stream_obeys_adaptive_limit():
+    """With a controller attached, in-flight work never exceeds its current limit."""
+    ctl = AdaptiveController(min_limit=3, max_limit=3)
+    in_flight = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def task(t, **kwargs):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.002)
+        with lock:
+            in_flight -= 1
+        return None
+
+    original = config.THREADS
+    config.THREADS = 10
+    try:
+        list(engine.stream(task, range(60), adaptive=ctl))
+    finally:
+        config.THREADS = original
+    assert peak <= 3
+
+
+# ———— 10. RESPONSE CACHE TESTS (The Kit Man) ————
+
+def _fake_response(status=200, body=b"x"):
+    res = MagicMock()
+    res.status_code = status
+    res.content = body
+    return res
+
+def test_cache_lru_and_ttl_eviction():
+    clock = FakeClock()
+    cache = ResponseCache(max_entries=2, ttl=10, clock=clock)
+    for k in ("a", "b", "c"):
+        cache.put(k, _fake_response())
+    assert cache.get("a") is None            # LRU: oldest out
+    assert cache.get("c") is not None
+    clock.now += 11
+    assert cache.get("c") is None            # TTL expired
+    assert cache.evictions == 1
+
+def test_cache_byte_budget():
+    cache = ResponseCache(max_entries=100, max_bytes=10)
+    cache.put("a", _fake_response(body=b"123456"))
+    cache.put("b", _fake_response(body=b"123456"))
+    assert cache.get("a") is None and cache.get("b") is not None
+
+def test_cache_singleflight_coalesces_identical_calls():
+    """8 threads ask for the same page at once → one real fetch."""
+    cache = ResponseCache()
+    calls = 0
+    gate = threading.Event()
+
+    def loader():
+        nonlocal calls
+        calls += 1
+        gate.wait(timeout=2)
+        return _fake_response()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.fetch("k", loader))) for _ in range(8)]
+    for t in threads: t.start()
+    time.sleep(0.05)
+    gate.set()
+    for t in threads: t.join()
+
+    assert calls == 1
+    assert len(results) == 8 and len({id(r) for r in results}) == 1
+    assert cache.misses == 1 and cache.coalesced == 7
+
+def test_cache_skips_throttled_responses():
+    cache = ResponseCache()
+    cache.fetch("k", lambda: _fake_response(status=429))
+    assert cache.get("k") is None
+
+@patch("core.requester.tls_client.Session")
+def test_requester_cache_opt_in(mock_session_cls):
+    """With cache=True a repeated GET hits the wire once; POSTs always go out."""
+    mock_instance = mock_session_cls.return_value
+    mock_instance.execute_request.return_value = _fake_response()
+    req = Requester(cache=True)
+
+    req.get("https://example.com/a")
+    req.get("https://example.com/a")
+    req.get("https://example.com/a", headers={"Authorization": "Bearer other"})
+    req.post("https://example.com/a")
+    req.post("https://example.com/a")
+
+    assert mock_instance.execute_request.call_count == 4
+    assert req.cache.hits == 1
+
+
+# ———— 11. CHECKPOINT TESTS (The Replay) ————
+
+def test_checkpoint_watermark_survives_out_of_order_completion(tmp_path):
+    store = CheckpointStore("fuzzer", "http://t/{PAYLOAD}", "wl", directory=tmp_path, batch=2)
+    for idx in (0, 2, 3, 5):
+        store.mark_done(idx, f"hit-{idx}" if idx == 3 else None)
+    assert store.watermark == 1 and store.completed == 4
+    store.close()
+
+    reopened = CheckpointStore("fuzzer", "http://t/{PAYLOAD}", "wl", directory=tmp_path)
+    assert [i for i, _ in reopened.pending(["a"] * 7)] == [1, 4, 6]
+    assert reopened.previous_hits() == ["hit-3"]
+    reopened.close()
+
+def test_checkpoint_resume_through_engine(tmp_path):
+    """An interrupted run leaves progress; the resumed run only fires what's left, then cleans up."""
+    seen = []
+    def task(target, **kwargs):
+        seen.append(target)
+        return f"hit-{target}" if target % 5 == 0 else None
+
+    store = CheckpointStore("fuzzer", "http://t", "wl", directory=tmp_path)
+    stream = engine.stream(store.track(task), store.pending(range(20)), window=1, progress=False)
+    for _ in range(2):
+        next(stream)   # two hits, then "Ctrl-C"
+    stream.close()
+    store.close()
+    assert not store.finished and store.path.exists()
+
+    seen.clear()
+    store = CheckpointStore("fuzzer", "http://t", "wl", directory=tmp_path)
+    hits = store.previous_hits() + engine.run(store.track(task), list(store.pending(range(20))))
+    store.close()
+
+    assert sorted(hits) == ["hit-0", "hit-10", "hit-15", "hit-5"]
+    assert 0 not in seen and 5 not in seen and 19 in seen
+    assert store.finished and not store.path.exists()
+
+
+def test_checkpoint_key_covers_dedupe_and_shard(tmp_path):
+    wl = tmp_path / "words.txt"
+    wl.write_text("a\nb\na\n")
+    def key(**kw):
+        store = CheckpointStore.for_wordlist("fuzzer", "http://t", str(wl), directory=tmp_path, **kw)
+        store.close()
+        return store.key
+    keys = {key(), key(dedupe=True), key(shard=(0, 2)), key(shard=(1, 2)), key(dedupe=True, shard=(0, 2))}
+    assert len(keys) == 5
+    assert key(shard=(1, 2)) == key(shard=(1, 2))
+
+def test_checkpoint_reset_forgets_progress(tmp_path):
+    store = CheckpointStore("fuzzer", "http://t", "wl", directory=tmp_path)
+    store.mark_done(0, "hit")
+    store.reset()
+    assert store.completed == 0 and store.previous_hits() == []
+    store.close()
+
+def test_checkpoint_flush_stays_incremental_behind_a_stuck_index(tmp_path):
+    """Index 0 never lands, so 150k completions pile up above the watermark; each flush writes only its batch."""
+    store = CheckpointStore("fuzzer", "http://t", "wl", directory=tmp_path, batch=1000, interval=3600)
+    start = time.perf_counter()
+    for idx in range(1, 150_001):
+        store.mark_done(idx)
+    store.flush()
+    assert store._db.total_changes <= 150_000 + 200        # One row per completion, not one per completion per flush
+    assert time.perf_counter() - start < 10
+    assert store.watermark == 0 and store.completed == 150_000
+
+    store.mark_done(0)                                      # The straggler lands: one range DELETE clears the lot
+    store.close()
+    reopened = CheckpointStore("fuzzer", "http://t", "wl", directory=tmp_path)
+    assert reopened.watermark == 150_001 and not reopened._above
+    reopened.close()
+
+
+# ———— 12. WORDLIST TESTS (The Scout) ————
+
+def test_wordlist_chains_files_filters_comments_and_dedupes(tmp_path):
+    plain = tmp_path / "a.txt"
+    plain.write_text("# header\nadmin\n\nlogin\r\nadmin\n")
+    packed = tmp_path / "b.txt.gz"
+    with gzip.open(packed, "wt") as f:
+        f.write("login\nbackup\n")
+
+    assert list(Wordlist([plain, packed])) == ["admin", "login", "admin", "login", "backup"]
+    assert list(Wordlist([plain, packed], dedupe=True)) == ["admin", "login", "backup"]
+    assert list(Wordlist(plain, skip_comments=False))[0] == "# header"
+    assert Wordlist(plain).count() == 5 and Wordlist([plain, packed]).count() is None
+
+
+def test_seen_hashes_is_an_exact_packed_set():
+    seen, reference = SeenHashes(capacity=16), set()
+    for n in range(50_000):
+        h = hash(f"word{n % 30_000}") if n % 7 else -n    # Negative hashes wrap to 64 bits
+        assert seen.add(h) == (h not in reference)
+        reference.add(h)
+    assert seen.count == len(reference)
+    assert seen.nbytes <= 32 * seen.count                 # ≤ 32 bytes per unique (a set of ints: ~70)
+
+def test_wordlist_pack_indexes_and_shards(tmp_path):
+    src = tmp_path / "words.txt"
+    src.write_text("\n".join(f"w{i % 7}" for i in range(20)) + "\n")
+    out = tmp_path / "words.awl"
+
+    assert compile_pack(src, out) == 7
+    with WordlistPack(out) as pack:
+        assert len(pack) == 7 and pack[0] == "w0" and pack[-1] == "w6"
+        assert list(pack[2:4]) == ["w2", "w3"]
+        shards = [list(pack.shard(k, 3)) for k in range(3)]
+        assert sum(shards, []) == list(pack) and [len(s) for s in shards] == [2, 2, 3]
+    assert list(Wordlist(out).shard(*parse_shard("1/3"))) == ["w0", "w1"]
+
+def test_run_scan_keeps_hash_lines_as_payloads(tmp_path, monkeypatch):
+    """Fuzzer wordlists are payloads, not config: '#/admin' and '#<script>' still go out, as they always did."""
+    for name in ("THREADS", "BURST", "HOST_BURST", "CUSTOM_HEADERS", "STREAM_MAX_BYTES"):
+        monkeypatch.setattr(config, name, getattr(config, name))
+    monkeypatch.setattr(config, "CHECKPOINT_DIR", str(tmp_path / "ckpt"))
+    wl = tmp_path / "payloads.txt"
+    wl.write_text("#/admin\nlogin\n#<script>\n")
+    sent = []
+    args = get_base_parser("unit").parse_args(["-u", "http://t/{PAYLOAD}", "-w", str(wl)])
+    run_scan("unit", lambda payload, **kw: sent.append(payload), args)
+    assert sorted(sent) == ["#/admin", "#<script>", "login"]
+
+
+# ———— 13. SIGNATURE TESTS (The VAR) ————
+
+def _sigs():
+    return SignatureSet([
+        Signature("rce", (b"uid=", b"gid="), require_all=True),
+        Signature("prefix", (b"GET /",)),
+        Signature("longer", (b"GET /admin",)),
+        Signature("html", (b"<html",), ignore_case=True),
+    ])
+
+@pytest.mark.parametrize("use_automaton", [True, False])
+def test_signature_set_matches_overlaps_all_and_case(monkeypatch, use_automaton):
+    if use_automaton and not signatures_mod.HAS_AHOCORASICK:
+        pytest.skip("pyahocorasick not installed")
+    monkeypatch.setattr(signatures_mod, "HAS_AHOCORASICK", use_automaton)
+    sigs = _sigs()
+
+    assert sigs.match(b"<HTML>GET /admin uid=0") == {"prefix", "longer", "html"}
+    assert sigs.match(b"uid=0(root) gid=0(root)") == {"rce"}
+    assert sigs.match("") == set() and sigs.match(b"nothing here") == set()
+
+def test_bundled_signatures_load_from_data_files():
+    sigs = get_signatures()
+    assert {"lfi.passwd", "rce.id_output", "sqli.error", "api.docs"} <= set(sigs._signatures)
+    assert sigs.match(b"root:x:0:0:root:/root:/bin/bash") == {"lfi.passwd"}
+
+def test_signature_set_load_json(tmp_path):
+    extra = tmp_path / "team.json"
+    extra.write_text('[{"id": "team.flag", "patterns": ["FLAG{"]}]')
+    sigs = _sigs()
+    assert sigs.load(extra) == 1
+    assert "team.flag" in sigs.match(b"...FLAG{pwn}...")
+
+
+# ———— 14. STREAMED BODY TESTS (The Early Whistle) ————
+
+class FakeRaw:
+    """Just enough of a urllib3 HTTPResponse."""
+    def __init__(self, chunks, status=200):
+        self.chunks, self.status, self.url = chunks, status, "http://t/x"
+        self.headers = {"content-type": "text/plain; charset=utf-8"}
+        self.pulled = 0
+        self.closed = self.released = False
+
+    def stream(self, amt, decode_content=True):
+        for chunk in self.chunks:
+            self.pulled += 1
+            yield chunk
+
+    def close(self):
+        self.closed = True
+
+    def release_conn(self):
+        self.released = True
+
+def test_stream_scanner_catches_a_hit_split_across_chunks():
+    scanner = SignatureSet([Signature("passwd", (b"root:x:0:0:",))]).scanner()
+    assert scanner.feed(b"....root:x") == set()
+    assert scanner.feed(b":0:0:root") == {"passwd"}
+    assert scanner.feed(b"root:x:0:0:") == set()   # already reported
+    assert scanner.matched == {"passwd"}
+
+def test_streamed_response_hangs_up_on_signature():
+    sigs = SignatureSet([Signature("passwd", (b"root:x:0:0:",)), Signature("noise", (b"GET",))])
+    raw = FakeRaw([b"GET a", b"b" * 10, b"root:x:0:0:", b"never read"])
+
+    res = StreamedResponse.consume(raw, "http://t/x", sigs.scanner(), {"passwd"}, 1 << 20, keep=8)
+
+    assert res.stopped_by == "signature" and raw.pulled == 3 and raw.closed and raw.released
+    assert res.signatures == {"passwd", "noise"} and match_response(res) == {"passwd", "noise"}
+    assert res.content == b"GET abbb" and res.bytes_read == 26
+    assert res.digest == hashlib.sha256(b"GET a" + b"b" * 10 + b"root:x:0:0:").hexdigest()
+
+def test_streamed_response_byte_cap():
+    raw = FakeRaw([b"x" * 10] * 5)
+    res = StreamedResponse.consume(raw, "http://t/x", SignatureSet().scanner(), None, 25, keep=100)
+    assert res.stopped_by == "cap" and res.bytes_read == 25 and len(res.content) == 25 and raw.pulled == 3
+
+    raw = FakeRaw([b"short"])
+    res = StreamedResponse.consume(raw, "http://t/x", SignatureSet().scanner(), None, 25, keep=100)
+    assert not res.truncated and res.text == "short" and not raw.closed and raw.released
+
+
+# ———— 15. SOFT-404 TESTS (The Linesman) ————
+
+class Page:
+    def __init__(self, status, body):
+        self.status_code, self.content = status, body
+
+CATCH_ALL = b"<html><body><h1>Welcome to ShopCo</h1><p>Sorry, we could not find %s. Try our bestsellers.</p></body></html>"
+
+def test_simhash_near_duplicates_are_close():
+    page = b" ".join(b"word%d" % i for i in range(200)) + b" rendered at %s"
+    a = simhash(page % b"1699999999")
+    b = simhash(page % b"1700000042")
+    c = simhash(b'{"users": [{"id": 1, "email": "a@b.c", "role": "admin", "active": true}]}')
+    assert (a ^ b).bit_count() <= 6 < (a ^ c).bit_count()
+
+def test_soft404_filters_catch_all_but_keeps_real_pages():
+    probes = []
+    def fetch(path):
+        probes.append(path)
+        return Page(200, CATCH_ALL % path.encode())
+
+    f = Soft404Filter(samples=3)
+    assert f.scope("/api/v1/users.json?x=1") == ("api/v1/", ".json")
+    assert f.is_soft404(Page(200, CATCH_ALL % b"api/v1/admin.json"), "api/v1/admin.json", fetch)
+    assert not f.is_soft404(Page(200, b'{"users": [{"id": 1}, {"id": 2}]}'), "api/v1/users.json", fetch)
+    assert not f.is_soft404(Page(403, CATCH_ALL % b"api/v1/x.json"), "api/v1/x.json", fetch)
+
+    # One calibration per scope, random paths inside it
+    assert len(probes) == 3 and all(p.startswith("api/v1/") and p.endswith(".json") for p in probes)
+    f.is_soft404(Page(200, b"x"), "other/page", fetch)
+    assert len(probes) == 6 and f.filtered == 1
+
+def test_soft404_async_calibration_runs_once():
+    calls = []
+    async def fetch(path):
+        calls.append(path)
+        await asyncio.sleep(0.01)
+        return Page(200, CATCH_ALL % path.encode())
+
+    async def main():
+        f = Soft404Filter(samples=2)
+        return await asyncio.gather(*(f.is_soft404_async(Page(200, CATCH_ALL % f"d/{i}".encode()), f"d/{i}", fetch)
+                                      for i in range(5)))
+
+    assert asyncio.run(main()) == [True] * 5 and len(calls) == 2
+
+
+# ———— 16. LOGGING TESTS (The Commentary Box) ————
+
+def test_status_summary_folds_per_request_lines():
+    now = [0.0]
+    summary = StatusSummary(interval=5, clock=lambda: now[0])
+    with patch("core.logger.logger") as log:
+        for status in (200, 200, 404):
+            summary.record("GET", "http://t/x", status)
+        assert not log.info.called
+
+        now[0] = 5.0
+        summary.record("GET", "http://t/y", 200)
+        line = log.info.call_args[0][0]
+        assert "4 responses" in line and "200×3" in line and "404×1" in line
+
+        summary.record("GET", "http://t/z", 429, waf=True)
+        summary.record("GET", "http://t/z", 429, waf=True)
+        assert log.critical.call_count == 1          # first block only
+        summary.flush()
+        assert "429×2" in log.warning.call_args[0][0]
+
+def test_status_summary_interval_zero_logs_every_line():
+    summary = StatusSummary(interval=0)
+    with patch("core.logger.logger") as log:
+        summary.record("GET", "http://t/a", 200)
+        summary.record("GET", "http://t/b", 503)
+    assert log.info.call_count == 1 and log.warning.call_count == 1
+
+def test_formatter_cached_per_level_and_queue_drains():
+    fmt = ArsenalFormatter()
+    record = logging.LogRecord("t", logging.INFO, __file__, 1, "hello", None, None)
+    assert "hello" in fmt.format(record) and fmt.format(record)
+    assert len(fmt._formatters) == 1
+    flush_logs()   # returns once the background writer has caught up
+
+
+# ———— 17. METRICS TESTS (The Analyst) ————
+
+def test_latency_histogram_percentiles_within_hdr_error():
+    hist = LatencyHistogram()
+    for ms in range(1, 1001):
+        hist.record(ms / 1000)
+    assert hist.count == 1000 and hist.max == 1.0
+    for q, expected in ((50, 0.5), (90, 0.9), (99, 0.99)):
+        assert abs(hist.percentile(q) - expected) / expected < 0.035
+    assert hist.cumulative([0.1, 0.5, 10.0])[-1] == 1000
+
+def test_metrics_registry_counts_and_exports(tmp_path):
+    m = Metrics()
+    m.record("http://a.test/x", 0.010, 200, sent=100, received=2048, protocol="h2", phases={"ttfb": 0.008})
+    m.record("http://a.test/y", 0.020, 404, attempt=1, sent=100, received=10)
+    m.record("http://b.test/z", 5.0, None, error=TimeoutError("read timed out"), sent=100)
+
+    data = m.to_dict()
+    assert (data["requests"], data["retries"], data["timeouts"], data["errors"]) == (3, 1, 1, 1)
+    assert data["bytes_in"] == 2058 and data["bytes_out"] == 300 and data["protocols"] == {"h2": 1}
+    assert data["hosts"]["a.test"]["statuses"] == {"200": 1, "404": 1}
+    assert data["latency"]["ttfb"]["count"] == 1
+
+    prom = m.to_prometheus()
+    assert 'arsenal_requests_total{host="b.test",status="error"} 1' in prom
+    assert 'arsenal_request_duration_seconds_bucket{phase="total",le="+Inf"} 3' in prom
+    assert m.export(tmp_path / "run.json").read_text().startswith("{")
+    assert any("a.test" in line for line in m.table())
+
+def test_protocol_and_timeout_classification():
+    assert _protocol(11) == "h1" and _protocol("HTTP/2") == "h2" and _protocol(None) is None
+    assert is_timeout(Exception("Client.Timeout exceeded while awaiting headers"))
+    assert not is_timeout(ConnectionRefusedError("refused"))
+
+def test_each_run_reports_only_its_own_requests(monkeypatch):
+    """Crawl then scan in one process: the second table must not carry the first run's numbers."""
+    monkeypatch.setattr(config, "METRICS", True)
+    tables = []
+    monkeypatch.setattr(metrics, "log_summary", lambda export_to=None: tables.append(metrics.to_dict()))
+
+    def hit_the_wire(n, host):
+        metrics.record(f"http://{host}/{n}", 0.01, 200)
+    engine.run(hit_the_wire, range(30), host="crawl.test")
+    asyncio.run(engine.run_async(hit_the_wire, range(5), host="scan.test"))
+
+    assert [t["requests"] for t in tables] == [30, 5]
+    assert list(tables[1]["hosts"]) == ["scan.test"]
+
+
+# ———— 18. BENCHMARK SUITE TESTS (The Fitness Test) ————
+
+def test_benchmark_compare_flags_regressions_by_direction():
+    def report(rps, p99):
+        return {"meta": {}, "results": [{"name": "engine", "params": {"threads": 10, "size": 1000},
+                                         "metrics": {"rps": rps, "p99_ms": p99}}]}
+    rows = {r["metric"]: r for r in compare(report(1000, 20), report(850, 19), threshold=10)}
+    assert rows["rps"]["regression"] and round(rows["rps"]["change_pct"]) == -15
+    assert not rows["p99_ms"]["regression"]          # lower latency is an improvement
+    assert compare(report(1000, 20), {"meta": {}, "results": []}) == []
+
+
+# ———— 19. STARTUP TESTS (The Warm-Up) ————
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_BUDGET_US = 150_000   # `import core`, cumulative, generous for slow CI boxes
+
+def _importtime(code: str) -> tuple:
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT,
+                          capture_output=True, text=True, timeout=60)
+    assert proc.returncode == 0, proc.stderr
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line and "cumulative" not in line:
+            _, cumulative, name = line.split("|")
+            modules[name.strip()] = int(cumulative)
+    return modules, proc.stdout
+
+def test_import_core_is_lazy_and_within_budget():
+    modules, stdout = _importtime("import core")
+    assert modules["core"] < IMPORT_BUDGET_US, f"import core took {modules['core'] / 1000:.0f} ms"
+    # No client libraries, no Requester, nothing printed
+    assert not {"core.requester", "tls_client", "aiohttp", "httpx", "urllib3"} & modules.keys()
+    assert stdout == ""
+
+def test_cli_lists_tools_without_importing_them():
+    modules, stdout = _importtime("from core.cli import main; main(['list'])")
+    assert "fuzzer" in stdout and "api_scanner" in stdout and "probe" in stdout
+    assert not any(m.startswith(("templates", "modules", "core.requester")) for m in modules)
+
+def test_cli_summary_joins_a_wrapped_purpose(tmp_path):
+    tools = tmp_path / "modules" / "x"
+    tools.mkdir(parents=True)
+    (tmp_path / "templates").mkdir()
+    main = "\nif __name__ == '__main__':\n    parser.parse_args()\n"
+    (tools / "racer.py").write_text(
+        '"""\nModule: racer.py\nPurpose: Race tester — N copies of one request, armed on pre-opened\n'
+        '         connections and released together (core.race).\n         Replaces h2_attack.py.\n"""' + main)
+    (tools / "striker.py").write_text(
+        "# Module: striker.py\n# Purpose: SSRF striker — fires cloud-metadata\n#          payloads at a URL\n"
+        "# Author: Sanchez\n" + main)
+    found = discover(tmp_path)
+    assert found["racer"].summary == ("Race tester — N copies of one request, armed on pre-opened "
+                                      "connections and released together (core.race).")
+    assert found["striker"].summary == "SSRF striker — fires cloud-metadata payloads at a URL"
+
+def test_lazy_core_exports_keep_their_objects():
+    import core
+    import core.engine      # binding the submodule must not shadow the exported object
+    from core import engine as exported, Requester as exported_cls
+    assert type(exported).__name__ == "Engine" and exported_cls is Requester
+    assert type(core.config).__name__ == "ArsenalConfig" and core.logger.name == "Sanchez_Arsenal"
+
+# ———— 20. CRAWLER TESTS (The Scout Network) ————
+
+def test_normalize_url_one_spelling_per_resource():
+    assert normalize_url("HTTP://Example.COM:80/a/./b/../c?z=1&a=2#frag") == "http://example.com/a/c?a=2&z=1"
+    assert normalize_url("https://example.com:8443") == "https://example.com:8443/"
+    assert normalize_url("https://example.com/%7euser/") == normalize_url("https://example.com/~user/")
+    assert normalize_url("mailto:bob@example.com") is None and normalize_url("javascript:void(0)") is None
+
+class FakeSite:
+    """/n links to /2n and /2n+1 (and back to itself); /dup/* all share one body."""
+    def __init__(self, delay=0.005):
+        self.delay = delay
+        self.active = {}
+        self.peak = {}
+        self.lock = threading.Lock()
+
+    def fetch(self, url):
+        host = urlparse(url).netloc
+        with self.lock:
+            self.active[host] = self.active.get(host, 0) + 1
+            self.peak[host] = max(self.peak.get(host, 0), self.active[host])
+        time.sleep(self.delay)
+        with self.lock:
+            self.active[host] -= 1
+        path = urlparse(url).path
+        if path.startswith("/dup/"):
+            body = b"same old page /dup/a /dup/b /dup/c"
+        else:
+            n = int(path.strip("/") or 1)
+            body = f"/{2 * n} /{2 * n + 1} /{n} /dup/x".encode()
+        return MagicMock(url=url, content=body, digest=None)
+
+    @staticmethod
+    def extract(res, url):
+        return [urljoin(url, link) for link in res.content.decode().split()[-4:] if link.startswith("/")]
+
+def test_crawler_bfs_dedupes_and_caps_pages():
+    site, pages = FakeSite(), []
+    crawler = Crawler(site.fetch, site.extract, on_page=pages.append, max_pages=40, max_depth=10)
+    stats = crawler.crawl(["http://shop.test/1"])
+    urls = [p.url for p in pages]
+    assert len(urls) == len(set(urls)) == stats["fetched"] == 40
+    # Shallowest first: 40 pages of a binary tree never reach past depth 5
+    assert max(p.depth for p in pages) <= 5
+    assert stats["duplicates"] >= 1 and sum(p.duplicate for p in pages) == stats["duplicates"]
+
+def test_crawler_respects_per_host_limit_and_scope():
+    site = FakeSite(delay=0.01)
+    original = config.THREADS
+    config.THREADS = 16
+    try:
+        crawler = Crawler(site.fetch, site.extract, scope=lambda u: "shop.test" in u,
+                          max_pages=60, max_depth=10, per_host=3)
+        crawler.crawl(["http://shop.test/1", "http://elsewhere.test/1"])
+    finally:
+        config.THREADS = original
+    assert site.peak["shop.test"] <= 3
+    assert "elsewhere.test" not in site.peak
+
+def test_detect_id_parameters_runs_concurrently_through_crawler():
+    pages = {
+        "http://app.test/": '<a href="/users/1001">me</a> <a href="/orders?order_id=7">o</a> <a href="http://evil.test/x/99">x</a>',
+        "http://app.test/users/1001": '<a href="/users/1001#top">self</a>',
+    }
+    req = MagicMock()
+    def get(url, **kwargs):
+        return MagicMock(status_code=200, url=url, text=pages.get(url, ""), content=pages.get(url, "").encode(),
+                         digest=None, headers={"Content-Type": "text/html"})
+    req.get.side_effect = get
+    found = {(p, t) for p, t, _ in detect_id_parameters("http://app.test/", req)}
+    assert ("users_path", "http://app.test/users/{ID}") in found
+    assert ("order_id", "http://app.test/orders?order_id=%7BID%7D") in found
+    assert not any("evil" in t for _, t in found)
+    assert sorted(c.args[0] for c in req.get.call_args_list) == [
+        "http://app.test/", "http://app.test/orders?order_id=7", "http://app.test/users/1001"]
+
+@pytest.mark.parametrize("base_url", ["http://Lab.local/", "https://lab.local:443/app"])
+def test_detect_id_routes_scope_survives_a_non_canonical_base(base_url):
+    root = normalize_url(base_url)
+    req = MagicMock()
+    req.get.side_effect = lambda url, **kw: MagicMock(
+        status_code=200, url=url, text='<a href="/users/42">me</a>', content=b'<a href="/users/42">me</a>',
+        digest=None, headers={"Content-Type": "text/html"})
+    routes = detect_id_routes(base_url, req)
+    assert req.get.call_args_list[0].args[0] == root
+    assert req.get.call_count == 2 and len(routes) == 1
+    assert is_in_scope(base_url, root) and not is_in_scope(base_url, "http://lab.local:8080/")
+
+# ———— 21. LINK EXTRACTION TESTS (The Scout Report) ————
+
+SPA = '''<a href="/users/1001">me</a><img src="logo.png"><script src="/static/app.js"></script>
+<a href=/plain?b=2&a=1>x</a><a href="mailto:x@y.z">mail</a><a href="#top">top</a>
+<script>fetch('api/orders?id=5'); axios.post("/api/v2/items", body); xhr.open("GET", "/legacy/profile.php?uid=9");
+const routes = [{path: '/users/:userId'}, {path: `/teams/${team}/members`}];</script>
+{"next": "https:\\/\\/Example.COM:443\\/page?b=2&a=1"}'''
+
+def test_link_extractor_html_json_and_js_endpoints():
+    links, endpoints = extract(SPA, "https://example.com/app/index.html")
+    assert links == {
+        "https://example.com/users/1001", "https://example.com/static/app.js",
+        "https://example.com/plain?a=1&b=2", "https://example.com/app/api/orders?id=5",
+        "https://example.com/api/v2/items", "https://example.com/legacy/profile.php?uid=9",
+        "https://example.com/page?a=1&b=2",
+    }
+    assert endpoints == {"https://example.com/users/{ID}", "https://example.com/teams/{ID}/members"}
+
+def test_link_extractor_chunk_boundaries_change_nothing():
+    body = SPA * 3 + "".join(f'<a href="/items/{i}">{i}</a>' for i in range(3000))
+    whole = extract(body, "https://example.com/")
+    for size in (7, 1000, 4096):
+        extractor = LinkExtractor("https://example.com/")
+        for start in range(0, len(body), size):
+            extractor.feed(body[start:start + size])
+        extractor.close()
+        assert (extractor.links, extractor.endpoints) == whole
+    assert resolve("https://EXAMPLE.com:443/a/b", "/x/../y") == "https://example.com/y"
+    assert resolve("https://example.com/a/b", "c?z=1") == "https://example.com/a/c?z=1"
+
+def test_link_extraction_does_not_load_the_http_stack():
+    """Pure CPU: importing core.links (and its micro-benchmark) must not drag in the engine or tls_client."""
+    probe = ("import sys, core.links; "
+             "print(sorted(m for m in ('core.crawler', 'core.engine', 'core.requester', 'tls_client') if m in sys.modules))")
+    out = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True,
+                         cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    assert out.stdout.strip() == "[]"
+
+# ———— 22. ROUTE TEMPLATE TESTS (The Formation) ————
+
+def test_candidates_collapse_into_route_templates():
+    index = CandidateIndex(max_samples=3)
+    for i in range(1, 5001):
+        index.add_url(f"https://shop.test/users/{i}")
+        index.add_url(f"https://shop.test/users/{i}/orders/{i * 7}")
+        index.add_url(f"https://shop.test/orders?order_id={i}&page={i % 9}")
+    index.add_endpoint("https://shop.test/teams/{ID}/members")
+    routes = {r.param: r for r in index}
+    # users/{ID}, users/{ID}/orders/N, users/N/orders/{ID}, ?order_id={ID}, teams/{ID}
+    assert len(index) == 5 and sum(r.urls for r in index) == 4 * 5000 + 1
+    assert [v for _, v in routes["order_id"].samples] == ["1", "2", "3"]
+    assert routes["teams_path"].samples == []
+    assert route_key("users_path", "https://SHOP.test/users/{ID}/orders/7") == \
+        route_key("users_path", "https://shop.test/users/{ID}/orders/8")
+    # The legacy list: one representative per route that has an observed ID
+    assert len(index.candidates()) == 4
+
+def test_request_budget_is_allocated_per_route():
+    index = CandidateIndex()
+    for i in range(100):
+        index.add_url(f"https://shop.test/users/{i + 1}")
+    index.add_url("https://shop.test/invoices?invoice_id=9")
+    shares = index.allocate(41)
+    assert sorted(shares.values()) == [20, 21]
+    plan = list(index.plan(41, generate=lambda value, max_payloads: [f"{value}-{n}" for n in range(max_payloads)]))
+    assert len(plan) == 41
+    users = [payload for param, _, payload in plan if param == "users_path"]
+    # Interleaved across the observed IDs, not 21 guesses at /users/1
+    assert users[:5] == ["1-0", "2-0", "3-0", "4-0", "5-0"]
+    assert index.allocate(1) == {next(iter(index)).key: 1}
+
+# ———— 23. PAYLOAD GENERATOR TESTS (The Pecking Order) ————
+
+def test_id_payloads_come_out_in_priority_order():
+    guesses = list(iter_id_payloads("100"))
+    payloads = [g.payload for g in guesses]
+    assert payloads[:4] == ["101", "99", "102", "98"]
+    assert len(payloads) == len(set(payloads)) and "100" not in payloads
+    # Neighbours, then boundaries, then encodings; scores never go up
+    order = [g.strategy for g in guesses]
+    assert order.index("neighbours") < order.index("boundaries") < order.index("encodings") < order.index("traversal")
+    assert all(a.score >= b.score for a, b in zip(guesses, guesses[1:]))
+    assert generate_id_payloads("100", max_payloads=3) == ["101", "99", "102"]
+
+def test_id_payloads_are_lazy_and_rescorable(monkeypatch):
+    pulled = []
+    original = guesser.iter_numeric_neighbours
+    def counting(value, radius=20):
+        for payload in original(value, radius):
+            pulled.append(payload)
+            yield payload
+    monkeypatch.setattr(guesser, "iter_numeric_neighbours", counting)
+    assert len(list(islice(iter_id_payloads("5000"), 3))) == 3
+    assert len(pulled) <= 4     # the other 36 neighbours were never built
+
+    boosted = next(iter_id_payloads("alice", scores={"encodings": 500}))
+    assert boosted.strategy == "encodings"
+    assert all(g.score >= 60 for g in iter_id_payloads(None, min_score=60))
+    # ObjectId: counter neighbours first
+    assert next(iter_id_payloads("507f1f77bcf86cd799439011")).payload == "507f1f77bcf86cd799439012"
+
+# ———— 24. IDOR TESTER TESTS (The VAR) ————
+
+def _json_res(status, payload):
+    return MagicMock(status_code=status, content=json.dumps(payload).encode(), bytes_read=None)
+
+class FakeApp:
+    """/users/N: alice owns 1-10; bob may read anything (the bug); anonymous gets 401, except /users/7 (public)."""
+    def __init__(self):
+        self.calls = []
+
+    def requester(self, who):
+        req = MagicMock()
+        def get(url, **kwargs):
+            self.calls.append((who, url))
+            n = int(url.rsplit("/", 1)[1]) if url.rsplit("/", 1)[1].isdigit() else 0
+            if not 1 <= n <= 10 or (who == "anonymous" and n != 7):
+                return _json_res(404 if who != "anonymous" else 401, {"error": "nope"})
+            return _json_res(200, {"id": n, "email": f"u{n}@x.test", "orders": [{"id": n * 3}] * n})
+        req.get.side_effect = get
+        return req
+
+def test_json_shape_ignores_values_and_array_lengths():
+    assert json_shape({"id": 1, "tags": ["a", "b"]}) == json_shape({"tags": ["zzz"], "id": 99}) == "{id:int,tags:[str]}"
+    assert shape_of(_json_res(200, {"id": 1, "o": [1] * 3})).same_as(shape_of(_json_res(200, {"id": 2, "o": [5] * 3})))
+    assert not shape_of(_json_res(200, {"id": 1})).same_as(shape_of(_json_res(200, {"error": "x"})))
+    assert parse_identities(["a:Cookie: sid=1; x=2", "a:Authorization: Bearer t"]) == \
+        {"a": ({"Authorization": "Bearer t"}, {"sid": "1", "x": "2"})}
+
+def test_check_id_owner_first_and_public_control():
+    app = FakeApp()
+    alice, bob = Identity("alice", requester=app.requester("alice")), Identity("bob", requester=app.requester("bob"))
+    anon = Identity("anonymous", requester=app.requester("anonymous"))
+
+    finding = check_id(("users_path", "http://app.test/users/{ID}", "3"), [alice, bob], anon)
+    assert finding.intruders == ("bob",) and finding.shape.status == 200
+    assert check_id(("users_path", "http://app.test/users/{ID}", "7"), [alice, bob], anon) is None   # public
+    app.calls.clear()
+    assert check_id(("users_path", "http://app.test/users/{ID}", "999"), [alice, bob], anon) is None
+    assert app.calls == [("alice", "http://app.test/users/999")]   # owner can't read it: nobody else is asked
+
+def test_run_idor_pipelines_through_engine():
+    app = FakeApp()
+    squad = [Identity(n, requester=app.requester(n)) for n in ("alice", "bob")]
+    targets = (("users_path", "http://app.test/users/{ID}", str(i)) for i in range(1, 2001))
+    findings = list(run_idor(targets, squad))
+    assert sorted(int(f.payload) for f in findings) == list(range(1, 11))
+    assert len(app.calls) == 2000 + 10
+
+# ———— 25. HTTP/2 MULTIPLEX TESTS (The One-Two) ————
+
+class H2cServer:
+    """
+    Cleartext HTTP/2 (prior knowledge) on localhost, MAX_CONCURRENT_STREAMS=3.
+    Requests are held until 3 are open (or the line goes quiet), so the client
+    has every chance to overrun the limit. Each answer echoes method, path and body.
+    """
+    def __init__(self, max_streams=3):
+        self.max_streams = max_streams
+        self.connections = 0
+        self.peak = 0
+        self.end_batches = []        # Requests completed per recv() — all of them at once = one packet
+        self.sock = socket.create_server(("127.0.0.1", 0))
+        self.url = f"http://127.0.0.1:{self.sock.getsockname()[1]}"
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while True:
+            try:
+                client, _ = self.sock.accept()
+            except OSError:
+                return
+            self.connections += 1
+            threading.Thread(target=self._serve, args=(client,), daemon=True).start()
+
+    def _serve(self, client):
+        import h2.config, h2.connection, h2.events, h2.settings   # Optional: the h2c fixture skips without it
+        conn = h2.connection.H2Connection(config=h2.config.H2Configuration(client_side=False, header_encoding="utf-8"))
+        conn.local_settings = h2.settings.Settings(client=False, initial_values={
+            h2.settings.SettingCodes.MAX_CONCURRENT_STREAMS: self.max_streams})
+        conn.initiate_connection()
+        client.sendall(conn.data_to_send())
+        client.settimeout(0.02)
+        requests, ready = {}, []
+        while True:
+            try:
+                data = client.recv(65536)
+                if not data:
+                    return
+                events = conn.receive_data(data)
+                ended = sum(isinstance(e, h2.events.StreamEnded) for e in events)
+                if ended:
+                    self.end_batches.append(ended)
+                for event in events:
+                    if isinstance(event, h2.events.RequestReceived):
+                        requests[event.stream_id] = [dict(event.headers), b""]
+                        self.peak = max(self.peak, len(requests))
+                    elif isinstance(event, h2.events.DataReceived):
+                        requests[event.stream_id][1] += event.data
+                        conn.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+                    elif isinstance(event, h2.events.StreamEnded):
+                        ready.append(event.stream_id)
+            except socket.timeout:
+                pass
+            except OSError:
+                return
+            if ready and (len(ready) >= self.max_streams or len(ready) == len(requests)):
+                for stream_id in ready:
+                    headers, body = requests.pop(stream_id)
+                    echo = json.dumps({"method": headers[":method"], "path": headers[":path"],
+                                       "body": body.decode(), "cookie": headers.get("cookie")}).encode()
+                    conn.send_headers(stream_id, [(":status", "200"), ("content-type", "application/json"),
+                                                  ("content-length", str(len(echo)))])
+                    conn.send_data(stream_id, echo, end_stream=True)
+                ready.clear()
+            out = conn.data_to_send()
+            if out:
+                client.sendall(out)
+
+    def close(self):
+        self.sock.close()
+
+@pytest.fixture
+def h2c(monkeypatch):
+    pytest.importorskip("h2")
+    monkeypatch.setattr(config, "FORCE_HTTP2", True)
+    server = H2cServer()
+    yield server
+    server.close()
+
+def test_batch_multiplexes_within_max_concurrent_streams(h2c):
+    req = Requester(cache=False)
+    req.update_cookies({"sid": "a1"})
+    urls = [f"{h2c.url}/item/{i}" for i in range(20)]
+    responses = req.batch(urls + [("POST", f"{h2c.url}/form", {"json": {"x": 1}})])
+
+    assert [r.status_code for r in responses] == [200] * 21
+    assert [r.json()["path"] for r in responses[:20]] == [f"/item/{i}" for i in range(20)]   # input order
+    assert responses[20].json()["body"] == '{"x": 1}' and responses[0].json()["cookie"] == "sid=a1"
+    # One connection, never more streams in the air than the server allowed
+    assert h2c.connections == 1 and h2c.peak == 3
+    (conn,) = req.h2_stats()
+    assert conn["streams"] == 21 and conn["peak_concurrent"] == 3 and conn["max_concurrent_streams"] == 3
+    assert any(c["streams"] == 21 for c in metrics.to_dict()["connections"].values())
+
+    req.batch(urls[:5])          # The next batch rides the same, already-open connection
+    assert h2c.connections == 1 and req.h2_stats()[0]["streams"] == 26
+
+def test_engine_stream_batch_pipelines_lazy_sources(h2c):
+    req = Requester(cache=False)
+    urls = (f"{h2c.url}/users/{i}" for i in range(50))
+    hits = list(engine.stream_batch(lambda url, res: url if res.json()["path"].endswith("7") else None,
+                                    urls, requester=req, chunk=16, progress=False))
+    assert set(hits) == {f"{h2c.url}/users/{i}" for i in (7, 17, 27, 37, 47)}
+    assert h2c.connections == 1
+
+def test_http2_flags_pick_the_transport(monkeypatch):
+    pytest.importorskip("h2")
+    monkeypatch.setattr(config, "FORCE_HTTP2", False)
+    monkeypatch.setattr(config, "AUTO_HTTP2_CLOUDFLARE", False)
+    req = Requester(cache=False)
+    assert req.session.force_http1 is True                   # Both off: HTTP/1.1 only in ALPN
+
+    sent = []
+    monkeypatch.setattr(req, "request", lambda method, url, **kw: sent.append((method, url)) or MagicMock(status_code=200))
+    assert len(req.batch(["https://a.test/1", ("HEAD", "https://a.test/2")])) == 2
+    assert sorted(sent) == [("GET", "https://a.test/1"), ("HEAD", "https://a.test/2")]   # Session pool, no h2
+
+    monkeypatch.setattr(config, "AUTO_HTTP2_CLOUDFLARE", True)
+    assert req._multiplexes(("https", "a.test", 443))
+    assert not req._multiplexes(("http", "a.test", 80))      # h2c only when forced: nothing negotiates it
+    assert Requester(cache=False).session.force_http1 is False
+
+# ———— 26. RACE WINDOW TESTS (The Photo Finish) ————
+
+def test_last_byte_race_lands_inside_the_wallet_gap():
+    transfer = ("POST", "/wallet/transfer", {"json": {"fromId": 101, "toId": 102, "amount": 50}})
+    with LocalTarget() as url:
+        req = Requester(cache=False)
+        req.post(url + "/wallet/reset")
+        result = race([(transfer[0], url + transfer[1], transfer[2])] * 10, mode="last-byte")
+        balance = req.get(url + "/wallet/101").json()["balance"]
+
+    assert result.mode == "last-byte" and len(result.shots) == 10
+    assert result.spread < WALLET_GAP / 5                        # Every tail out well inside the gap
+    assert result.successes > 2 and balance == 100 - 50 * result.successes   # $100 spent more than twice
+    st = result.stats()
+    assert st["statuses"]["200"] == result.successes and sum(st["statuses"].values()) == 10
+    assert st["ttfb_ms"]["min"] >= WALLET_GAP * 1000 * 0.9
+
+def test_single_packet_race_releases_every_stream_at_once(h2c):
+    result = RaceWindow([("POST", f"{h2c.url}/redeem", {"data": "code=FREE"})] * 3).fire()
+    assert result.mode == "single-packet" and result.successes == 3
+    assert h2c.end_batches == [3] and h2c.peak == 3              # All three completed by one recv()
+    assert result.spread == 0 and 0 < result.packet_bytes < 1400
+    assert [s.response.json()["body"] for s in result.shots] == ["code=FREE"] * 3
+
+    too_many = RaceWindow([f"{h2c.url}/x"] * 4)
+    with pytest.raises(ValueError, match="concurrent streams"):
+        too_many.arm()                                           # Server allows 3...
+    assert too_many._h2 is None                                  # ...and the connection was hung up
+
+def test_race_error_paths_hang_up_every_connection(monkeypatch):
+    opened = []
+    def connect(url):
+        if len(opened) == 3:
+            raise ConnectionRefusedError("refused")
+        opened.append(MagicMock())
+        return opened[-1]
+    window = RaceWindow(["http://race.test/x"] * 5, mode="last-byte", settle=0)
+    monkeypatch.setattr(window, "_connect", connect)
+    with pytest.raises(ConnectionRefusedError):
+        window.arm()                                             # Fourth connect fails mid-arm
+    assert all(s.close.called for s in opened) and window._sockets == []
+
+    opened.clear()
+    window = RaceWindow(["http://race.test/x"] * 3, mode="last-byte", settle=0)
+    monkeypatch.setattr(window, "_connect", connect)
+    window.arm()
+    opened[1].send.side_effect = BrokenPipeError("reset by peer")
+    with pytest.raises(BrokenPipeError):
+        window.fire()                                            # A tail that never made it out
+    assert all(s.close.called for s in opened)
+
+
+# ———— 27. RESILIENCE TESTS (The Medical Staff) ————
+
+def test_backoff_is_exponential_full_jitter_and_capped():
+    cfg = SimpleNamespace(BACKOFF=2.0, BACKOFF_BASE=0.5, BACKOFF_MAX=3.0)
+    assert [backoff_delay(n, cfg, rand=lambda: 1.0) for n in range(4)] == [0.5, 1.0, 2.0, 3.0]
+    assert backoff_delay(3, cfg, rand=lambda: 0.25) == 0.75
+    assert backoff_delay(2, cfg, rand=lambda: 0.0) == 0.0
+
+def test_retry_budget_keeps_retries_a_fraction_of_traffic():
+    budget = RetryBudget(ratio=0.1, reserve=2)
+    for _ in range(100):
+        budget.deposit()
+    retried = sum(budget.withdraw() for _ in range(100))
+    assert retried == 2                   # Capped at the reserve however much was deposited
+    for _ in range(30):
+        budget.deposit()
+        budget.withdraw()
+    assert budget.spent <= 2 + 0.1 * 130 + 1
+    assert budget.denied > 100
+
+def test_breaker_opens_sheds_and_closes_after_a_probe():
+    clock = FakeClock()
+    breaker = CircuitBreaker("api.test", failures=3, window=4, block_ratio=0.75, cooldown=10, clock=clock)
+    for _ in range(3):
+        breaker.record(ERROR)
+    assert breaker.state == OPEN and not breaker.allow()
+
+    clock.now += 10
+    assert breaker.allow() and breaker.state == HALF_OPEN   # The probe...
+    assert not breaker.allow()                              # ...and only the probe
+    breaker.record(BLOCK)
+    assert breaker.state == OPEN and breaker.cooldown == 20
+
+    clock.now += 20
+    assert breaker.allow()
+    breaker.record(OK)
+    assert breaker.state == CLOSED and breaker.cooldown == 10
+
+    for outcome in (BLOCK, OK, BLOCK, BLOCK):               # Sustained WAF blocks trip it too
+        breaker.record(outcome)
+    assert breaker.state == OPEN and breaker.trips == 3 and breaker.shed == 2
+
+def test_is_block_wants_429_or_a_waf_403():
+    assert is_block(SimpleNamespace(status_code=429, text=""))
+    assert is_block(SimpleNamespace(status_code=403, text="<title>Attention Required! | Cloudflare</title>"))
+    assert not is_block(SimpleNamespace(status_code=403, text='{"error": "not your order"}'))
+
+@patch("core.requester.time.sleep")
+@patch("core.requester.tls_client.Session")
+def test_requester_sheds_a_dead_host_instead_of_retrying_forever(mock_session_cls, mock_sleep, monkeypatch):
+    monkeypatch.setattr(config, "RETRIES", 3)
+    monkeypatch.setattr(config, "BREAKER_FAILURES", 4)      # Fresh breakers + budget for this test
+    mock_session_cls.return_value.execute_request.side_effect = ConnectionError("refused")
+    req = Requester()
+
+    assert all(req.get(f"http://dead.test/{n}") is None for n in range(50))
+    calls = mock_session_cls.return_value.execute_request.call_count
+    assert calls == 4                                       # One request's worth, then everything is shed
+    assert get_breakers().get("http://dead.test/").stats() == {
+        "host": "dead.test", "state": OPEN, "trips": 1, "shed": 49}
+    assert all(0 <= c.args[0] <= config.BACKOFF_BASE * config.BACKOFF ** 2 for c in mock_sleep.call_args_list)
+
+
+@patch("core.requester.time.sleep")
+@patch("core.requester.tls_client.Session")
+def test_shed_targets_stay_pending_for_resume(mock_session_cls, mock_sleep, monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "RETRIES", 0)
+    monkeypatch.setattr(config, "THREADS", 1)
+    monkeypatch.setattr(config, "BREAKER_FAILURES", 3)
+    execute = mock_session_cls.return_value.execute_request
+    execute.side_effect = ConnectionError("refused")
+    req = Requester()
+    check = lambda n: f"hit {n}" if req.get(f"http://flaky.test/{n}") is not None else None
+
+    store = CheckpointStore("unit", "http://flaky.test", "wl", directory=tmp_path)
+    assert engine.run(store.track(check), store.pending(range(20)), progress=False) == []
+    store.close()
+    assert execute.call_count == 3                      # Three failures tripped it...
+    assert (store.completed, store.shed) == (3, 17)     # ...and the 17 shed targets were never done
+    assert store.watermark == 20 and not store._above   # ...but they don't pin the watermark either
+
+    monkeypatch.setattr(config, "BREAKER_FAILURES", 4)  # Host back up (fresh breakers)
+    execute.side_effect = None
+    execute.return_value = MagicMock(status_code=200, content=b"ok")
+    resumed = CheckpointStore("unit", "http://flaky.test", "wl", directory=tmp_path)
+    assert [i for i, _ in resumed.pending(range(20))] == list(range(3, 20))
+    hits = engine.run(resumed.track(check), resumed.pending(range(20)), progress=False)
+    assert sorted(hits) == sorted(f"hit {n}" for n in range(3, 20))
+    assert resumed.finished and resumed.shed == 0
+    resumed.close()
+
+
+# ———— 28. RESULT SINK TESTS (The Scoresheet) ————
+
+def test_hit_is_a_str_that_keeps_its_details():
+    res = SimpleNamespace(status_code=200, content=b"root:x:0:0", bytes_read=4096)
+    hit = Hit("🔥 LFI: http://t/x", url="http://t/x", payload="../etc/passwd", response=res, signature="lfi.passwd")
+    assert hit == "🔥 LFI: http://t/x" and (hit.status, hit.size) == (200, 4096)
+
+    back = pickle.loads(pickle.dumps(hit))                  # The way back from a shard worker
+    record = to_record(back, "fuzzer")
+    assert list(record) == [*FIELDS, "hit"]
+    assert record["payload"] == "../etc/passwd" and record["signature"] == "lfi.passwd"
+    assert to_record("plain old hit", "striker")["url"] is None
+
+def test_sink_buffers_flushes_on_a_timer_and_rotates(tmp_path):
+    path = tmp_path / "hits.jsonl"
+    sink = ResultSink(path, "fuzzer", buffer=3, interval=0.05, max_bytes=600, backups=2)
+    sink.write(Hit("hit 1", url="http://t/1"))
+    assert path.read_text() == ""                           # Buffered...
+    time.sleep(0.2)
+    assert json.loads(path.read_text())["url"] == "http://t/1"   # ...but on disk within the interval
+
+    for n in range(2, 13):
+        sink.write(Hit(f"hit {n}", url=f"http://t/{n}"))
+    sink.close()
+    files = [path, tmp_path / "hits.jsonl.1", tmp_path / "hits.jsonl.2"]
+    assert sink.rotations >= 2 and not (tmp_path / "hits.jsonl.3").exists()
+    kept = [json.loads(line)["hit"] for f in reversed(files) for line in f.read_text().splitlines()]
+    assert kept == [f"hit {n}" for n in range(13 - len(kept), 13)]   # Newest kept, in order
+
+def test_engine_writes_hits_to_the_sink_as_they_land(tmp_path):
+    check = lambda n: Hit(f"hit {n}", url=f"http://t/{n}", payload=str(n), status=200) if n % 3 == 0 else None
+    with ResultSink(tmp_path / "hits.jsonl", "unit", buffer=1) as sink:
+        stream = engine.stream(check, range(30), progress=False, sink=sink)
+        first = next(stream)
+        assert sink.count == 1 and json.loads((tmp_path / "hits.jsonl").read_text())["hit"] == first
+        rest = list(stream)
+    records = [json.loads(line) for line in (tmp_path / "hits.jsonl").read_text().splitlines()]
+    assert len(records) == 1 + len(rest) == 10
+    assert {r["payload"] for r in records} == {str(n) for n in range(0, 30, 3)}
+    assert all(r["tool"] == "unit" and r["status"] == 200 for r in records)